@@ -1,3 +1,4 @@
+import argparse
 import logging.config
 import os
 
@@ -5,8 +6,27 @@ import yaml
 
 from pybot._vendor.sirbot import SirBot
 from pybot._vendor.sirbot.plugins.slack import SlackPlugin
+from pybot._vendor.sirbot.scheduler import FileLease
+from pybot._vendor.sirbot.state import MemoryBackend, create_state
 from pybot.endpoints import handle_health_check
-from pybot.endpoints.slack.utils import HOST, PORT, slack_configs
+from pybot.endpoints.slack.message_templates.tech import (
+    TechTermsGrabber,
+    refresh_tech_terms,
+    warm_tech_terms,
+)
+from pybot.endpoints.slack.utils import (
+    HANDLER_DEADLINE,
+    HOST,
+    HTTP_CLIENTS,
+    PORT,
+    SCHEDULER_LOCK_FILE,
+    STALL_THRESHOLD,
+    STATE_BACKEND,
+    WARMUP_TIMEOUT,
+    WORKERS,
+    slack_configs,
+)
+from pybot.endpoints.slack.utils.slash_lunch import load_zipcodes
 from pybot.sentry import init_sentry
 
 from . import endpoints
@@ -15,6 +35,15 @@ from .plugins import AirtablePlugin, APIPlugin
 logger = logging.getLogger(__name__)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m pybot")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help="Number of worker processes sharing the port (default: SIRBOT_WORKERS or 1)",
+    )
+    args = parser.parse_args()
+
     try:
         with open(
             os.path.join(os.path.dirname(os.path.realpath(__file__)), "../logging.yml")
@@ -26,13 +55,27 @@ if __name__ == "__main__":
 
     init_sentry()
 
-    bot = SirBot()
+    bot = SirBot(
+        http_clients=HTTP_CLIENTS,
+        state=create_state(STATE_BACKEND),
+        warmup_timeout=WARMUP_TIMEOUT,
+        handler_deadline=HANDLER_DEADLINE,
+        stall_threshold=STALL_THRESHOLD,
+    )
+    if args.workers > 1 and isinstance(bot.state, MemoryBackend):
+        logger.warning("Each worker has its own caches and locks, set STATE_BACKEND to share them")
+    if SCHEDULER_LOCK_FILE:
+        bot.scheduler.lease = FileLease(SCHEDULER_LOCK_FILE)
 
     slack = SlackPlugin(**slack_configs)
     endpoints.slack.create_endpoints(slack)
     bot.load_plugin(slack)
 
     admin_configs = dict(**slack_configs)
+    admin_configs.pop("channels")
+    # The admin token only calls the Web API, events are received by the main plugin
+    admin_configs["socket_mode"] = False
+    admin_configs["spool_path"] = ""
     admin_token = os.environ.get("APP_ADMIN_OAUTH_TOKEN", "FAKE_ADMIN_TOKEN")
     if admin_token:
         admin_configs["token"] = admin_token
@@ -47,8 +90,19 @@ if __name__ == "__main__":
     endpoints.api.create_endpoints(api_plugin)
     bot.load_plugin(api_plugin)
 
+    bot.add_warmup("tech_terms", warm_tech_terms)
+    bot.add_warmup("zipcodes", load_zipcodes)
+    bot.scheduler.add(
+        "tech_terms",
+        refresh_tech_terms,
+        every=TechTermsGrabber.HOURS_BEFORE_REFRESH * 3600,
+        jitter=300,
+        max_runtime=60,
+        missed="skip",
+    )
+
     # Add route to respond to AWS health check
     bot.router.add_get("/health", handle_health_check)
     logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
 
-    bot.start(host=HOST, port=PORT, print=logger.info)
+    bot.start(workers=args.workers, host=HOST, port=PORT, print=logger.info)
@@ -3,53 +3,183 @@ Vendored sirbot library for Python 3.12+
 Original: https://github.com/pyslackers/sir-bot-a-lot-2
 """
 
+import asyncio
 import logging
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
 from typing import Any
 
 import aiohttp.web
 
 from . import endpoints
+from .clients import HTTPClients
+from .deadlines import Deadlines
+from .profiling import SamplingProfiler, StallDetector
+from .scheduler import Scheduler
+from .state import MemoryBackend, StateBackend
+from .warmup import Warmup
+from .workers import Supervisor
 
 LOG = logging.getLogger(__name__)
 
+Hook = Callable[["SirBot"], Awaitable[Any]]
+
+
+def concurrently(*hooks: Hook) -> Hook:
+    """Startup (or shutdown) hook running independent `hooks` at the same time."""
+
+    async def run(app: "SirBot") -> None:
+        await asyncio.gather(*(hook(app) for hook in hooks))
+
+    run.__name__ = "concurrently(" + ", ".join(hook.__name__ for hook in hooks) + ")"
+    return run
+
 
 class SirBot(aiohttp.web.Application):
-    def __init__(self, user_agent: str | None = None, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        user_agent: str | None = None,
+        http_clients: dict[str, dict[str, Any]] | None = None,
+        state: StateBackend | None = None,
+        warmup_timeout: float = 30.0,
+        handler_deadline: float | None = 120.0,
+        stall_threshold: float | None = None,
+        **kwargs: Any,
+    ) -> None:
         super().__init__(**kwargs)
 
         self.router.add_route("GET", "/sirbot/plugins", endpoints.plugins)
+        self.router.add_route("GET", "/sirbot/clients", endpoints.clients)
+        self.router.add_route("GET", "/sirbot/breakers", endpoints.breakers)
+        self.router.add_route("GET", "/sirbot/deadlines", endpoints.deadlines)
+        self.router.add_route("GET", "/sirbot/scheduler", endpoints.scheduler)
+        self.router.add_route("GET", "/sirbot/ready", endpoints.ready)
 
         self["plugins"] = {}
-        self["http_session"] = None  # Created on startup
+        self["http_clients"] = HTTPClients(http_clients)
+        self["state"] = state or MemoryBackend()
         self["user_agent"] = user_agent or "sir-bot-a-lot"
-
-        self.on_startup.append(self._create_session)
+        self["worker"] = 0  # Index of this process with `start(workers=N)`
+        self["scheduler"] = Scheduler(self)
+        self["warmup"] = Warmup(warmup_timeout)
+        self["deadlines"] = Deadlines(handler_deadline)
+        self["profiler"] = SamplingProfiler()
+        self["stalls"] = StallDetector(stall_threshold or 0.5, describe=self["deadlines"].describe)
+
+        self.on_startup.append(self["scheduler"].start)
+        if stall_threshold:
+            self.on_startup.append(self["stalls"].start)
         self.on_shutdown.append(self.stop)
 
-    async def _create_session(self, app: aiohttp.web.Application) -> None:
-        """Create HTTP session on startup (when event loop exists)."""
-        self["http_session"] = aiohttp.ClientSession()
-
-    def start(self, **kwargs: Any) -> None:
-        LOG.info("Starting SirBot")
-        aiohttp.web.run_app(self, **kwargs)
+    async def startup(self) -> None:
+        """Run the startup hooks, then warm up in the background."""
+        started = time.monotonic()
+        await super().startup()
+        LOG.info("SirBot started in %.2fs", time.monotonic() - started)
+        self["warmup"].start(self)
+
+    def start(self, workers: int = 1, drain_timeout: float = 30.0, **kwargs: Any) -> None:
+        """
+        Serve the bot, in `workers` processes sharing the listening port (``SO_REUSEPORT``).
+
+        Args:
+            workers: Number of worker processes, restarted when they die.
+            drain_timeout: Seconds a worker has to finish its requests after a SIGTERM.
+            **kwargs: Arguments of :func:`aiohttp.web.run_app`.
+        """
+        if workers == 1:
+            LOG.info("Starting SirBot")
+            aiohttp.web.run_app(self, **kwargs)
+            return
+
+        supervisor = Supervisor(
+            partial(self._run_worker, drain_timeout=drain_timeout, **kwargs),
+            workers,
+            # Leave time for the shutdown hooks once the requests are drained
+            drain_timeout=drain_timeout + 5,
+        )
+        supervisor.run()
+
+    def _run_worker(self, worker: int, drain_timeout: float, **kwargs: Any) -> None:
+        LOG.info("Starting SirBot worker %s", worker)
+        self["worker"] = worker
+        aiohttp.web.run_app(self, reuse_port=True, shutdown_timeout=drain_timeout, **kwargs)
 
     def load_plugin(self, plugin: Any, name: str | None = None) -> None:
         name = name or plugin.__name__
         self["plugins"][name] = plugin
         plugin.load(self)
 
+    def add_warmup(self, name: str, hook: Hook) -> None:
+        """
+        Preload data with ``hook(app)`` once the bot started, before it is ready.
+
+        Warm-up hooks run concurrently, those not done within ``warmup_timeout`` seconds are
+        cancelled and the bot is ready anyway, see :class:`sirbot.warmup.Warmup`.
+        """
+        self["warmup"].add(name, hook)
+
     async def stop(self, sirbot: "SirBot") -> None:
-        if self["http_session"]:
-            await self["http_session"].close()
+        await self["warmup"].stop()
+        await self["scheduler"].stop()
+        await self["stalls"].stop()
+
+        await self["http_clients"].close()
+        await self["state"].close()
+
+    def http_client(self, name: str) -> aiohttp.ClientSession:
+        """Dedicated HTTP session for the ``name`` upstream (e.g. ``slack``, ``airtable``)."""
+        return self["http_clients"].get(name)
 
     @property
     def plugins(self) -> dict:
         return self["plugins"]
 
     @property
-    def http_session(self) -> aiohttp.ClientSession:
-        return self["http_session"]
+    def http_clients(self) -> HTTPClients:
+        return self["http_clients"]
+
+    @property
+    def state(self) -> StateBackend:
+        """Caches, counters and locks shared with the other processes using the same backend."""
+        return self["state"]
+
+    @property
+    def scheduler(self) -> Scheduler:
+        return self["scheduler"]
+
+    @property
+    def ready(self) -> bool:
+        """Whether the bot started and warmed up."""
+        return self["warmup"].ready
+
+    @property
+    def warmup(self) -> Warmup:
+        return self["warmup"]
+
+    @property
+    def deadlines(self) -> Deadlines:
+        """Deadlines of the handlers dispatched by the plugins."""
+        return self["deadlines"]
+
+    @property
+    def profiler(self) -> SamplingProfiler:
+        return self["profiler"]
+
+    @property
+    def stalls(self) -> StallDetector:
+        """Stalls of the event loop, detected when started with a ``stall_threshold``."""
+        return self["stalls"]
+
+    @property
+    def worker(self) -> int:
+        return self["worker"]
+
+    @property
+    def primary(self) -> bool:
+        """Whether this process is the first worker, the only one running leader jobs."""
+        return self["worker"] == 0
 
     @property
     def user_agent(self) -> str:
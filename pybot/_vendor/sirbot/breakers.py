@@ -0,0 +1,149 @@
+"""
+Circuit breakers of the upstream HTTP clients.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+import aiohttp
+
+LOG = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(aiohttp.ClientConnectionError):
+    """
+    Request refused without being sent, its upstream is failing.
+
+    A :class:`aiohttp.ClientConnectionError` so the handlers fall back as they do when the
+    upstream can't be reached.
+    """
+
+    def __init__(self, name: str, retry_in: float) -> None:
+        super().__init__(f"Circuit of {name} is open, retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Stop sending requests to an upstream after consecutive failures.
+
+    Connection errors, timeouts and ``5xx`` responses are failures. After `threshold`
+    consecutive ones the circuit opens: requests fail fast with :class:`CircuitOpenError` for
+    `reset_timeout` seconds. Then it is half open, a single request is let through to probe the
+    upstream, closing the circuit if it succeeds and opening it again otherwise.
+
+    Args:
+        name: Name of the upstream.
+        threshold: Consecutive failures opening the circuit, ``0`` to never open it.
+        reset_timeout: Seconds the circuit stays open before probing the upstream.
+        clock: Monotonic clock, for testing.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: int = 5,
+        reset_timeout: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.stats = {"failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+        return self._state
+
+    def before_request(self) -> None:
+        """Raise :class:`CircuitOpenError` unless a request may be sent now."""
+        state = self.state
+        if state == CLOSED or (state == HALF_OPEN and not self._probing):
+            self._probing = state == HALF_OPEN
+            return
+
+        self.stats["rejected"] += 1
+        retry_in = max(self.reset_timeout - (self._clock() - self._opened_at), 0.0)
+        raise CircuitOpenError(self.name, retry_in)
+
+    def success(self) -> None:
+        if self._state != CLOSED:
+            LOG.info("Circuit of %s closed", self.name)
+        self._state = CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def failure(self) -> None:
+        self.stats["failures"] += 1
+        self._failures += 1
+        self._probing = False
+        if self._state == HALF_OPEN or (
+            self._state == CLOSED and self.threshold and self._failures >= self.threshold
+        ):
+            self._open()
+
+    def release(self) -> None:
+        """The request neither succeeded nor failed, e.g. it was cancelled."""
+        self._probing = False
+
+    def _open(self) -> None:
+        LOG.warning(
+            "Circuit of %s opened after %s consecutive failures, failing fast for %ss",
+            self.name,
+            self._failures,
+            self.reset_timeout,
+        )
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self.stats["opened"] += 1
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Trace config of a :class:`aiohttp.ClientSession` guarded by this breaker."""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session: Any, context: Any, params: Any) -> None:
+            self.before_request()
+
+        async def on_request_end(session: Any, context: Any, params: Any) -> None:
+            if params.response.status >= 500:
+                self.failure()
+            else:
+                self.success()
+
+        async def on_request_exception(session: Any, context: Any, params: Any) -> None:
+            if isinstance(params.exception, CircuitOpenError):
+                return
+            elif isinstance(params.exception, asyncio.CancelledError):
+                self.release()
+            else:
+                self.failure()
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        return trace_config
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "threshold": self.threshold,
+            "reset_timeout": self.reset_timeout,
+            **self.stats,
+        }
@@ -0,0 +1,134 @@
+"""
+Per-upstream HTTP client sessions for sirbot and its plugins.
+"""
+
+import logging
+from typing import Any, NamedTuple
+
+import aiohttp
+
+from .breakers import CircuitBreaker
+
+LOG = logging.getLogger(__name__)
+
+
+class ClientSettings(NamedTuple):
+    """
+    Connection pool and timeout settings of an upstream HTTP client.
+
+    Attributes:
+        limit: Maximum number of simultaneous connections.
+        limit_per_host: Maximum number of simultaneous connections to a single host.
+        keepalive_timeout: Seconds an idle connection is kept open for reuse.
+        ttl_dns_cache: Seconds DNS resolutions are cached.
+        connect_timeout: Seconds to acquire a connection and connect to the host.
+        read_timeout: Seconds to wait between two reads of the response.
+        total_timeout: Seconds for the whole request, ``None`` for no limit.
+        breaker_threshold: Consecutive failures opening the circuit of the upstream, ``0`` to
+            never open it.
+        breaker_reset: Seconds the circuit stays open before a request probes the upstream.
+    """
+
+    limit: int = 20
+    limit_per_host: int = 10
+    keepalive_timeout: float = 30
+    ttl_dns_cache: int = 300
+    connect_timeout: float = 5
+    read_timeout: float = 30
+    total_timeout: float | None = None
+    breaker_threshold: int = 5
+    breaker_reset: float = 30
+
+
+class HTTPClients:
+    """
+    Registry of :class:`aiohttp.ClientSession`, one per upstream.
+
+    Each upstream gets its own connector so a slow service can only exhaust its own pool.
+    Sessions are created on first use, upstreams without registered settings use the defaults.
+    Requests go through the :class:`~sirbot.breakers.CircuitBreaker` of their upstream, failing
+    fast with :class:`~sirbot.breakers.CircuitOpenError` while it is open.
+
+    Args:
+        settings: Mapping of upstream name to :class:`ClientSettings` keyword arguments.
+    """
+
+    def __init__(self, settings: dict[str, dict[str, Any]] | None = None) -> None:
+        self._settings: dict[str, ClientSettings] = {}
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+        for name, options in (settings or {}).items():
+            self.register(name, **options)
+
+    def register(self, name: str, **options: Any) -> None:
+        """Set the pool and timeout settings of an upstream, before its session is created."""
+        if name in self._sessions:
+            raise RuntimeError(f"HTTP client {name} already created")
+        self._settings[name] = ClientSettings(**options)
+
+    def settings(self, name: str) -> ClientSettings:
+        return self._settings.get(name, ClientSettings())
+
+    def get(self, name: str) -> aiohttp.ClientSession:
+        """Session for the ``name`` upstream, created on first call."""
+        session = self._sessions.get(name)
+        if session is None or session.closed:
+            session = self._sessions[name] = self._create(self.settings(name), self.breaker(name))
+            LOG.debug("Created HTTP client %s: %s", name, self.settings(name))
+        return session
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        """Circuit breaker of the ``name`` upstream, kept when its session is recreated."""
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            settings = self.settings(name)
+            breaker = self._breakers[name] = CircuitBreaker(
+                name, threshold=settings.breaker_threshold, reset_timeout=settings.breaker_reset
+            )
+        return breaker
+
+    @staticmethod
+    def _create(settings: ClientSettings, breaker: CircuitBreaker) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=settings.limit,
+            limit_per_host=settings.limit_per_host,
+            keepalive_timeout=settings.keepalive_timeout,
+            ttl_dns_cache=settings.ttl_dns_cache,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=settings.total_timeout,
+            connect=settings.connect_timeout,
+            sock_read=settings.read_timeout,
+        )
+        return aiohttp.ClientSession(
+            connector=connector, timeout=timeout, trace_configs=[breaker.trace_config()]
+        )
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Pool utilization of every created session."""
+        stats = {}
+        for name, session in self._sessions.items():
+            connector = session.connector
+            settings = self.settings(name)
+            in_use = len(getattr(connector, "_acquired", ()))
+            idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+            stats[name] = {
+                "limit": settings.limit,
+                "limit_per_host": settings.limit_per_host,
+                "in_use": in_use,
+                "idle": idle,
+                "utilization": in_use / settings.limit if settings.limit else 0.0,
+                "closed": session.closed,
+            }
+        return stats
+
+    def breakers(self) -> dict[str, dict[str, Any]]:
+        """State of the circuit of every upstream used."""
+        return {name: breaker.status() for name, breaker in self._breakers.items()}
+
+    async def close(self) -> None:
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        self._sessions.clear()
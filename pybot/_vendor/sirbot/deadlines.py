@@ -0,0 +1,95 @@
+"""
+Deadlines of the handlers dispatched by sirbot and its plugins.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import Callable, Coroutine, Mapping
+from typing import Any
+
+LOG = logging.getLogger(__name__)
+
+# Keys of the handled payloads telling what a handler is handling
+DESCRIBED = ("type", "subtype", "command", "callback_id", "record")
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """A handler was cancelled, it ran past its deadline."""
+
+
+class Deadlines:
+    """
+    Run the dispatched handlers, cancelling those still running after their deadline.
+
+    A handler hanging on an upstream would otherwise keep its task, and the sockets it holds,
+    alive for good. The deadline of a handler is the ``deadline`` of its configuration,
+    given when it is registered, or ``default``.
+
+    The handlers running are known by their task, see :meth:`describe`.
+
+    Args:
+        default: Seconds a handler has to finish, ``None`` for no limit.
+    """
+
+    def __init__(self, default: float | None = 120) -> None:
+        self.default = default
+        self.exceeded: Counter[str] = Counter()
+        self.running: dict[asyncio.Future, tuple[Callable, Any]] = {}
+
+    def run(
+        self,
+        handler: Callable[..., Coroutine[Any, Any, Any]],
+        configuration: Mapping[str, Any],
+        *args: Any,
+    ) -> asyncio.Future:
+        """Schedule ``handler(*args)``, raising :class:`DeadlineExceeded` past its deadline."""
+        deadline = configuration.get("deadline")
+        if deadline is None:
+            deadline = self.default
+        if deadline is None:
+            task = asyncio.ensure_future(handler(*args))
+        else:
+            task = asyncio.ensure_future(self._run(handler, deadline, args))
+
+        self.running[task] = (handler, args[0] if args else None)
+        task.add_done_callback(self._finished)
+        return task
+
+    def _finished(self, task: asyncio.Future) -> None:
+        self.running.pop(task, None)
+
+    def describe(self, task: asyncio.Future) -> dict[str, Any] | None:
+        """
+        The handler run by `task` and what it handles: the type of the event, the command, the
+        block and action IDs, etc. ``None`` for a task not running a handler.
+        """
+        handler, payload = self.running.get(task, (None, None))
+        if handler is None:
+            return None
+
+        described = {"handler": handler.__qualname__}
+        if isinstance(payload, Mapping):
+            for key in DESCRIBED:
+                if payload.get(key):
+                    described[key] = payload[key]
+            for key in ("block_id", "action_id"):
+                if payload.get("actions") and payload["actions"][0].get(key):
+                    described[key] = payload["actions"][0][key]
+        if getattr(payload, "resource", None):
+            described["resource"] = payload.resource
+        return described
+
+    async def _run(self, handler: Callable, deadline: float, args: tuple) -> Any:
+        try:
+            async with asyncio.timeout(deadline) as timeout:
+                return await handler(*args)
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+            name = handler.__qualname__
+            self.exceeded[name] += 1
+            raise DeadlineExceeded(f"Handler {name} exceeded its {deadline}s deadline") from None
+
+    def status(self) -> dict[str, Any]:
+        return {"default": self.default, "exceeded": dict(self.exceeded)}
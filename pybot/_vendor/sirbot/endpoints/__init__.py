@@ -4,3 +4,28 @@ from aiohttp.web import json_response
 async def plugins(request):
     data = [k for k in request.app["plugins"].keys()]
     return json_response({"plugins": data})
+
+
+async def clients(request):
+    return json_response({"clients": request.app["http_clients"].stats()})
+
+
+async def breakers(request):
+    return json_response({"breakers": request.app["http_clients"].breakers()})
+
+
+async def deadlines(request):
+    return json_response(request.app["deadlines"].status())
+
+
+async def scheduler(request):
+    return json_response(request.app["scheduler"].stats())
+
+
+async def ready(request):
+    """Readiness probe, 503 until the bot started and warmed up."""
+    warmup = request.app["warmup"]
+    return json_response(
+        {"ready": warmup.ready, "warmup": warmup.status, "duration": warmup.duration},
+        status=200 if warmup.ready else 503,
+    )
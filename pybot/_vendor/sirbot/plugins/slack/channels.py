@@ -0,0 +1,79 @@
+"""
+Channel name to ID resolution for the Slack plugin.
+"""
+
+import logging
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from pybot._vendor.slack import methods
+
+LOG = logging.getLogger(__name__)
+
+CHANNEL_ID = re.compile(r"^[CGD][A-Z0-9]{6,}$")
+
+
+class ChannelDirectory:
+    """
+    Resolve configured channel names to Slack channel IDs.
+
+    Names are looked up when the bot warms up with a paginated ``conversations.list`` and kept up
+    to date from ``channel_created`` and ``channel_rename`` events. Unresolved names resolve to
+    themselves so Slack can still do the name lookup.
+
+    Args:
+        names: Channel names to resolve (with or without the leading ``#``).
+    """
+
+    def __init__(self, names: Iterable[str] | None = None) -> None:
+        self.names: set[str] = set()
+        self._ids: dict[str, str] = {}
+
+        for name in names or ():
+            self.watch(name)
+
+    def watch(self, name: str) -> None:
+        """Add a channel name to resolve. Channel IDs and ``*`` are ignored."""
+        name = name.lstrip("#")
+        if name != "*" and not CHANNEL_ID.match(name):
+            self.names.add(name)
+
+    def id(self, name: str) -> str:
+        """Channel ID for ``name``, or ``name`` itself when unknown."""
+        return self._ids.get(name.lstrip("#"), name)
+
+    @property
+    def resolved(self) -> dict[str, str]:
+        return dict(self._ids)
+
+    def update(self, channel: Mapping) -> bool:
+        """
+        Record the current name of a channel.
+
+        Returns:
+            True if a configured name was added, moved or dropped.
+        """
+        channel_id, name = channel["id"], channel["name"]
+        stale = [n for n, i in self._ids.items() if i == channel_id and n != name]
+        for n in stale:
+            del self._ids[n]
+
+        if name in self.names and self._ids.get(name) != channel_id:
+            self._ids[name] = channel_id
+            return True
+
+        return bool(stale)
+
+    async def load(self, api: Any) -> None:
+        """Resolve the configured names, stopping as soon as all of them are found."""
+        data = {"exclude_archived": "true", "types": "public_channel,private_channel"}
+        async for channel in api.iter(methods.CONVERSATIONS_LIST, data=data):
+            self.update(channel)
+            if self.names <= self._ids.keys():
+                break
+
+        unresolved = self.names - self._ids.keys()
+        if unresolved:
+            LOG.warning("Could not resolve Slack channels: %s", ", ".join(sorted(unresolved)))
+        LOG.info("Resolved Slack channels: %s", self._ids)
@@ -0,0 +1,61 @@
+"""
+Cooldowns of message handlers, so a spammy user or a bot loop doesn't get a reply each time.
+"""
+
+import logging
+from collections.abc import Mapping
+from typing import Any
+
+from pybot._vendor.sirbot.state import StateBackend
+
+LOG = logging.getLogger(__name__)
+
+SCOPES = ("user", "channel")
+
+
+class Cooldown:
+    """
+    Suppress the calls of a handler within a window of its previous call.
+
+    Each scope has its own window: with ``{"user": 600, "channel": 60}`` a user gets at most
+    one reply every 10 minutes, and a channel one every minute whoever triggers it. A call is
+    suppressed while any of its keys is cooling down, and only calls let through start a window.
+
+    Windows are claimed in the shared state, with an atomic add expiring with the window, so
+    they hold across the workers and replicas sharing it.
+
+    Args:
+        name: Name of the handler, namespacing its keys.
+        windows: Seconds of cooldown per scope, ``user`` and/or ``channel``.
+    """
+
+    def __init__(self, name: str, windows: Mapping[str, float]) -> None:
+        unknown = set(windows) - set(SCOPES)
+        if unknown or not windows:
+            raise ValueError(f"Cooldown scopes must be some of {SCOPES}, got {sorted(windows)}")
+
+        self.name = name
+        self.windows = dict(windows)
+        self.stats = {"allowed": 0, "suppressed": 0}
+
+    async def allow(self, state: StateBackend, event: Mapping[str, Any]) -> bool:
+        """Whether a handler can reply to `event`, starting its cooldown if so."""
+        claimed = []
+        for scope, window in self.windows.items():
+            if event.get(scope) is None:
+                continue
+
+            key = f"cooldown:{self.name}:{scope}:{event[scope]}"
+            if not await state.add(key, 1, ttl=window):
+                # Suppressed calls don't start a window in the other scopes
+                for other in claimed:
+                    await state.delete(other)
+                self.stats["suppressed"] += 1
+                return False
+            claimed.append(key)
+
+        self.stats["allowed"] += 1
+        return True
+
+    def status(self) -> dict[str, Any]:
+        return {"windows": self.windows, **self.stats}
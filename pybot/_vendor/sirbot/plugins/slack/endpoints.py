@@ -1,8 +1,10 @@
 import asyncio
+import functools
 import logging
+from collections.abc import Mapping
 
 import aiohttp.web
-from aiohttp.web import Response
+from aiohttp.web import Response, json_response
 
 from pybot._vendor.slack.actions import Action
 from pybot._vendor.slack.commands import Command
@@ -13,6 +15,7 @@ from pybot._vendor.slack.exceptions import (
     InvalidTimestamp,
 )
 from pybot._vendor.slack.sansio import validate_request_signature
+from pybot._vendor.slack.templates import dumps
 
 LOG = logging.getLogger(__name__)
 
@@ -43,18 +46,25 @@ async def incoming_event(request):
     except (FailedVerification, InvalidSlackSignature, InvalidTimestamp):
         return Response(status=401)
 
+    return await handle_event(event, request.app)
+
+
+async def handle_event(event, app):
+    """Dispatch a verified event to the event or message router."""
+    slack = app.plugins["slack"]
+
     if event["type"] == "message":
-        return await _incoming_message(event, request)
+        return await _incoming_message(event, app)
     else:
-        futures = list(_dispatch(slack.routers["event"], event, request.app))
+        futures = list(_dispatch(slack.routers["event"], event, app))
         if futures:
             return await _wait_and_check_result(futures)
 
     return Response(status=200)
 
 
-async def _incoming_message(event, request):
-    slack = request.app.plugins["slack"]
+async def _incoming_message(event, app):
+    slack = app.plugins["slack"]
 
     if slack.bot_id and (
         event.get("bot_id") == slack.bot_id
@@ -79,8 +89,15 @@ async def _incoming_message(event, request):
             continue
         elif configuration["admin"] and event["user"] not in slack.admins:
             continue
+        elif configuration.get("when") and not configuration["when"](event):
+            continue
+        elif configuration.get("cooldown") and not await configuration["cooldown"].allow(
+            app.state, event
+        ):
+            LOG.debug("Handler %s is cooling down", handler.__qualname__)
+            continue
 
-        f = asyncio.ensure_future(handler(event, request.app))
+        f = app.deadlines.run(handler, configuration, event, app)
         if configuration["wait"]:
             futures.append(f)
         else:
@@ -92,6 +109,11 @@ async def _incoming_message(event, request):
     return Response(status=200)
 
 
+async def cooldowns(request):
+    slack = request.app.plugins["slack"]
+    return json_response({name: c.status() for name, c in slack.cooldowns.items()})
+
+
 async def incoming_command(request):
     slack = request.app.plugins["slack"]
     payload = await request.post()
@@ -102,14 +124,103 @@ async def incoming_command(request):
     except (FailedVerification, InvalidSlackSignature, InvalidTimestamp):
         return Response(status=401)
 
+    return await handle_command(command, request.app)
+
+
+async def handle_command(command, app, deadline=None):
+    """
+    Dispatch a verified command to the command router.
+
+    Args:
+        command: Incoming command.
+        app: Sirbot application.
+        deadline: Seconds inline handlers have to answer in the response (default to the
+            plugin ``command_deadline``). With ``0`` every answer goes to the ``response_url``.
+    """
+    slack = app.plugins["slack"]
     LOG.debug("Incoming command: %s", command)
-    futures = list(_dispatch(slack.routers["command"], command, request.app))
-    if futures:
+    futures = []
+    inline = []
+    for handler, configuration in slack.routers["command"].dispatch(command):
+        f = app.deadlines.run(handler, configuration, command, app)
+        if configuration.get("inline"):
+            inline.append(f)
+        elif configuration["wait"]:
+            futures.append(f)
+        else:
+            f.add_done_callback(_callback)
+
+    if inline:
+        for f in futures:
+            f.add_done_callback(_callback)
+        deadline = slack.command_deadline if deadline is None else deadline
+        return await _inline_command_response(inline, command, slack, deadline)
+    elif futures:
         return await _wait_and_check_result(futures)
 
     return Response(status=200)
 
 
+async def _inline_command_response(futures, command, slack, deadline):
+    """
+    Answer a command with the message returned by its inline handlers.
+
+    Handlers finishing within ``deadline`` answer the HTTP request directly,
+    slower ones (and any extra message) are delivered to the command ``response_url``.
+    """
+    if deadline:
+        dones, pending = await asyncio.wait(futures, timeout=deadline)
+    else:
+        dones, pending = set(), set(futures)
+
+    response = None
+    for done in dones:
+        try:
+            result = done.result()
+        except Exception as e:
+            LOG.exception(e)
+            continue
+
+        if not result:
+            continue
+        elif response is None:
+            response = result
+        else:
+            _post_to_response_url(result, command, slack)
+
+    for f in pending:
+        LOG.debug("Command %s exceeded inline deadline", command["command"])
+        f.add_done_callback(functools.partial(_response_url_callback, command=command, slack=slack))
+
+    if isinstance(response, aiohttp.web.Response):
+        return response
+    elif isinstance(response, Mapping):
+        return json_response(dict(response), dumps=dumps)
+
+    return Response(status=200)
+
+
+def _response_url_callback(f, command, slack):
+    try:
+        result = f.result()
+    except Exception as e:
+        LOG.exception(e)
+        return
+
+    if isinstance(result, Mapping) and result:
+        _post_to_response_url(result, command, slack)
+
+
+def _post_to_response_url(message, command, slack):
+    response_url = command.get("response_url")
+    if not response_url:
+        LOG.warning("No response_url for command %s, dropping message", command["command"])
+        return
+
+    f = asyncio.ensure_future(slack.api.query(url=response_url, data=dict(message)))
+    f.add_done_callback(_callback)
+
+
 async def incoming_action(request):
     slack = request.app.plugins["slack"]
     payload = await request.post()
@@ -121,9 +232,15 @@ async def incoming_action(request):
     except (FailedVerification, InvalidSlackSignature, InvalidTimestamp):
         return Response(status=401)
 
+    return await handle_action(action, request.app)
+
+
+async def handle_action(action, app):
+    """Dispatch a verified action to the action router."""
+    slack = app.plugins["slack"]
     LOG.debug("Incoming action: %s", action)
 
-    futures = list(_dispatch(slack.routers["action"], action, request.app))
+    futures = list(_dispatch(slack.routers["action"], action, app))
     if futures:
         return await _wait_and_check_result(futures)
 
@@ -139,7 +256,7 @@ def _callback(f):
 
 def _dispatch(router, event, app):
     for handler, configuration in router.dispatch(event):
-        f = asyncio.ensure_future(handler(event, app))
+        f = app.deadlines.run(handler, configuration, event, app)
         if configuration["wait"]:
             yield f
         else:
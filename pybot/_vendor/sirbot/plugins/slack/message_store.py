@@ -0,0 +1,105 @@
+"""
+State of the interactive messages posted by the bot, so handlers don't fetch them back.
+"""
+
+import json
+import logging
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from pybot._vendor.sirbot.state import StateBackend
+from pybot._vendor.slack.templates import dumps
+
+LOG = logging.getLogger(__name__)
+
+RECORDED_METHODS = ("chat.postMessage", "chat.update")
+
+
+class MessageStore:
+    """
+    Last known content of the interactive messages of the bot, by channel and timestamp.
+
+    Only the messages a handler reads back are recorded: those holding a block of `block_ids`
+    or an attachment of `callback_ids`. They are recorded from the responses of
+    ``chat.postMessage`` and ``chat.update``, falling back to what was sent when the response
+    doesn't include the message. A handler lacking the message, like a dialog submission,
+    reads it from here and only asks ``conversations.history`` on a miss.
+
+    Messages are kept in the shared state as JSON text, a submission handled by another worker
+    or replica than the one that posted the form finds it too.
+
+    Args:
+        state: Shared state backend.
+        ttl: Seconds a message is remembered after its last post or update.
+        block_ids: IDs of the blocks of the recorded messages.
+        callback_ids: Callback IDs of the attachments of the recorded messages.
+    """
+
+    KEY = "slack:message"
+
+    def __init__(
+        self,
+        state: StateBackend,
+        ttl: float = 3600,
+        block_ids: Iterable[str] = (),
+        callback_ids: Iterable[str] = (),
+    ) -> None:
+        self.state = state
+        self.ttl = ttl
+        self.block_ids = set(block_ids)
+        self.callback_ids = set(callback_ids)
+        self.stats = {"recorded": 0, "hits": 0, "misses": 0}
+
+    def _key(self, channel: str, ts: str) -> str:
+        return f"{self.KEY}:{channel}:{ts}"
+
+    async def get(self, channel: str, ts: str) -> dict | None:
+        """A copy of the message, free to be edited."""
+        message = await self.state.get(self._key(channel, ts))
+        if message is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return json.loads(message)
+
+    async def set(self, channel: str, ts: str, message: Mapping[str, Any]) -> None:
+        # Rendered templates are RawJSON, which only `dumps` serializes
+        await self.state.set(self._key(channel, ts), dumps(dict(message)), ttl=self.ttl)
+        self.stats["recorded"] += 1
+
+    async def record(self, method: str, data: Mapping | None, response: Mapping[str, Any]) -> None:
+        """Response hook of :class:`~pybot._vendor.slack.io.abc.SlackAPI`."""
+        if method not in RECORDED_METHODS or not response.get("ok", True):
+            return
+
+        channel, ts = response.get("channel"), response.get("ts")
+        if not channel or not ts:
+            return
+
+        for message in (response.get("message"), {**(data or {}), "ts": ts}):
+            if message and (message.get("blocks") or message.get("attachments")):
+                if self.recorded(message):
+                    await self.set(channel, ts, message)
+                return
+
+    def recorded(self, message: Mapping[str, Any]) -> bool:
+        """Whether `message` holds one of the recorded blocks or attachments."""
+        if self.block_ids and any(
+            block.get("block_id") in self.block_ids for block in _parts(message, "blocks")
+        ):
+            return True
+        return bool(self.callback_ids) and any(
+            attachment.get("callback_id") in self.callback_ids
+            for attachment in _parts(message, "attachments")
+        )
+
+    def status(self) -> dict[str, Any]:
+        return {"backend": self.state.name, **self.stats}
+
+
+def _parts(message: Mapping[str, Any], key: str) -> Iterable[Mapping]:
+    parts = message.get(key) or ()
+    if isinstance(parts, str):
+        # Sent already serialized
+        parts = json.loads(parts)
+    return (part for part in parts if isinstance(part, Mapping))
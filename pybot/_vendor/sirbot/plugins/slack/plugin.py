@@ -8,13 +8,19 @@ import os
 from collections.abc import Callable, Coroutine
 from typing import Any
 
+from pybot._vendor.sirbot.bot import concurrently
 from pybot._vendor.slack import methods
 from pybot._vendor.slack.actions import Router as ActionRouter
 from pybot._vendor.slack.commands import Router as CommandRouter
-from pybot._vendor.slack.events import EventRouter, MessageRouter
+from pybot._vendor.slack.events import EventRouter, Message, MessageRouter
 from pybot._vendor.slack.io.aiohttp import SlackAPI
 
 from . import endpoints
+from .channels import ChannelDirectory
+from .cooldown import Cooldown
+from .message_store import MessageStore
+from .socket_mode import SocketModeClient
+from .spool import OutboundSpool
 
 LOG = logging.getLogger(__name__)
 
@@ -31,6 +37,13 @@ def _ensure_async(handler: Callable) -> AsyncHandler:
     return handler
 
 
+def _configuration(deadline: float | None, **options: Any) -> dict[str, Any]:
+    """Configuration of a handler, with its deadline unless it uses the default."""
+    if deadline is not None:
+        options["deadline"] = deadline
+    return options
+
+
 class SlackPlugin:
     """
     Handle communication from and to Slack.
@@ -39,6 +52,14 @@ class SlackPlugin:
         * ``/slack/events``: Incoming events.
         * ``/slack/commands``: Incoming commands.
         * ``/slack/actions``: Incoming actions.
+        * ``/slack/cooldowns``: Calls of the message handlers let through and suppressed.
+
+    In Socket Mode the same events, commands and actions are received over WebSocket
+    connections opened by the bot instead. The endpoints are only served when a verification
+    token or signing secret is configured.
+
+    Handlers are cancelled when still running after their ``deadline``, in seconds, given when
+    registering them or the default of the bot (see :class:`sirbot.deadlines.Deadlines`).
 
     Args:
         token: Slack authentication token (env var: `SLACK_TOKEN`).
@@ -47,6 +68,16 @@ class SlackPlugin:
         admins: List of Slack admin user IDs (env var: `SLACK_ADMINS`).
         verify: Slack verification token (env var: `SLACK_VERIFY`).
         signing_secret: Slack signing secret (env var: `SLACK_SIGNING_SECRET`).
+        command_deadline: Seconds an inline command handler has to answer before its message
+            is delivered to the command `response_url` instead (env var: `SLACK_COMMAND_DEADLINE`).
+        channels: Channel names to resolve to IDs on startup, available from ``channels``.
+        api_url: Base URL of the Slack Web API, e.g. a local stand-in (env var: `SLACK_API_URL`).
+        socket_mode: Receive events over Socket Mode (env var: `SLACK_SOCKET_MODE`).
+        app_token: App-level token required by Socket Mode (env var: `SLACK_APP_TOKEN`).
+        socket_connections: Number of Socket Mode connections (env var: `SLACK_SOCKET_CONNECTIONS`).
+        spool_path: SQLite file of the durable outbound spool, disabled when empty
+            (env var: `SLACK_SPOOL_PATH`).
+        spool_workers: Channels the spool sends to concurrently (env var: `SLACK_SPOOL_WORKERS`).
     """
 
     __name__ = "slack"
@@ -60,21 +91,58 @@ class SlackPlugin:
         admins: list[str] | None = None,
         verify: str | None = None,
         signing_secret: str | None = None,
+        command_deadline: float | None = None,
+        channels: list[str] | None = None,
+        api_url: str | None = None,
+        socket_mode: bool | None = None,
+        app_token: str | None = None,
+        socket_connections: int | None = None,
+        spool_path: str | None = None,
+        spool_workers: int | None = None,
     ) -> None:
         self.api: SlackAPI | None = None
         self.token = token or os.environ["SLACK_TOKEN"]
         self.admins = admins or os.environ.get("SLACK_ADMINS", [])
 
+        if socket_mode is None:
+            socket_mode = os.environ.get("SLACK_SOCKET_MODE", "false").lower() == "true"
+        self.socket_mode = socket_mode
+        self.app_token = app_token or os.environ.get("SLACK_APP_TOKEN")
+        self.socket_connections = socket_connections or int(
+            os.environ.get("SLACK_SOCKET_CONNECTIONS", 2)
+        )
+        self.socket_client: SocketModeClient | None = None
+
+        if spool_path is None:
+            spool_path = os.environ.get("SLACK_SPOOL_PATH")
+        self.spool: OutboundSpool | None = None
+        if spool_path:
+            self.spool = OutboundSpool(
+                spool_path,
+                workers=spool_workers or int(os.environ.get("SLACK_SPOOL_WORKERS", 4)),
+            )
+        if self.socket_mode and not self.app_token:
+            raise ValueError("`SLACK_APP_TOKEN` is required for Socket Mode")
+
         if signing_secret or "SLACK_SIGNING_SECRET" in os.environ:
             self.signing_secret = signing_secret or os.environ["SLACK_SIGNING_SECRET"]
             self.verify = None
-        else:
+        elif verify or not self.socket_mode:
             self.verify = verify or os.environ["SLACK_VERIFY"]
             self.signing_secret = None
+        else:
+            # Socket Mode envelopes are authenticated by the app token
+            self.verify = os.environ.get("SLACK_VERIFY")
+            self.signing_secret = None
 
         self.bot_id = bot_id or os.environ.get("SLACK_BOT_ID")
         self.bot_user_id = bot_user_id or os.environ.get("SLACK_BOT_USER_ID")
         self.handlers_option: dict = {}
+        self.command_deadline = command_deadline or float(
+            os.environ.get("SLACK_COMMAND_DEADLINE", 2.5)
+        )
+        self.channels = ChannelDirectory(channels)
+        self.api_url = api_url or os.environ.get("SLACK_API_URL")
 
         if not self.bot_user_id:
             LOG.warning(
@@ -82,6 +150,10 @@ class SlackPlugin:
                 "and discarding messages from Sir Bot-a-lot to avoid loops."
             )
 
+        self.cooldowns: dict[str, Cooldown] = {}
+        self.messages: MessageStore | None = None
+        self.recorded_blocks: set[str] = set()
+        self.recorded_callbacks: set[str] = set()
         self.routers = {
             "event": EventRouter(),
             "command": CommandRouter(),
@@ -93,33 +165,141 @@ class SlackPlugin:
         LOG.info("Loading slack plugin")
         # Store reference to sirbot for later initialization
         self._sirbot = sirbot
+        self.messages = MessageStore(
+            sirbot.state, block_ids=self.recorded_blocks, callback_ids=self.recorded_callbacks
+        )
 
-        sirbot.router.add_route("POST", "/slack/events", endpoints.incoming_event)
-        sirbot.router.add_route("POST", "/slack/commands", endpoints.incoming_command)
-        sirbot.router.add_route("POST", "/slack/actions", endpoints.incoming_action)
+        if self.verify or self.signing_secret:
+            sirbot.router.add_route("POST", "/slack/events", endpoints.incoming_event)
+            sirbot.router.add_route("POST", "/slack/commands", endpoints.incoming_command)
+            sirbot.router.add_route("POST", "/slack/actions", endpoints.incoming_action)
+        sirbot.router.add_route("GET", "/slack/cooldowns", endpoints.cooldowns)
 
         # Initialize API after session is created
         sirbot.on_startup.append(self._initialize_api)
 
+        startup = []
         if self.bot_user_id and not self.bot_id:
-            sirbot.on_startup.append(self.find_bot_id)
+            startup.append(self.find_bot_id)
+        if self.spool:
+            startup.append(self.start_spool)
+            sirbot.on_shutdown.insert(0, self.stop_spool)
+        if startup:
+            sirbot.on_startup.append(concurrently(*startup))
+
+        self.on_event("channel_created", self._channel_changed)
+        self.on_event("channel_rename", self._channel_changed)
+        if self.channels.names:
+            sirbot.add_warmup("slack_channels", self.load_channels)
+            # Each process has its own directory, and may miss events of private channels
+            sirbot.scheduler.add(
+                "slack_channels",
+                self.load_channels,
+                every=3600,
+                jitter=300,
+                max_runtime=120,
+                missed="skip",
+                leader=False,
+            )
+
+        # Every handler is registered by then, dispatch on precompiled tables
+        sirbot.on_startup.append(self.freeze_routers)
+
+        if self.socket_mode:
+            sirbot.on_startup.append(self.start_socket_mode)
+            # Before sirbot closes the HTTP clients the connections depend on
+            sirbot.on_shutdown.insert(0, self.stop_socket_mode)
 
     async def _initialize_api(self, app: Any) -> None:
-        """Initialize SlackAPI after http_session is created."""
+        """Initialize SlackAPI on startup, with the `slack` HTTP client."""
         if self.api is None:
             LOG.info("Initializing Slack API client")
-            self.api = SlackAPI(session=self._sirbot.http_session, token=self.token)
+            self.api = SlackAPI(
+                session=self._sirbot.http_client("slack"),
+                token=self.token,
+                root_url=self.api_url,
+            )
+            self.api.response_hooks.append(self.messages.record)
+
+    async def start_spool(self, app: Any) -> None:
+        """Send the spooled messages left from a previous run and the new ones."""
+        if app.worker:
+            # Each worker sends what it spooled, a restarted worker takes its file back
+            self.spool.path = f"{self.spool.path}.{app.worker}"
+        await self.spool.start(self.api)
+
+    async def stop_spool(self, app: Any) -> None:
+        await self.spool.stop()
 
-    def on_event(self, event_type: str, handler: AsyncHandler, wait: bool = True) -> None:
+    async def freeze_routers(self, app: Any) -> None:
+        """Compile the event, command and action routes into immutable dispatch tables."""
+        for name in ("event", "command", "action"):
+            self.routers[name].freeze()
+
+    async def start_socket_mode(self, app: Any) -> None:
+        """Open the Socket Mode connections, in the background."""
+        if self.socket_client is None:
+            self.socket_client = SocketModeClient(
+                app,
+                self._sirbot.http_client("slack"),
+                app_token=self.app_token,
+                connections=self.socket_connections,
+                api_url=self.api_url,
+            )
+        await self.socket_client.start()
+
+    async def stop_socket_mode(self, app: Any) -> None:
+        if self.socket_client:
+            await self.socket_client.stop()
+
+    async def load_channels(self, app: Any) -> None:
+        """
+        Resolve the configured channel names and route messages by channel ID.
+
+        A failure is raised, for the warm-up and the scheduler to report it, once the names
+        resolved so far are routed by ID. The others stay routed by name.
+        """
+        if not self.channels.names:
+            return
+
+        try:
+            await self.channels.load(self.api)
+        finally:
+            self.routers["message"].resolve_channels(self.channels.id)
+
+    async def _channel_changed(self, event: Any, app: Any) -> None:
+        if self.channels.update(event["channel"]):
+            self.routers["message"].resolve_channels(self.channels.id)
+
+    def on_event(
+        self,
+        event_type: str,
+        handler: AsyncHandler,
+        wait: bool = True,
+        deadline: float | None = None,
+    ) -> None:
         """Register handler for an event."""
         handler = _ensure_async(handler)
-        configuration = {"wait": wait}
+        configuration = _configuration(deadline, wait=wait)
         self.routers["event"].register(event_type, (handler, configuration))
 
-    def on_command(self, command: str, handler: AsyncHandler, wait: bool = True) -> None:
-        """Register handler for a command."""
+    def on_command(
+        self,
+        command: str,
+        handler: AsyncHandler,
+        wait: bool = True,
+        inline: bool = False,
+        deadline: float | None = None,
+    ) -> None:
+        """
+        Register handler for a command.
+
+        Inline handlers return the response message (``text``, ``blocks``, ``response_type``...)
+        instead of posting it. It is sent as the HTTP response when ready within
+        ``command_deadline`` or to the command ``response_url`` otherwise.
+        """
         handler = _ensure_async(handler)
-        configuration = {"wait": wait}
+        configuration = _configuration(deadline, wait=wait, inline=inline)
         self.routers["command"].register(command, (handler, configuration))
 
     def on_message(
@@ -129,15 +309,38 @@ class SlackPlugin:
         mention: bool = False,
         admin: bool = False,
         wait: bool = True,
+        cooldown: dict[str, float] | None = None,
+        deadline: float | None = None,
+        when: Callable[[Message], bool] | None = None,
         **kwargs: Any,
     ) -> None:
-        """Register handler for a message pattern."""
+        """
+        Register handler for a message pattern.
+
+        Args:
+            cooldown: Seconds the handler isn't called again per ``user`` and/or ``channel``
+                after a call, see :class:`Cooldown`. Shared by the patterns of a handler.
+            when: Whether the handler is called for a message, checked before its cooldown
+                so the messages it ignores don't start a window.
+        """
         handler = _ensure_async(handler)
 
         if admin and not self.admins:
             LOG.warning("Slack admin IDs are not set. Admin-limited endpoints will not work.")
 
-        configuration = {"mention": mention, "admin": admin, "wait": wait}
+        configuration = _configuration(deadline, mention=mention, admin=admin, wait=wait)
+        if when:
+            configuration["when"] = when
+        if cooldown:
+            name = handler.__qualname__
+            if name not in self.cooldowns:
+                self.cooldowns[name] = Cooldown(name, cooldown)
+            elif self.cooldowns[name].windows != cooldown:
+                raise ValueError(f"Handler {name} already has a different cooldown")
+            configuration["cooldown"] = self.cooldowns[name]
+        if "channel" in kwargs:
+            self.channels.watch(kwargs["channel"])
+            kwargs["channel"] = self.channels.id(kwargs["channel"])
         self.routers["message"].register(
             pattern=pattern, handler=(handler, configuration), **kwargs
         )
@@ -148,10 +351,11 @@ class SlackPlugin:
         handler: AsyncHandler,
         name: str = "*",
         wait: bool = True,
+        deadline: float | None = None,
     ) -> None:
         """Register handler for an action."""
         handler = _ensure_async(handler)
-        configuration = {"wait": wait}
+        configuration = _configuration(deadline, wait=wait)
         self.routers["action"].register(action, (handler, configuration), name)
 
     def on_block(
@@ -160,10 +364,11 @@ class SlackPlugin:
         handler: AsyncHandler,
         action_id: str = "*",
         wait: bool = True,
+        deadline: float | None = None,
     ) -> None:
         """Register handler for a block_actions type action."""
         handler = _ensure_async(handler)
-        configuration = {"wait": wait}
+        configuration = _configuration(deadline, wait=wait)
         self.routers["action"].register_block_action(block_id, (handler, configuration), action_id)
 
     def on_dialog_submission(
@@ -171,12 +376,25 @@ class SlackPlugin:
         callback_id: str,
         handler: AsyncHandler,
         wait: bool = True,
+        deadline: float | None = None,
     ) -> None:
         """Register handler for a dialog_submission type action."""
         handler = _ensure_async(handler)
-        configuration = {"wait": wait}
+        configuration = _configuration(deadline, wait=wait)
         self.routers["action"].register_dialog_submission(callback_id, (handler, configuration))
 
+    def record_messages(self, block_id: str | None = None, callback_id: str | None = None) -> None:
+        """
+        Keep the messages of the bot holding the `block_id` block or the `callback_id`
+        attachment in :attr:`messages`, for the handlers reading them back.
+        """
+        for ids, new in ((self.recorded_blocks, block_id), (self.recorded_callbacks, callback_id)):
+            if new:
+                ids.add(new)
+        if self.messages:
+            self.messages.block_ids.update(self.recorded_blocks)
+            self.messages.callback_ids.update(self.recorded_callbacks)
+
     async def find_bot_id(self, app: Any) -> None:
         rep = await self.api.query(url=methods.USERS_INFO, data={"user": self.bot_user_id})
         self.bot_id = rep["user"]["profile"]["bot_id"]
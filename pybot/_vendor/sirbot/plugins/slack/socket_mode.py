@@ -0,0 +1,183 @@
+"""
+Socket Mode transport for the Slack plugin.
+"""
+
+import asyncio
+import json
+import logging
+import random
+from typing import Any
+
+import aiohttp
+
+from pybot._vendor.slack import methods
+from pybot._vendor.slack.actions import Action
+from pybot._vendor.slack.commands import Command
+from pybot._vendor.slack.events import Event
+from pybot._vendor.slack.exceptions import HTTPException, SlackAPIError
+from pybot._vendor.slack.io.aiohttp import SlackAPI
+
+from . import endpoints
+
+LOG = logging.getLogger(__name__)
+
+
+class SocketModeClient:
+    """
+    Receive events, commands and actions over Socket Mode WebSocket connections.
+
+    Each connection asks ``apps.connections.open`` for a WebSocket URL and keeps it open,
+    reconnecting with exponential backoff when it drops or Slack asks for a refresh. Envelopes
+    are acknowledged as soon as they are received and then dispatched concurrently to the
+    plugin routers, inline command answers are sent to the command ``response_url``.
+
+    Args:
+        app: Sirbot application.
+        session: HTTP session used for the API call and the WebSocket connections.
+        app_token: App-level token (``xapp-...``) with the ``connections:write`` scope.
+        connections: Number of simultaneous connections, Slack spreads envelopes across them.
+        api_url: Base URL of the Slack Web API.
+        min_backoff: Seconds before the first reconnection attempt after a failure.
+        max_backoff: Maximum seconds between two reconnection attempts.
+        heartbeat: Seconds between two WebSocket pings.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        session: aiohttp.ClientSession,
+        *,
+        app_token: str,
+        connections: int = 2,
+        api_url: str | None = None,
+        min_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        heartbeat: float = 30.0,
+    ) -> None:
+        self._app = app
+        self._session = session
+        self._api = SlackAPI(session=session, token=app_token, root_url=api_url)
+        self.connections = connections
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.heartbeat = heartbeat
+
+        self._sockets: dict[int, aiohttp.ClientWebSocketResponse] = {}
+        self._runners: list[asyncio.Task] = []
+        self._handlers: set[asyncio.Task] = set()
+        self._running = False
+
+    @property
+    def connected(self) -> int:
+        """Number of open connections."""
+        return sum(not ws.closed for ws in self._sockets.values())
+
+    async def start(self) -> None:
+        if self._running:
+            return
+
+        LOG.info("Starting %s Slack Socket Mode connections", self.connections)
+        self._running = True
+        self._runners = [
+            asyncio.ensure_future(self._run(slot)) for slot in range(self.connections)
+        ]
+
+    async def stop(self) -> None:
+        """Close the connections and wait for the envelopes being handled."""
+        self._running = False
+        for ws in list(self._sockets.values()):
+            await ws.close()
+        for runner in self._runners:
+            runner.cancel()
+        await asyncio.gather(*self._runners, return_exceptions=True)
+        self._runners = []
+
+        if self._handlers:
+            await asyncio.wait(self._handlers)
+
+    async def _run(self, slot: int) -> None:
+        backoff = self.min_backoff
+        while self._running:
+            try:
+                url = await self._open_url()
+                async with self._session.ws_connect(url, heartbeat=self.heartbeat) as ws:
+                    self._sockets[slot] = ws
+                    if await self._consume(ws, slot):
+                        backoff = self.min_backoff
+                        continue
+            except (aiohttp.ClientError, HTTPException, SlackAPIError, asyncio.TimeoutError) as e:
+                LOG.warning("Socket Mode connection %s failed: %s", slot, e)
+            except Exception:
+                # Anything else, e.g. an unexpected answer, must not end the connection for good
+                LOG.exception("Socket Mode connection %s failed", slot)
+            finally:
+                self._sockets.pop(slot, None)
+
+            if not self._running:
+                break
+
+            # Jittered so connections failing together don't reconnect together
+            delay = random.uniform(backoff / 2, backoff)
+            LOG.info("Reconnecting Socket Mode connection %s in %.1fs", slot, delay)
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def _open_url(self) -> str:
+        response = await self._api.query(methods.APPS_CONNECTIONS_OPEN)
+        return response["url"]
+
+    async def _consume(self, ws: aiohttp.ClientWebSocketResponse, slot: int) -> bool:
+        """
+        Read envelopes until the connection closes.
+
+        Returns:
+            True if the connection was healthy (Slack said hello), to reconnect immediately.
+        """
+        healthy = False
+        async for message in ws:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                break
+
+            try:
+                data = json.loads(message.data)
+            except ValueError:
+                data = None
+            if not isinstance(data, dict):
+                LOG.warning("Ignoring malformed Socket Mode frame on connection %s", slot)
+                continue
+
+            if "envelope_id" in data:
+                await ws.send_json({"envelope_id": data["envelope_id"]})
+                self._handle(data)
+            elif data.get("type") == "hello":
+                healthy = True
+                LOG.info(
+                    "Socket Mode connection %s ready (%s open)",
+                    slot,
+                    data.get("num_connections"),
+                )
+            elif data.get("type") == "disconnect":
+                LOG.info("Socket Mode connection %s closing: %s", slot, data.get("reason"))
+                break
+
+        return healthy
+
+    def _handle(self, envelope: dict) -> None:
+        f = asyncio.ensure_future(self._dispatch(envelope))
+        self._handlers.add(f)
+        f.add_done_callback(self._handlers.discard)
+        f.add_done_callback(endpoints._callback)
+
+    async def _dispatch(self, envelope: dict) -> None:
+        envelope_type, payload = envelope.get("type"), envelope.get("payload", {})
+        LOG.log(5, "Incoming Socket Mode %s envelope: %s", envelope_type, payload)
+
+        if envelope_type == "events_api":
+            await endpoints.handle_event(Event.from_http(payload), self._app)
+        elif envelope_type == "slash_commands":
+            # Already acknowledged, inline answers can only go to the response_url
+            await endpoints.handle_command(Command(payload), self._app, deadline=0)
+        elif envelope_type == "interactive":
+            await endpoints.handle_action(Action(payload), self._app)
+        else:
+            LOG.debug("Ignoring Socket Mode envelope of type %s", envelope_type)
@@ -0,0 +1,397 @@
+"""
+Durable outbound spool for the Slack plugin.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import time
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import aiohttp
+
+from pybot._vendor.sirbot.ttl import TTLStore
+from pybot._vendor.slack import methods
+from pybot._vendor.slack.exceptions import HTTPException, RateLimited, SlackAPIError
+from pybot._vendor.slack.io.abc import SlackAPI
+from pybot._vendor.slack.templates import dumps
+
+LOG = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    lane TEXT NOT NULL,
+    method TEXT NOT NULL,
+    data TEXT NOT NULL,
+    thread_of INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL,
+    ts TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, id);
+"""
+
+
+@dataclass
+class SpoolEntry:
+    """A message waiting in the spool."""
+
+    id: int
+    lane: str
+    method: str
+    data: dict
+    thread_of: int | None = None
+    attempts: int = 0
+    not_before: float = 0.0
+
+
+class OutboundSpool:
+    """
+    Persist outbound Slack API calls to SQLite and deliver them with a pool of workers.
+
+    Calls are written to a WAL database before :meth:`enqueue` returns, writes made within
+    ``flush_interval`` are committed (and fsynced) together. Entries of the same lane (the
+    channel, or the lane of the parent for threaded replies) are sent one at a time in order,
+    different lanes are sent concurrently by ``workers`` workers.
+
+    A 429 pauses every worker for its ``Retry-After``. Network and server errors are retried
+    with jittered exponential backoff, up to ``max_attempts``. Slack API errors are final.
+    Entries still pending on shutdown are sent on the next start.
+
+    Args:
+        path: SQLite database file.
+        workers: Number of lanes sent concurrently.
+        flush_interval: Seconds writes are collected before being committed together.
+        max_attempts: Attempts before giving up on an entry.
+        min_backoff: Seconds before the first retry.
+        max_backoff: Maximum seconds between two retries.
+        retention: Seconds sent and failed entries are kept, for threaded replies and inspection.
+            The ``ts`` of the last ``MAX_TIMESTAMPS`` messages sent are cached as long, older
+            ones are read back from the database.
+        drain_timeout: Seconds to wait for the messages being sent on shutdown.
+    """
+
+    MAX_TIMESTAMPS = 10_000
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        workers: int = 4,
+        flush_interval: float = 0.005,
+        max_attempts: int = 8,
+        min_backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        retention: float = 86400.0,
+        drain_timeout: float = 5.0,
+    ) -> None:
+        self.path = path
+        self.workers = workers
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.retention = retention
+        self.drain_timeout = drain_timeout
+
+        self.stats = {"enqueued": 0, "sent": 0, "retried": 0, "failed": 0, "ratelimited": 0}
+        self._api: SlackAPI | None = None
+        self._db: sqlite3.Connection | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._lanes: dict[str, deque[SpoolEntry]] = {}
+        self._lane_of: dict[int, str] = {}
+        self._timestamps = TTLStore(retention, maxsize=self.MAX_TIMESTAMPS)
+        self._ready: asyncio.Queue[str | None] = asyncio.Queue()
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._paused_until = 0.0
+
+        self._writes: list[tuple[str, tuple, asyncio.Future | None]] = []
+        self._wake = asyncio.Event()
+        self._writer: asyncio.Task | None = None
+        self._workers: list[asyncio.Task] = []
+        self._running = False
+
+    @property
+    def pending(self) -> int:
+        """Number of entries waiting to be sent."""
+        return sum(len(lane) for lane in self._lanes.values())
+
+    async def start(self, api: SlackAPI) -> None:
+        """Open the database, load the pending entries and start the workers."""
+        if self._running:
+            return
+
+        self._api = api
+        loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slack-spool")
+        entries, timestamps = await loop.run_in_executor(self._executor, self._open)
+        for entry_id, ts in timestamps.items():
+            self._timestamps.set(entry_id, ts)
+        for entry in entries:
+            self._add(entry)
+        LOG.info("Slack outbound spool %s started with %s pending entries", self.path, len(entries))
+
+        self._running = True
+        self._writer = asyncio.ensure_future(self._write_loop())
+        self._workers = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Finish the messages being sent and close the database, pending entries are kept."""
+        if not self._running:
+            return
+
+        self._running = False
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for _ in self._workers:
+            self._ready.put_nowait(None)
+
+        if self._workers:
+            _, stuck = await asyncio.wait(self._workers, timeout=self.drain_timeout)
+            for worker in stuck:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+
+        # Not cancelled, a batch being committed would be lost
+        self._wake.set()
+        await self._writer
+        await self._flush()
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close)
+        self._executor.shutdown()
+        self._lanes.clear()
+        self._lane_of.clear()
+        LOG.info("Slack outbound spool %s stopped", self.path)
+
+    async def enqueue(
+        self,
+        data: Mapping,
+        method: methods = methods.CHAT_POST_MESSAGE,
+        thread_of: int | None = None,
+        delay: float = 0.0,
+    ) -> int:
+        """
+        Persist an API call, returning once it is on disk.
+
+        Args:
+            data: Call arguments, e.g. a :class:`slack.events.Message`.
+            method: Slack API method.
+            thread_of: ID of a spooled message to reply to, its ``ts`` is set as the
+                ``thread_ts`` of `data` when sent.
+            delay: Seconds before the call can be sent.
+
+        Returns:
+            ID of the spool entry.
+
+        Raises:
+            RuntimeError: The spool isn't running, nothing would write the call to disk.
+        """
+        if not self._running:
+            raise RuntimeError(f"Slack outbound spool {self.path} isn't running")
+
+        data = dict(data)
+        lane = self._lane_of.get(thread_of) or data.get("channel", "")
+        not_before = time.time() + delay
+
+        entry_id = await self._write(
+            "INSERT INTO outbox (lane, method, data, thread_of, not_before, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (lane, method.name, dumps(data), thread_of, not_before, time.time()),
+        )
+        self.stats["enqueued"] += 1
+        self._add(SpoolEntry(entry_id, lane, method.name, data, thread_of, 0, not_before))
+        return entry_id
+
+    def _add(self, entry: SpoolEntry) -> None:
+        self._lane_of[entry.id] = entry.lane
+        if entry.lane in self._lanes:
+            self._lanes[entry.lane].append(entry)
+        else:
+            # A new lane isn't held by any worker yet
+            self._lanes[entry.lane] = deque([entry])
+            self._ready.put_nowait(entry.lane)
+
+    def _schedule(self, lane: str, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        self._timers[lane] = loop.call_later(delay, self._wake_lane, lane)
+
+    def _wake_lane(self, lane: str) -> None:
+        self._timers.pop(lane, None)
+        self._ready.put_nowait(lane)
+
+    async def _work(self) -> None:
+        while True:
+            lane = await self._ready.get()
+            if lane is None:
+                return
+
+            entries = self._lanes[lane]
+            while entries and self._running:
+                entry = entries[0]
+                wait = max(entry.not_before, self._paused_until) - time.time()
+                if wait > 0:
+                    self._schedule(lane, wait)
+                    break
+
+                if await self._send(entry):
+                    entries.popleft()
+                    self._lane_of.pop(entry.id, None)
+            else:
+                if not entries:
+                    del self._lanes[lane]
+
+    async def _send(self, entry: SpoolEntry) -> bool:
+        """Send an entry, returns False when it must be retried later."""
+        data = entry.data
+        if entry.thread_of is not None:
+            thread_ts = self._timestamps.get(entry.thread_of)
+            if not thread_ts:
+                thread_ts = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._sent_ts, entry.thread_of
+                )
+            if not thread_ts:
+                LOG.warning("Dropping spooled reply %s, its parent wasn't posted", entry.id)
+                self._finish(entry, "failed")
+                return True
+            data = {**data, "thread_ts": thread_ts}
+
+        try:
+            response = await self._api.query(methods[entry.method], data)
+        except RateLimited as e:
+            self.stats["ratelimited"] += 1
+            self._paused_until = time.time() + (e.retry_after or 1)
+            LOG.warning("Slack outbound spool rate limited for %ss", e.retry_after)
+            return False
+        except SlackAPIError as e:
+            LOG.warning("Spooled %s %s failed: %s", entry.method, entry.id, e.error)
+            self._finish(entry, "failed")
+            return True
+        except (HTTPException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return self._retry(entry, e)
+
+        self._finish(entry, "sent", response.get("ts"))
+        return True
+
+    def _retry(self, entry: SpoolEntry, error: Exception) -> bool:
+        entry.attempts += 1
+        if entry.attempts >= self.max_attempts:
+            LOG.error("Giving up on spooled %s %s: %s", entry.method, entry.id, error)
+            self._finish(entry, "failed")
+            return True
+
+        backoff = min(self.min_backoff * 2 ** (entry.attempts - 1), self.max_backoff)
+        entry.not_before = time.time() + random.uniform(backoff / 2, backoff)
+        self.stats["retried"] += 1
+        LOG.info("Retrying spooled %s %s: %s", entry.method, entry.id, error)
+        self._write_nowait(
+            "UPDATE outbox SET attempts = ?, not_before = ?, updated = ? WHERE id = ?",
+            (entry.attempts, entry.not_before, time.time(), entry.id),
+        )
+        return False
+
+    def _finish(self, entry: SpoolEntry, status: str, ts: str | None = None) -> None:
+        self.stats[status] += 1
+        if ts:
+            self._timestamps.set(entry.id, ts)
+        self._write_nowait(
+            "UPDATE outbox SET status = ?, ts = ?, attempts = ?, updated = ? WHERE id = ?",
+            (status, ts, entry.attempts, time.time(), entry.id),
+        )
+
+    # Group commit
+
+    async def _write(self, sql: str, params: tuple) -> int:
+        future = asyncio.get_running_loop().create_future()
+        self._writes.append((sql, params, future))
+        self._wake.set()
+        return await future
+
+    def _write_nowait(self, sql: str, params: tuple) -> None:
+        self._writes.append((sql, params, None))
+        self._wake.set()
+
+    async def _write_loop(self) -> None:
+        while self._running:
+            await self._wake.wait()
+            if self.flush_interval:
+                await asyncio.sleep(self.flush_interval)
+            self._wake.clear()
+            await self._flush()
+
+    async def _flush(self) -> None:
+        batch, self._writes = self._writes, []
+        if not batch:
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            ids = await loop.run_in_executor(self._executor, self._commit, batch)
+        except Exception as e:
+            LOG.exception("Failed to write %s entries to the Slack outbound spool", len(batch))
+            for _, _, future in batch:
+                if future and not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), entry_id in zip(batch, ids, strict=True):
+            if future and not future.done():
+                future.set_result(entry_id)
+
+    # Database thread
+
+    def _open(self) -> tuple[list[SpoolEntry], dict[int, str]]:
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Every commit is fsynced, writes are batched to share the cost
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(SCHEMA)
+
+        with self._db:
+            self._db.execute(
+                "DELETE FROM outbox WHERE status != 'pending' AND updated < ?",
+                (time.time() - self.retention,),
+            )
+
+        rows = self._db.execute(
+            "SELECT id, lane, method, data, thread_of, attempts, not_before "
+            "FROM outbox WHERE status = 'pending' ORDER BY id"
+        ).fetchall()
+        entries = [
+            SpoolEntry(id_, lane, method, json.loads(data), thread_of, attempts, not_before)
+            for id_, lane, method, data, thread_of, attempts, not_before in rows
+        ]
+
+        timestamps = dict(
+            self._db.execute(
+                "SELECT id, ts FROM outbox WHERE status = 'sent' AND ts IS NOT NULL AND id IN "
+                "(SELECT thread_of FROM outbox WHERE status = 'pending')"
+            ).fetchall()
+        )
+        return entries, timestamps
+
+    def _commit(self, batch: list[tuple[str, tuple, Any]]) -> list[int]:
+        with self._db:
+            return [self._db.execute(sql, params).lastrowid for sql, params, _ in batch]
+
+    def _sent_ts(self, entry_id: int) -> str | None:
+        row = self._db.execute(
+            "SELECT ts FROM outbox WHERE id = ? AND status = 'sent'", (entry_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _close(self) -> None:
+        if self._db:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,180 @@
+"""
+Sampling profiler and stall detector of the event loop.
+
+Both watch the thread running the event loop from another thread, reading its stack with
+:func:`sys._current_frames`, so the loop itself runs unchanged.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Callable
+from types import FrameType
+from typing import Any
+
+LOG = logging.getLogger(__name__)
+
+
+def _frames(frame: FrameType | None, limit: int | None = None) -> list[str]:
+    """Frames of a stack from the outermost one, as ``module:function``."""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{frame.f_globals.get('__name__', code.co_filename)}:{code.co_qualname}")
+        frame = frame.f_back
+    frames.reverse()
+    return frames[-limit:] if limit else frames
+
+
+class SamplingProfiler:
+    """
+    Profile the event loop by sampling its stack every `interval` seconds.
+
+    The stacks are counted in the collapsed format of flamegraph tools, one
+    ``outer;...;inner count`` line per stack. A single profile runs at a time.
+
+    Args:
+        interval: Seconds between two samples.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self._running = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._running.locked()
+
+    async def profile(self, seconds: float) -> str:
+        """
+        Sample the stack of the event loop for `seconds`.
+
+        Raises:
+            RuntimeError: A profile is running already.
+        """
+        if not self._running.acquire(blocking=False):
+            raise RuntimeError("A profile is running already")
+
+        try:
+            stacks = await asyncio.to_thread(self._sample, threading.get_ident(), seconds)
+        finally:
+            self._running.release()
+
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+    def _sample(self, thread_id: int, seconds: float) -> Counter[str]:
+        stacks: Counter[str] = Counter()
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                stacks[";".join(_frames(frame))] += 1
+            del frame
+            time.sleep(self.interval)
+        return stacks
+
+
+class StallDetector:
+    """
+    Detect the event loop stalling, and the handler responsible.
+
+    The loop beats every `threshold / 2` seconds, a watchdog thread noticing a beat late by
+    more than `threshold` records what the loop is running: its stack and the handler run by the
+    current task, as given by `describe`. The last `history` stalls are kept.
+
+    Args:
+        threshold: Seconds the loop has to be blocked for to be stalled.
+        describe: Handler run by a task (e.g. its name and event type), ``None`` if unknown.
+        history: Number of stalls kept.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        describe: Callable[[asyncio.Task], dict[str, Any] | None] | None = None,
+        history: int = 100,
+    ) -> None:
+        self.threshold = threshold
+        self.interval = threshold / 2
+        self.describe = describe or (lambda task: None)
+        self.stalls: deque[dict[str, Any]] = deque(maxlen=history)
+        self.stats = {"detected": 0, "stalled_seconds": 0.0}
+        self.by_handler: Counter[str] = Counter()
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread_id = 0
+        self._beat = 0.0
+        self._heartbeat: asyncio.TimerHandle | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    async def start(self, app: Any = None) -> None:
+        if self._watchdog is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._stopping.clear()
+        self._beat_now()
+        self._watchdog = threading.Thread(target=self._watch, name="stall-detector", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self, app: Any = None) -> None:
+        if self._watchdog is None:
+            return
+        self._stopping.set()
+        if self._heartbeat:
+            self._heartbeat.cancel()
+        await asyncio.to_thread(self._watchdog.join)
+        self._watchdog = None
+
+    def _beat_now(self) -> None:
+        self._beat = time.monotonic()
+        self._heartbeat = self._loop.call_later(self.interval, self._beat_now)
+
+    def _watch(self) -> None:
+        stall = None
+        while not self._stopping.wait(self.interval / 2):
+            beat = self._beat
+            late = time.monotonic() - beat - self.interval
+            if stall is None and late >= self.threshold:
+                stall = self._capture(beat)
+            elif stall is not None and beat != stall["beat"]:
+                self._record(stall, self._beat - stall["beat"] - self.interval)
+                stall = None
+
+    def _capture(self, beat: float) -> dict[str, Any]:
+        """What the loop is running, while stalled."""
+        task = asyncio.current_task(self._loop)
+        frame = sys._current_frames().get(self._thread_id)
+        stall = {
+            "beat": beat,
+            "started": time.time() - (time.monotonic() - beat - self.interval),
+            "handler": self.describe(task) if task else None,
+            "task": task.get_name() if task else None,
+            "stack": _frames(frame, limit=50),
+        }
+        del frame
+        return stall
+
+    def _record(self, stall: dict[str, Any], duration: float) -> None:
+        del stall["beat"]
+        stall["duration"] = round(duration, 3)
+        name = (stall["handler"] or {}).get("handler", "unknown")
+
+        self.stalls.append(stall)
+        self.stats["detected"] += 1
+        self.stats["stalled_seconds"] += duration
+        self.by_handler[name] += 1
+        LOG.warning("Event loop stalled %.3fs in %s (%s)", duration, name, stall["task"])
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "threshold": self.threshold,
+            "running": self._watchdog is not None,
+            **self.stats,
+            "by_handler": dict(self.by_handler),
+            "stalls": list(self.stalls),
+        }
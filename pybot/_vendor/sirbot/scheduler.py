@@ -0,0 +1,387 @@
+"""
+Background job scheduler for sirbot, with a leader lease so each job runs in one process.
+"""
+
+import asyncio
+import fcntl
+import logging
+import os
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any, Protocol
+
+LOG = logging.getLogger(__name__)
+
+MISSED_POLICIES = ("once", "skip")
+
+
+class Interval:
+    """Run every `seconds`."""
+
+    def __init__(self, seconds: float) -> None:
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+
+    def next(self, after: float) -> float:
+        return after + self.seconds
+
+    def __repr__(self) -> str:
+        return f"every {self.seconds}s"
+
+
+class Cron:
+    """
+    Run at the times matching a 5 fields cron expression, in UTC.
+
+    Fields are minute, hour, day of month, month and day of week (``0`` or ``7`` is Sunday).
+    Each accepts ``*``, numbers, ranges (``1-5``), steps (``*/15``, ``0-30/10``) and
+    comma separated lists of those. Like cron, a day matches either of the day of month and day
+    of week fields when both are restricted.
+    """
+
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str) -> None:
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+
+        self.expression = expression
+        fields = [self._parse(p, *bounds) for p, bounds in zip(parts, self.FIELDS, strict=True)]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        self.weekdays = {d % 7 for d in weekdays}
+        self._any_day = parts[2] == "*"
+        self._any_weekday = parts[4] == "*"
+
+    @staticmethod
+    def _parse(part: str, low: int, high: int) -> frozenset[int]:
+        values = set()
+        for item in part.split(","):
+            spec, _, step = item.partition("/")
+            if spec == "*":
+                start, end = low, high
+            elif "-" in spec:
+                start, end = (int(v) for v in spec.split("-", 1))
+            else:
+                start = end = int(spec)
+                if step:
+                    end = high
+
+            step = int(step or 1)
+            if not low <= start <= end <= high or step < 1:
+                raise ValueError(f"Invalid cron field {part!r}")
+            values.update(range(start, end + 1, step))
+        return frozenset(values)
+
+    def _day_matches(self, day: datetime) -> bool:
+        in_month = day.day in self.days
+        in_week = (day.isoweekday() % 7) in self.weekdays
+        if self._any_day or self._any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next(self, after: float) -> float:
+        t = datetime.fromtimestamp(after, UTC).replace(second=0, microsecond=0)
+        t += timedelta(minutes=1)
+        # Every (month, day) combination repeats within 4 years
+        limit = t + timedelta(days=4 * 366)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+            elif t.hour not in self.hours:
+                t = (t + timedelta(hours=1)).replace(minute=0)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t.timestamp()
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def __repr__(self) -> str:
+        return f"cron {self.expression!r}"
+
+
+class Lease(Protocol):
+    """Leadership shared by the schedulers, see :class:`sirbot.state.Lock` and :class:`FileLease`."""
+
+    async def acquire(self) -> bool:
+        """Take or extend the lease, returns whether it is held."""
+
+    async def release(self) -> bool: ...
+
+
+class FileLease:
+    """
+    Lease held with an exclusive ``flock`` on `path`, for the processes of a host.
+
+    The lock is released by the kernel when the holder dies, it doesn't need renewing.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fd: int | None = None
+
+    async def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    async def release(self) -> bool:
+        if self._fd is None:
+            return False
+
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+        return True
+
+
+@dataclass
+class Job:
+    """A scheduled job, see :meth:`Scheduler.add`."""
+
+    name: str
+    func: Callable[[Any], Awaitable[Any]]
+    trigger: Interval | Cron
+    jitter: float = 0.0
+    max_runtime: float | None = None
+    missed: str = "once"
+    grace: float = 60.0
+    leader: bool = True
+
+    next_run: float | None = None
+    last_run: float | None = None
+    task: asyncio.Task | None = None
+    stats: dict[str, Any] = field(
+        default_factory=lambda: {
+            "runs": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "missed": 0,
+            "overlapped": 0,
+            "last_duration": None,
+        }
+    )
+
+    def next_after(self, after: float) -> float:
+        return self.trigger.next(after) + random.uniform(0, self.jitter)
+
+
+class Scheduler:
+    """
+    Run periodic jobs in the background of a sirbot.
+
+    Leader jobs only run in the process holding the lease, and in the primary worker of
+    ``SirBot.start(workers=N)``. The lease is a lock on the state backend by default, so it
+    elects one process among those sharing it; their last run is kept in the state backend too,
+    so a new leader knows which runs were missed. Local jobs run in every process, e.g. to refresh
+    per process caches.
+
+    A run is missed when the job is overdue by more than its grace period: no process was the
+    leader at the time, or the event loop was blocked. With the ``once`` policy a missed job runs
+    as soon as possible (jobs that never ran start right away), with ``skip`` it waits for its
+    next time. A run due while the previous one is still going is skipped.
+
+    Args:
+        app: The sirbot, passed to the jobs.
+        lease: Leader lease, a lock on ``app.state`` when ``None``.
+        lease_ttl: Seconds the lease lasts without being renewed.
+        tick: Seconds between two checks of the jobs.
+    """
+
+    def __init__(
+        self, app: Any, lease: Lease | None = None, lease_ttl: float = 30.0, tick: float = 1.0
+    ) -> None:
+        self.app = app
+        self.lease = lease
+        self.lease_ttl = lease_ttl
+        self.tick = tick
+
+        self.jobs: dict[str, Job] = {}
+        self.leader = False
+        self._renewed = 0.0
+        self._started = False
+        self._task: asyncio.Task | None = None
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[Any], Awaitable[Any]],
+        *,
+        every: float | None = None,
+        cron: str | None = None,
+        jitter: float = 0.0,
+        max_runtime: float | None = None,
+        missed: str = "once",
+        grace: float = 60.0,
+        leader: bool = True,
+    ) -> Job:
+        """
+        Schedule ``func(app)``.
+
+        Args:
+            name: Unique name of the job, also its key in the state backend.
+            func: Coroutine function called with the sirbot.
+            every: Seconds between two runs.
+            cron: Cron expression of the run times, instead of `every`.
+            jitter: Maximum random seconds added to each run time, to spread the load.
+            max_runtime: Seconds after which a run is cancelled.
+            missed: Policy for missed runs, ``once`` or ``skip``.
+            grace: Seconds a run can be late without being missed.
+            leader: Only run in the leader process.
+        """
+        if name in self.jobs:
+            raise ValueError(f"Job {name} is already scheduled")
+        if (every is None) == (cron is None):
+            raise ValueError("Either every or cron is required")
+        if missed not in MISSED_POLICIES:
+            raise ValueError(f"Missed runs policy must be one of {MISSED_POLICIES}")
+
+        trigger = Interval(every) if every is not None else Cron(cron)
+        job = Job(name, func, trigger, jitter, max_runtime, missed, grace, leader)
+        self.jobs[name] = job
+        LOG.info("Scheduled job %s %s", name, trigger)
+
+        if self._started and self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        return job
+
+    async def start(self, app: Any = None) -> None:
+        """Start running the jobs, those added later start right away."""
+        self._started = True
+        if self.lease is None:
+            self.lease = self.app.state.lock("sirbot:scheduler", ttl=self.lease_ttl)
+        if self.jobs and self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self, app: Any = None) -> None:
+        """Cancel the running jobs and give up the lease."""
+        self._started = False
+        tasks = [job.task for job in self.jobs.values() if job.task]
+        if self._task:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self.leader:
+            self.leader = False
+            try:
+                await self.lease.release()
+            except Exception:
+                LOG.exception("Failed to release the scheduler lease")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "leader": self.leader,
+            "jobs": {
+                name: {
+                    "trigger": repr(job.trigger),
+                    "leader": job.leader,
+                    "running": job.task is not None,
+                    "last_run": job.last_run,
+                    "next_run": job.next_run,
+                    **job.stats,
+                }
+                for name, job in self.jobs.items()
+            },
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._tick()
+            except Exception:
+                LOG.exception("Scheduler tick failed")
+            await asyncio.sleep(self.tick)
+
+    async def _tick(self) -> None:
+        leader = await self._elect()
+        now = time.time()
+        for job in list(self.jobs.values()):
+            if job.leader and not leader:
+                # Read back from the state backend when elected
+                job.next_run = None
+                continue
+
+            if job.next_run is None:
+                job.next_run = await self._first_run(job, now)
+            if job.next_run > now:
+                continue
+
+            if job.task is not None:
+                job.stats["overlapped"] += 1
+                LOG.warning("Skipping job %s, its previous run is still going", job.name)
+            elif now - job.next_run > job.grace and job.missed == "skip":
+                job.stats["missed"] += 1
+                LOG.warning("Skipping missed run of job %s", job.name)
+            else:
+                job.task = asyncio.ensure_future(self._run_job(job, now))
+            job.next_run = job.next_after(now)
+
+    async def _elect(self) -> bool:
+        if not self.app.primary:
+            return False
+
+        now = time.monotonic()
+        if self.leader and now - self._renewed < self.lease_ttl / 3:
+            return True
+
+        try:
+            leader = await self.lease.acquire()
+        except Exception:
+            LOG.exception("Failed to renew the scheduler lease")
+            leader = False
+
+        if leader != self.leader:
+            LOG.info("Scheduler %s the leader", "is now" if leader else "is no longer")
+        self.leader = leader
+        self._renewed = now
+        return leader
+
+    async def _first_run(self, job: Job, now: float) -> float:
+        last = await self.app.state.get(f"sirbot:scheduler:{job.name}") if job.leader else None
+        job.last_run = last or job.last_run
+        if job.last_run is None:
+            return now if job.missed == "once" else job.next_after(now)
+
+        due = job.trigger.next(job.last_run)
+        if due >= now - job.grace:
+            return due
+
+        job.stats["missed"] += 1
+        return now if job.missed == "once" else job.next_after(now)
+
+    async def _run_job(self, job: Job, started: float) -> None:
+        job.last_run = started
+        try:
+            if job.leader:
+                await self.app.state.set(f"sirbot:scheduler:{job.name}", started)
+
+            async with asyncio.timeout(job.max_runtime):
+                await job.func(self.app)
+        except TimeoutError:
+            job.stats["timeouts"] += 1
+            LOG.error("Job %s didn't finish in %ss", job.name, job.max_runtime)
+        except Exception:
+            job.stats["failures"] += 1
+            LOG.exception("Job %s failed", job.name)
+        else:
+            job.stats["runs"] += 1
+        finally:
+            job.stats["last_duration"] = time.time() - started
+            job.task = None
@@ -0,0 +1,573 @@
+"""
+Shared state backends for sirbot and its plugins: caches, counters and locks.
+
+Every backend has the same asynchronous interface, values must be JSON serializable.
+
+* :class:`MemoryBackend`: per process, the default.
+* :class:`SQLiteBackend`: shared by the processes of a host through a database file.
+* :class:`RedisBackend`: shared by every replica through a Redis (or compatible) server.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+LOG = logging.getLogger(__name__)
+
+# Only delete or extend a lock still held by the caller
+RELEASE_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) "
+    "else return 0 end"
+)
+RENEW_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('pexpire', KEYS[1], ARGV[2]) else return 0 end"
+)
+# Increment a counter, setting the expiry of a new one in the same atomic step
+INCR_SCRIPT = (
+    "local new = redis.call('exists', KEYS[1]) == 0 "
+    "local value = redis.call('incrby', KEYS[1], ARGV[1]) "
+    "if new then redis.call('pexpire', KEYS[1], ARGV[2]) end return value"
+)
+
+
+class StateBackend:
+    """
+    Interface of the shared state backends.
+
+    Time to live are in seconds, ``None`` for keys that don't expire.
+    """
+
+    name = "base"
+
+    async def get(self, key: str) -> Any | None:
+        """Value of `key`, ``None`` when missing or expired."""
+        raise NotImplementedError()
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        raise NotImplementedError()
+
+    async def add(self, key: str, value: Any, ttl: float | None = None) -> bool:
+        """Set `key` only if it doesn't exist, returns whether it was set."""
+        raise NotImplementedError()
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError()
+
+    async def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        """
+        Increment the counter `key` and return its new value.
+
+        A missing counter starts at 0 and expires after `ttl`, incrementing an existing one
+        keeps its expiry.
+        """
+        raise NotImplementedError()
+
+    async def acquire_lock(self, name: str, token: str, ttl: float) -> bool:
+        """Take the lock `name` for `ttl` seconds, or extend it if `token` already holds it."""
+        raise NotImplementedError()
+
+    async def release_lock(self, name: str, token: str) -> bool:
+        """Release the lock `name` if `token` still holds it."""
+        raise NotImplementedError()
+
+    async def close(self) -> None:
+        pass
+
+    async def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+        lock_ttl: float = 30,
+    ) -> Any:
+        """
+        Cached value of `key`, computed by `factory` on a miss.
+
+        Concurrent misses, in this process or any other sharing the backend, wait for a single
+        call to `factory` instead of all calling it.
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        async with self.lock(f"{key}:fill", ttl=lock_ttl, timeout=lock_ttl):
+            value = await self.get(key)
+            if value is None:
+                value = await factory()
+                if value is not None:
+                    await self.set(key, value, ttl=ttl)
+        return value
+
+    def lock(self, name: str, ttl: float = 30, timeout: float | None = None) -> "Lock":
+        """Lock `name`, see :class:`Lock`."""
+        return Lock(self, name, ttl=ttl, timeout=timeout)
+
+
+class Lock:
+    """
+    Lease based lock on a :class:`StateBackend`.
+
+    The lease expires after `ttl` seconds so a crashed holder can't keep it forever, long
+    holders call :meth:`acquire` again to extend it.
+
+    Args:
+        backend: Backend holding the lock.
+        name: Name of the lock.
+        ttl: Seconds the lease lasts.
+        timeout: Seconds to wait for the lock when used as a context manager, ``None`` to wait
+            forever.
+        poll: Seconds between two attempts while waiting.
+    """
+
+    def __init__(
+        self,
+        backend: StateBackend,
+        name: str,
+        ttl: float = 30,
+        timeout: float | None = None,
+        poll: float = 0.05,
+    ) -> None:
+        self.backend = backend
+        self.name = name
+        self.ttl = ttl
+        self.timeout = timeout
+        self.poll = poll
+        self.token = uuid.uuid4().hex
+
+    async def acquire(self) -> bool:
+        """Try to take (or extend) the lock once."""
+        return await self.backend.acquire_lock(self.name, self.token, self.ttl)
+
+    async def release(self) -> bool:
+        return await self.backend.release_lock(self.name, self.token)
+
+    async def __aenter__(self) -> "Lock":
+        async with asyncio.timeout(self.timeout):
+            while not await self.acquire():
+                await asyncio.sleep(self.poll)
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.release()
+
+
+class MemoryBackend(StateBackend):
+    """
+    State kept in the process memory.
+
+    Values are stored as given, not copied.
+    """
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._data: dict[str, tuple[Any, float | None]] = {}
+        self._writes = 0
+
+    def _get(self, key: str) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        value, expires = item
+        if expires is not None and expires <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def _set(self, key: str, value: Any, ttl: float | None) -> None:
+        self._data[key] = (value, time.monotonic() + ttl if ttl is not None else None)
+        self._writes += 1
+        if self._writes % 1000 == 0:
+            self._purge()
+
+    def _purge(self) -> None:
+        now = time.monotonic()
+        for key, (_, expires) in list(self._data.items()):
+            if expires is not None and expires <= now:
+                del self._data[key]
+
+    async def get(self, key: str) -> Any | None:
+        return self._get(key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self._set(key, value, ttl)
+
+    async def add(self, key: str, value: Any, ttl: float | None = None) -> bool:
+        if self._get(key) is not None:
+            return False
+        self._set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        current = self._get(key)
+        if current is None:
+            self._set(key, amount, ttl)
+            return amount
+
+        value = current + amount
+        self._data[key] = (value, self._data[key][1])
+        return value
+
+    async def acquire_lock(self, name: str, token: str, ttl: float) -> bool:
+        key = f"lock:{name}"
+        holder = self._get(key)
+        if holder is not None and holder != token:
+            return False
+        self._set(key, token, ttl)
+        return True
+
+    async def release_lock(self, name: str, token: str) -> bool:
+        key = f"lock:{name}"
+        if self._get(key) != token:
+            return False
+        del self._data[key]
+        return True
+
+
+class SQLiteBackend(StateBackend):
+    """
+    State kept in a SQLite database file, shared by the processes using the same file.
+
+    Queries run in a dedicated thread, read-modify-write operations take the database write
+    lock (``BEGIN IMMEDIATE``) so they are atomic across processes. Expired keys are deleted
+    by the first write every `purge_interval` seconds.
+
+    Args:
+        path: Database file.
+        busy_timeout: Seconds to wait for another process holding the write lock.
+        purge_interval: Seconds between two deletions of the expired keys.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT, expires REAL);
+        CREATE INDEX IF NOT EXISTS state_expires ON state (expires);
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0, purge_interval: float = 60) -> None:
+        if not path:
+            raise ValueError("SQLite state needs a database file")
+
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.purge_interval = purge_interval
+        # The first write purges what expired since the last run
+        self._purged = float("-inf")
+        self._db: sqlite3.Connection | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sirbot-state")
+
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(self.SCHEMA)
+        return self._db
+
+    def _read(self, db: sqlite3.Connection, key: str) -> tuple[Any, float | None] | None:
+        row = db.execute("SELECT value, expires FROM state WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return json.loads(row[0]), row[1]
+
+    def _write(self, db: sqlite3.Connection, key: str, value: Any, expires: float | None) -> None:
+        db.execute(
+            "INSERT OR REPLACE INTO state (key, value, expires) VALUES (?, ?, ?)",
+            (key, json.dumps(value), expires),
+        )
+        if time.monotonic() - self._purged >= self.purge_interval:
+            self._purge(db)
+
+    def _purge(self, db: sqlite3.Connection) -> None:
+        self._purged = time.monotonic()
+        deleted = db.execute("DELETE FROM state WHERE expires <= ?", (time.time(),)).rowcount
+        LOG.debug("Deleted %s expired keys from the SQLite state", deleted)
+
+    def _transaction(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(db)
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+        return result
+
+    @staticmethod
+    def _expires(ttl: float | None) -> float | None:
+        return time.time() + ttl if ttl is not None else None
+
+    async def get(self, key: str) -> Any | None:
+        item = await self._run(lambda: self._read(self._connect(), key))
+        return item[0] if item else None
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        await self._run(lambda: self._write(self._connect(), key, value, self._expires(ttl)))
+
+    async def add(self, key: str, value: Any, ttl: float | None = None) -> bool:
+        def add(db: sqlite3.Connection) -> bool:
+            if self._read(db, key) is not None:
+                return False
+            self._write(db, key, value, self._expires(ttl))
+            return True
+
+        return await self._run(self._transaction, add)
+
+    async def delete(self, key: str) -> None:
+        await self._run(lambda: self._connect().execute("DELETE FROM state WHERE key = ?", (key,)))
+
+    async def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        def incr(db: sqlite3.Connection) -> int:
+            item = self._read(db, key)
+            if item is None:
+                value, expires = amount, self._expires(ttl)
+            else:
+                value, expires = item[0] + amount, item[1]
+            self._write(db, key, value, expires)
+            return value
+
+        return await self._run(self._transaction, incr)
+
+    async def acquire_lock(self, name: str, token: str, ttl: float) -> bool:
+        def acquire(db: sqlite3.Connection) -> bool:
+            item = self._read(db, f"lock:{name}")
+            if item is not None and item[0] != token:
+                return False
+            self._write(db, f"lock:{name}", token, self._expires(ttl))
+            return True
+
+        return await self._run(self._transaction, acquire)
+
+    async def release_lock(self, name: str, token: str) -> bool:
+        def release(db: sqlite3.Connection) -> bool:
+            cursor = db.execute(
+                "DELETE FROM state WHERE key = ? AND value = ?", (f"lock:{name}", json.dumps(token))
+            )
+            return cursor.rowcount == 1
+
+        return await self._run(lambda: release(self._connect()))
+
+    async def close(self) -> None:
+        def close() -> None:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+        await self._run(close)
+        self._executor.shutdown()
+
+
+Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class RedisError(Exception):
+    """Error reply of the Redis server."""
+
+
+class RedisBackend(StateBackend):
+    """
+    State kept in a Redis server, shared by every replica using it.
+
+    Speaks the Redis protocol (RESP) directly over a pool of up to `pool_size` connections,
+    opened on demand. A connection is dropped after an error or a cancelled command. Locks are
+    released and extended, and counters created with their expiry, by Lua scripts so each is a
+    single atomic command.
+
+    Args:
+        host: Server host.
+        port: Server port.
+        db: Database number.
+        password: Password, if the server requires one.
+        prefix: Prefix of every key, to share a server with other applications.
+        timeout: Seconds to wait for a reply.
+        pool_size: Maximum number of connections, and so of commands sent concurrently.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6379,
+        db: int = 0,
+        password: str | None = None,
+        prefix: str = "sirbot:",
+        timeout: float = 5.0,
+        pool_size: int = 4,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.prefix = prefix
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._idle: list[Connection] = []
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def execute(self, *args: Any) -> Any:
+        """Send a command on an idle connection and return its reply."""
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else await self._connect()
+            try:
+                reply = await self._call(connection, *args)
+            except RedisError:
+                self._idle.append(connection)
+                raise
+            except BaseException:
+                # Including a cancellation: the reply would be left unread on the connection,
+                # and read by the next command instead of its own
+                connection[1].close()
+                raise
+            self._idle.append(connection)
+            return reply
+
+    async def _connect(self) -> Connection:
+        connection = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        try:
+            if self.password:
+                await self._call(connection, "AUTH", self.password)
+            if self.db:
+                await self._call(connection, "SELECT", self.db)
+        except BaseException:
+            connection[1].close()
+            raise
+        return connection
+
+    async def _call(self, connection: Connection, *args: Any) -> Any:
+        reader, writer = connection
+        writer.write(encode_command(*args))
+        await writer.drain()
+        reply = await asyncio.wait_for(read_reply(reader), self.timeout)
+        if isinstance(reply, RedisError):
+            raise reply
+        return reply
+
+    @staticmethod
+    def _ms(ttl: float) -> int:
+        return max(1, int(ttl * 1000))
+
+    async def get(self, key: str) -> Any | None:
+        value = await self.execute("GET", self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        args = ["SET", self.prefix + key, json.dumps(value)]
+        if ttl is not None:
+            args += ["PX", self._ms(ttl)]
+        await self.execute(*args)
+
+    async def add(self, key: str, value: Any, ttl: float | None = None) -> bool:
+        args = ["SET", self.prefix + key, json.dumps(value), "NX"]
+        if ttl is not None:
+            args += ["PX", self._ms(ttl)]
+        return await self.execute(*args) is not None
+
+    async def delete(self, key: str) -> None:
+        await self.execute("DEL", self.prefix + key)
+
+    async def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        if ttl is None:
+            return await self.execute("INCRBY", self.prefix + key, amount)
+        return await self.execute("EVAL", INCR_SCRIPT, 1, self.prefix + key, amount, self._ms(ttl))
+
+    async def acquire_lock(self, name: str, token: str, ttl: float) -> bool:
+        key = f"{self.prefix}lock:{name}"
+        if await self.execute("SET", key, token, "NX", "PX", self._ms(ttl)) is not None:
+            return True
+        return await self.execute("EVAL", RENEW_SCRIPT, 1, key, token, self._ms(ttl)) == 1
+
+    async def release_lock(self, name: str, token: str) -> bool:
+        key = f"{self.prefix}lock:{name}"
+        return await self.execute("EVAL", RELEASE_SCRIPT, 1, key, token) == 1
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.pop()[1].close()
+
+
+def encode_command(*args: Any) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """Read a RESP reply, bulk strings are decoded to `str`."""
+    line = await reader.readuntil(b"\r\n")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    elif kind == b"-":
+        return RedisError(payload.decode())
+    elif kind == b":":
+        return int(payload)
+    elif kind == b"$":
+        length = int(payload)
+        if length == -1:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2].decode()
+    elif kind == b"*":
+        length = int(payload)
+        if length == -1:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RedisError(f"Unknown reply type {kind!r}")
+
+
+def create_state(url: str | None = None) -> StateBackend:
+    """
+    State backend from a URL.
+
+    * ``memory`` (or empty): :class:`MemoryBackend`.
+    * ``sqlite:///path/to/state.db``: :class:`SQLiteBackend`, ``sqlite://state.db`` for a path
+      relative to the working directory.
+    * ``redis://[:password@]host[:port][/db]``: :class:`RedisBackend`.
+    """
+    if not url or url == "memory":
+        return MemoryBackend()
+
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        # The netloc is the start of a relative path
+        path = parsed.netloc + parsed.path
+        if not path:
+            raise ValueError(f"SQLite state URL {url} has no database file")
+        return SQLiteBackend(path)
+    elif parsed.scheme == "redis":
+        return RedisBackend(
+            host=parsed.hostname or "127.0.0.1",
+            port=parsed.port or 6379,
+            db=int(parsed.path.lstrip("/") or 0),
+            password=unquote(parsed.password) if parsed.password else None,
+        )
+    raise ValueError(f"Unknown state backend {url}")
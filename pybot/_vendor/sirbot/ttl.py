@@ -0,0 +1,82 @@
+"""
+Expiring keys with bounded memory, for the per process caches and guards of sirbot.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+_MISSING = object()
+
+
+class TTLStore:
+    """
+    Mapping of keys expiring `ttl` seconds after being set, holding at most `maxsize` of them.
+
+    Keys are kept in the order they were set, which is also the order they expire in since they
+    share the same TTL: expired keys are dropped from the front as new ones are set, and the
+    oldest key is evicted when the store is full. Every operation is O(1) amortized.
+
+    Args:
+        ttl: Seconds a key lives.
+        maxsize: Maximum number of keys.
+        clock: Monotonic clock, in seconds.
+    """
+
+    def __init__(
+        self, ttl: float, maxsize: int = 10_000, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if ttl <= 0 or maxsize <= 0:
+            raise ValueError("TTL and maximum size must be positive")
+
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self.evicted = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= self.clock():
+            return default
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any = True) -> None:
+        now = self.clock()
+        self._data[key] = (now + self.ttl, value)
+        self._data.move_to_end(key)
+        self._expire(now)
+
+    def add(self, key: Hashable, value: Any = True) -> bool:
+        """Set `key` unless it is already set, returns whether it was."""
+        if self.get(key, _MISSING) is not _MISSING:
+            return False
+        self.set(key, value)
+        return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        if entry is None or entry[0] <= self.clock():
+            return default
+        return entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        self._expire(self.clock())
+        return len(self._data)
+
+    def _expire(self, now: float) -> None:
+        data = self._data
+        while data:
+            key, (expires, _) = next(iter(data.items()))
+            if expires > now and len(data) <= self.maxsize:
+                break
+            del data[key]
+            if expires > now:
+                self.evicted += 1
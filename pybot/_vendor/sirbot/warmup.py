@@ -0,0 +1,83 @@
+"""
+Warm-up phase of sirbot: preload data once started, then report the bot ready.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+LOG = logging.getLogger(__name__)
+
+
+class Warmup:
+    """
+    Run the warm-up hooks concurrently within a time budget.
+
+    Hooks not done within `timeout` seconds are cancelled and the bot is ready anyway, whatever
+    they were loading is loaded on demand instead.
+
+    Args:
+        timeout: Seconds the hooks have to finish.
+    """
+
+    def __init__(self, timeout: float = 30.0) -> None:
+        self.timeout = timeout
+        self.ready = False
+        self.duration: float | None = None
+        self._hooks: dict[str, Callable[[Any], Awaitable[Any]]] = {}
+        self._status: dict[str, str] = {}
+        self._task: asyncio.Task | None = None
+
+    def add(self, name: str, hook: Callable[[Any], Awaitable[Any]]) -> None:
+        if name in self._hooks:
+            raise ValueError(f"Warm-up {name} is already registered")
+        self._hooks[name] = hook
+        self._status[name] = "pending"
+
+    @property
+    def status(self) -> dict[str, str]:
+        """Status of each hook: ``pending``, ``done``, ``failed`` or ``timeout``."""
+        return dict(self._status)
+
+    def start(self, app: Any) -> None:
+        self._task = asyncio.ensure_future(self._run(app))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self, app: Any) -> None:
+        started = time.monotonic()
+        tasks = {
+            name: asyncio.ensure_future(self._run_hook(name, hook, app))
+            for name, hook in self._hooks.items()
+        }
+        try:
+            if tasks:
+                _, late = await asyncio.wait(tasks.values(), timeout=self.timeout)
+                for name, task in tasks.items():
+                    if task in late:
+                        task.cancel()
+                        self._status[name] = "timeout"
+                        LOG.warning("Warm-up %s didn't finish in %ss", name, self.timeout)
+                await asyncio.gather(*late, return_exceptions=True)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        self.ready = True
+        self.duration = time.monotonic() - started
+        LOG.info("SirBot ready, warmed up in %.2fs: %s", self.duration, self._status)
+
+    async def _run_hook(self, name: str, hook: Callable[[Any], Awaitable[Any]], app: Any) -> None:
+        try:
+            await hook(app)
+        except Exception:
+            LOG.exception("Warm-up %s failed", name)
+            self._status[name] = "failed"
+        else:
+            self._status[name] = "done"
@@ -0,0 +1,156 @@
+"""
+Pre-fork supervisor running SirBot in several worker processes.
+"""
+
+import logging
+import os
+import signal
+import time
+from collections.abc import Callable
+
+LOG = logging.getLogger(__name__)
+
+
+class Supervisor:
+    """
+    Fork ``workers`` processes calling ``target(worker)`` and keep them running.
+
+    A worker that exits is started again with the same index, after an exponential
+    backoff when it didn't stay up for ``min_uptime`` seconds. SIGTERM or SIGINT is forwarded as
+    SIGTERM to every worker, which stop accepting connections and finish the requests in flight;
+    the ones still running after ``drain_timeout`` seconds are killed.
+
+    Workers run in their own process group, so a Ctrl-C in the terminal only reaches the
+    supervisor and is forwarded once.
+
+    Args:
+        target: Function run in each worker with its index, ``0`` being the primary worker.
+        workers: Number of worker processes.
+        drain_timeout: Seconds the workers have to stop before being killed.
+        min_backoff: Seconds before restarting a worker that crashed quickly.
+        max_backoff: Maximum seconds between two restarts of a crashing worker.
+        min_uptime: Seconds a worker must run for its restart not to be delayed.
+        poll: Seconds between two checks of the workers.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[int], object],
+        workers: int,
+        *,
+        drain_timeout: float = 30.0,
+        min_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        min_uptime: float = 5.0,
+        poll: float = 0.1,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("At least one worker is required")
+
+        self.target = target
+        self.workers = workers
+        self.drain_timeout = drain_timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.min_uptime = min_uptime
+        self.poll = poll
+
+        self.restarts = 0
+        self._children: dict[int, tuple[int, float]] = {}  # pid: (worker, started)
+        self._failures: dict[int, int] = {}
+        self._due: dict[int, float] = {}  # worker: monotonic time of its restart
+        self._stopping_at: float | None = None
+
+    def run(self) -> int:
+        """Start the workers and supervise them until a SIGTERM or SIGINT, in the main thread."""
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        LOG.info("Starting %s workers", self.workers)
+
+        for worker in range(self.workers):
+            self._spawn(worker)
+
+        while self._children or self._stopping_at is None:
+            self._reap()
+            now = time.monotonic()
+            if self._stopping_at is None:
+                for worker, due in list(self._due.items()):
+                    if due <= now:
+                        del self._due[worker]
+                        self._spawn(worker)
+            elif now > self._stopping_at + self.drain_timeout:
+                for pid, (worker, _) in self._children.items():
+                    LOG.warning("Killing worker %s (pid %s), it didn't stop in time", worker, pid)
+                    self._signal(pid, signal.SIGKILL)
+                self._stopping_at = float("inf")
+            time.sleep(self.poll)
+
+        LOG.info("All workers stopped")
+        return 0
+
+    def _spawn(self, worker: int) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = (worker, time.monotonic())
+            LOG.info("Started worker %s (pid %s)", worker, pid)
+            return
+
+        code = 1
+        try:
+            os.setpgid(0, 0)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            self.target(worker)
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            LOG.exception("Worker %s crashed", worker)
+        finally:
+            # Don't run the supervisor's exit handlers in the worker
+            os._exit(code)
+
+    def _reap(self) -> None:
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._children.clear()
+                return
+            if not pid:
+                return
+
+            worker, started = self._children.pop(pid)
+            code = os.waitstatus_to_exitcode(status)
+            if self._stopping_at is not None:
+                LOG.info("Worker %s (pid %s) stopped with %s", worker, pid, code)
+                continue
+
+            if time.monotonic() - started < self.min_uptime:
+                self._failures[worker] = self._failures.get(worker, 0) + 1
+                delay = min(self.min_backoff * 2 ** (self._failures[worker] - 1), self.max_backoff)
+            else:
+                self._failures[worker] = 0
+                delay = 0.0
+            LOG.error(
+                "Worker %s (pid %s) exited with %s, restarting in %.1fs", worker, pid, code, delay
+            )
+            self.restarts += 1
+            self._due[worker] = time.monotonic() + delay
+
+    def _stop(self, signum: int, frame: object) -> None:
+        if self._stopping_at is not None:
+            return
+
+        LOG.info("Received %s, draining the workers", signal.Signals(signum).name)
+        self._stopping_at = time.monotonic()
+        self._due.clear()
+        for pid in self._children:
+            self._signal(pid, signal.SIGTERM)
+
+    @staticmethod
+    def _signal(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
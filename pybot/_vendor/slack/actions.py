@@ -2,13 +2,16 @@ import json
 import logging
 import typing
 from collections import defaultdict
-from collections.abc import Iterator, MutableMapping
+from collections.abc import Iterator, Mapping, MutableMapping
+from types import MappingProxyType
 from typing import Any
 
 from . import exceptions
 
 LOG = logging.getLogger(__name__)
 
+_NO_ROUTES: Mapping[str, tuple] = MappingProxyType({})
+
 
 class Action(MutableMapping):
     """
@@ -70,10 +73,14 @@ class Router:
     """
     When creating a slack applications you can only set one action url. This provide a routing mechanism for the
     incoming actions, based on their `callback_id` and the action name, to one or more handlers.
+
+    Routes are compiled by :meth:`freeze` into an immutable table, rebuilt when a handler is
+    registered afterwards.
     """
 
     def __init__(self):
         self._routes: dict[str, dict] = defaultdict(dict)
+        self._table: Mapping[str, Mapping[str, tuple]] | None = None
 
     def register(self, callback_id: str, handler: Any, name: str = "*") -> None:
         """
@@ -93,6 +100,25 @@ class Router:
             self._routes[callback_id][name] = []
 
         self._routes[callback_id][name].append(handler)
+        self._table = None
+
+    def freeze(self) -> Mapping[str, Mapping[str, tuple]]:
+        """
+        Compile the routes into an immutable dispatch table.
+
+        Returns:
+            By `callback_id` (or `block_id`), the tuple of handlers of each action name (or
+            `action_id`).
+        """
+        self._table = MappingProxyType(
+            {
+                callback_id: MappingProxyType(
+                    {name: tuple(handlers) for name, handlers in names.items()}
+                )
+                for callback_id, names in self._routes.items()
+            }
+        )
+        return self._table
 
     def register_interactive_message(self, callback_id: str, handler: Any, name: str = "*") -> None:
         """
@@ -167,23 +193,22 @@ class Router:
         else:
             raise UnknownActionType(action)
 
+    def _routes_for(self, callback_id: str) -> Mapping[str, tuple]:
+        table = self._table if self._table is not None else self.freeze()
+        return table.get(callback_id, _NO_ROUTES)
+
     def _dispatch_action(self, action: Action) -> Iterator[Any]:
-        yield from self._routes[action["callback_id"]].get("*", [])
+        yield from self._routes_for(action["callback_id"]).get("*", ())
 
     def _dispatch_interactive_message(self, action: Action) -> Iterator[Any]:
-        if action["actions"][0]["name"] in self._routes[action["callback_id"]]:
-            yield from self._routes[action["callback_id"]][action["actions"][0]["name"]]
-        else:
-            yield from self._routes[action["callback_id"]].get("*", [])
+        routes = self._routes_for(action["callback_id"])
+        name = action["actions"][0]["name"]
+        yield from routes[name] if name in routes else routes.get("*", ())
 
     def _dispatch_block_actions(self, action: Action) -> Iterator[Any]:
-        block_id = action["actions"][0]["block_id"]
+        routes = self._routes_for(action["actions"][0]["block_id"])
         action_id = action["actions"][0].get("action_id", "*")
-
-        if action_id in self._routes[block_id]:
-            yield from self._routes[block_id].get(action_id, [])
-        else:
-            yield from self._routes[block_id].get("*", [])
+        yield from routes[action_id] if action_id in routes else routes.get("*", ())
 
 
 class UnknownActionType(Exception):
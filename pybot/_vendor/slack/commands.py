@@ -1,7 +1,8 @@
 import logging
 import typing
 from collections import defaultdict
-from collections.abc import Iterator, MutableMapping
+from collections.abc import Iterator, Mapping, MutableMapping
+from types import MappingProxyType
 from typing import Any
 
 from . import exceptions
@@ -59,10 +60,14 @@ class Router:
     When creating slash command for your applications each one can have a custom webhook url. For ease of configuration
     this class provide a routing mechanisms based on the command so that each command can define the same webhook
     url.
+
+    Routes are compiled by :meth:`freeze` into an immutable table, rebuilt when a handler is
+    registered afterwards.
     """
 
     def __init__(self):
         self._routes: dict[str, list] = defaultdict(list)
+        self._table: Mapping[str, tuple] | None = None
 
     def register(self, command: str, handler: Any):
         """
@@ -78,6 +83,19 @@ class Router:
 
         LOG.info("Registering %s to %s", command, handler)
         self._routes[command].append(handler)
+        self._table = None
+
+    def freeze(self) -> Mapping[str, tuple]:
+        """
+        Compile the routes into an immutable dispatch table.
+
+        Returns:
+            Tuple of handlers by command.
+        """
+        self._table = MappingProxyType(
+            {command: tuple(handlers) for command, handlers in self._routes.items()}
+        )
+        return self._table
 
     def dispatch(self, command: Command) -> Iterator[Any]:
         """
@@ -90,5 +108,5 @@ class Router:
             handler
         """
         LOG.debug("Dispatching command %s", command["command"])
-        for callback in self._routes[command["command"]]:
-            yield callback
+        table = self._table if self._table is not None else self.freeze()
+        yield from table.get(command["command"], ())
@@ -1,13 +1,14 @@
 import copy
 import itertools
-import json
 import logging
 import re
 from collections import defaultdict
-from collections.abc import Iterator, MutableMapping
+from collections.abc import Callable, Iterator, Mapping, MutableMapping
+from types import MappingProxyType
 from typing import Any
 
 from . import exceptions
+from .templates import dumps
 
 LOG = logging.getLogger(__name__)
 
@@ -161,11 +162,11 @@ class Message(Event):
         """
         data = {**self}
         if "attachments" in self:
-            data["attachments"] = json.dumps(self["attachments"])
+            data["attachments"] = dumps(self["attachments"])
         return data
 
     def to_json(self) -> str:
-        return json.dumps({**self})
+        return dumps({**self})
 
 
 class EventRouter:
@@ -173,10 +174,14 @@ class EventRouter:
     When receiving an event from the RTM API or the slack API it is useful to have a routing mechanisms for
     dispatching event to individual function/coroutine. This class provide such mechanisms for any
     :class:`slack.events.Event`.
+
+    Routes are compiled by :meth:`freeze` into an immutable table, rebuilt when a handler is
+    registered afterwards.
     """
 
     def __init__(self):
         self._routes: dict[str, dict] = defaultdict(dict)
+        self._table: Mapping[str, tuple] | None = None
 
     def register(self, event_type: str, handler: Any, **detail: Any) -> None:
         """
@@ -206,6 +211,28 @@ class EventRouter:
             self._routes[event_type][detail_key][detail_value] = []
 
         self._routes[event_type][detail_key][detail_value].append(handler)
+        self._table = None
+
+    def freeze(self) -> Mapping[str, tuple]:
+        """
+        Compile the routes into an immutable dispatch table.
+
+        Returns:
+            By event type, a tuple of handlers matching any event and a tuple of
+            ``(detail_key, {detail_value: handlers})`` for additional routing.
+        """
+        table = {}
+        for event_type, details in self._routes.items():
+            always = tuple(details.get("*", {}).get("*", ()))
+            routed = tuple(
+                (key, MappingProxyType({value: tuple(h) for value, h in values.items()}))
+                for key, values in details.items()
+                if key != "*"
+            )
+            table[event_type] = (always, routed)
+
+        self._table = MappingProxyType(table)
+        return self._table
 
     def dispatch(self, event: Event) -> Iterator[Any]:
         """
@@ -218,13 +245,16 @@ class EventRouter:
             handler
         """
         LOG.debug('Dispatching event "%s"', event.get("type"))
-        if event["type"] in self._routes:
-            for detail_key, detail_values in self._routes.get(event["type"], {}).items():
-                event_value = event.get(detail_key, "*")
-                yield from detail_values.get(event_value, [])
-        else:
+        table = self._table if self._table is not None else self.freeze()
+        routes = table.get(event["type"])
+        if routes is None:
             return
 
+        always, routed = routes
+        yield from always
+        for detail_key, detail_values in routed:
+            yield from detail_values.get(event.get(detail_key, "*"), ())
+
 
 class MessageRouter:
     """
@@ -269,6 +299,27 @@ class MessageRouter:
         else:
             self._routes[channel][subtype][match] = [handler]
 
+    def resolve_channels(self, resolver: Callable[[str], str]) -> None:
+        """
+        Move routes registered with a channel name under the channel ID returned by `resolver`.
+
+        Args:
+            resolver: Callable returning the channel ID for a name (or the name when unknown).
+        """
+        for channel in list(self._routes):
+            if channel == "*":
+                continue
+
+            channel_id = resolver(channel)
+            if channel_id == channel:
+                continue
+
+            LOG.debug("Routing channel %s as %s", channel, channel_id)
+            for subtype, matchs in self._routes.pop(channel).items():
+                routes = self._routes[channel_id].setdefault(subtype, {})
+                for match, endpoints in matchs.items():
+                    routes.setdefault(match, []).extend(endpoints)
+
     def dispatch(self, message: Message) -> Iterator[Any]:
         """
         Yields handlers matching the routing of the incoming :class:`slack.events.Message`
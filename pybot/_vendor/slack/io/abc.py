@@ -1,9 +1,10 @@
 import json
 import logging
 import time
-from collections.abc import AsyncIterator, MutableMapping
+from collections.abc import AsyncIterator, Awaitable, Callable, MutableMapping
 
 from .. import events, methods, sansio
+from ..methods import ROOT_URL
 
 LOG = logging.getLogger(__name__)
 
@@ -17,11 +18,26 @@ class SlackAPI:
         session: HTTP session
         token: Slack API token
         headers: Default headers for all request
+        root_url: Base URL of the Web API methods, to use instead of :data:`slack.ROOT_URL`
+
+    Attributes:
+        response_hooks: Coroutine functions awaited with the method name, the data and the
+            response of each successful :meth:`query`.
     """
 
-    def __init__(self, *, token: str, headers: MutableMapping | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        token: str,
+        headers: MutableMapping | None = None,
+        root_url: str | None = None,
+    ) -> None:
         self._token = token
         self._headers = headers or {}
+        self._root_url = root_url.rstrip("/") + "/" if root_url else None
+        self.response_hooks: list[
+            Callable[[str, MutableMapping | None, dict], Awaitable[None]]
+        ] = []
 
     async def _request(
         self,
@@ -83,7 +99,18 @@ class SlackAPI:
             global_headers=self._headers,
             token=self._token,
         )
-        return await self._make_query(url, body, headers)
+        if self._root_url and url.startswith(ROOT_URL):
+            url = self._root_url + url[len(ROOT_URL) :]
+        response = await self._make_query(url, body, headers)
+
+        if self.response_hooks:
+            method = url.rsplit("/", 1)[-1]
+            for hook in self.response_hooks:
+                try:
+                    await hook(method, data, response)
+                except Exception:
+                    LOG.exception("Response hook %s failed", hook)
+        return response
 
     async def iter(
         self,
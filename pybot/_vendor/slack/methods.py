@@ -16,6 +16,9 @@ class Methods(Enum):
     # api
     API_TEST = method(ROOT_URL + "api.test", None, None, True)
 
+    # apps.connections
+    APPS_CONNECTIONS_OPEN = method(ROOT_URL + "apps.connections.open", None, None, True)
+
     # apps.permissions
     APPS_PERMISSIONS_INFO = method(ROOT_URL + "apps.permissions.info", None, None, False)
     APPS_PERMISSIONS_REQUEST = method(ROOT_URL + "apps.permissions.request", None, None, False)
@@ -50,6 +53,7 @@ class Methods(Enum):
     CHAT_ME_MESSAGE = method(ROOT_URL + "chat.meMessage", None, None, True)
     CHAT_POST_EPHEMERAL = method(ROOT_URL + "chat.postEphemeral", None, None, True)
     CHAT_POST_MESSAGE = method(ROOT_URL + "chat.postMessage", None, None, True)
+    CHAT_SCHEDULE_MESSAGE = method(ROOT_URL + "chat.scheduleMessage", None, None, True)
     CHAT_UNFURL = method(ROOT_URL + "chat.unfurl", None, None, True)
     CHAT_UPDATE = method(ROOT_URL + "chat.update", None, None, True)
 
@@ -10,8 +10,9 @@ import time
 from collections.abc import MutableMapping
 from email.message import Message
 
-from . import HOOK_URL, ROOT_URL, events, exceptions
+from . import ROOT_URL, events, exceptions
 from .methods import Methods
+from .templates import RawJSON, dumps
 
 LOG = logging.getLogger(__name__)
 
@@ -162,10 +163,13 @@ def prepare_request(
         headers = {**global_headers, **headers}
 
     payload: str | MutableMapping | None = None
-    if real_url.startswith(HOOK_URL) or (real_url.startswith(ROOT_URL) and as_json):
+    if real_url.startswith(ROOT_URL) and as_json:
         payload, headers = _prepare_json_request(data, token, headers)
     elif real_url.startswith(ROOT_URL) and not as_json:
         payload = _prepare_form_encoded_request(data, token)
+    elif real_url.startswith(("http://", "https://")):
+        # Webhook or response_url, authenticated by the URL itself: the token isn't sent
+        payload, headers = _prepare_json_request(data, None, headers)
     else:
         real_url = ROOT_URL + real_url
         payload = _prepare_form_encoded_request(data, token)
@@ -174,15 +178,16 @@ def prepare_request(
 
 
 def _prepare_json_request(
-    data: MutableMapping | None, token: str, headers: MutableMapping
+    data: MutableMapping | None, token: str | None, headers: MutableMapping
 ) -> tuple[str, MutableMapping]:
-    headers["Authorization"] = f"Bearer {token}"
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
     headers["Content-type"] = "application/json; charset=utf-8"
 
     if isinstance(data, events.Message):
         payload = data.to_json()
     else:
-        payload = json.dumps(data or {})
+        payload = dumps(data or {})
 
     return payload, headers
 
@@ -196,6 +201,10 @@ def _prepare_form_encoded_request(data: MutableMapping | None, token: str) -> Mu
     elif "token" not in data:
         data["token"] = token
 
+    for key, value in data.items():
+        if isinstance(value, RawJSON):
+            data[key] = value.to_json()
+
     return data
 
 
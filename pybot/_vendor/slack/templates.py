@@ -0,0 +1,152 @@
+"""
+Message templates compiled once to JSON, rendered by substituting their slots.
+"""
+
+import json
+import re
+from collections.abc import Iterator
+from json.encoder import encode_basestring_ascii
+from typing import Any
+
+SLOT = re.compile(r"\$\{(\w+)\}")
+
+_UNSET = object()
+
+
+class RawJSON:
+    """
+    A pre-serialized JSON value, sent as is by :func:`dumps`.
+
+    Reading it decodes the JSON once, after which the decoded value is the one sent: it can be
+    edited in place like the structure it stands for.
+
+    Args:
+        text: JSON text of the value.
+    """
+
+    __slots__ = ("text", "_value")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._value: Any = _UNSET
+
+    @property
+    def value(self) -> Any:
+        if self._value is _UNSET:
+            self._value = json.loads(self.text)
+        return self._value
+
+    def to_json(self) -> str:
+        return self.text if self._value is _UNSET else dumps(self._value)
+
+    def __getitem__(self, item):
+        return self.value[item]
+
+    def __setitem__(self, item, value) -> None:
+        self.value[item] = value
+
+    def __contains__(self, item) -> bool:
+        return item in self.value
+
+    def __iter__(self) -> Iterator:
+        return iter(self.value)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RawJSON):
+            other = other.value
+        return self.value == other
+
+    def __repr__(self) -> str:
+        return f"RawJSON({self.to_json()})"
+
+    __str__ = to_json
+
+
+class Template:
+    """
+    A message shape compiled once into JSON text with named slots.
+
+    Slots are ``${name}`` placeholders in the strings of the shape. Rendering formats the
+    compiled JSON with the escaped slot values, the shape isn't rebuilt nor encoded again.
+
+    Args:
+        shape: Attachments, blocks or any JSON serializable structure, possibly holding other
+            rendered templates.
+    """
+
+    __slots__ = ("slots", "_format")
+
+    def __init__(self, shape: Any) -> None:
+        text = dumps(shape)
+        parts = SLOT.split(text.replace("%", "%%"))
+        self.slots = frozenset(parts[1::2])
+        self._format = (
+            "".join(f"%({part})s" if index % 2 else part for index, part in enumerate(parts))
+            if self.slots
+            else text
+        )
+
+    def render(self, **values: Any) -> RawJSON:
+        """
+        Substitute the slots.
+
+        Args:
+            **values: Value of each slot, converted to a string.
+
+        Returns:
+            The rendered message part.
+        """
+        if not self.slots:
+            return RawJSON(self._format)
+        return RawJSON(self._format % {name: _escape(value) for name, value in values.items()})
+
+    def __repr__(self) -> str:
+        return f"Template(slots={sorted(self.slots)})"
+
+
+def dumps(data: Any) -> str:
+    """
+    :func:`json.dumps`, sending the :class:`RawJSON` values of `data` as they are.
+
+    The top level of a mapping is written directly: its strings are escaped, its
+    :class:`RawJSON` values and those of its lists (where messages hold their attachments and
+    blocks) are spliced in, only the other values go through the encoder. Deeper
+    :class:`RawJSON` values are decoded.
+    """
+    if isinstance(data, RawJSON):
+        return data.to_json()
+    elif not isinstance(data, dict):
+        return _ENCODER.encode(data)
+
+    try:
+        items = ", ".join(f"{encode_basestring_ascii(k)}: {_dumps(v)}" for k, v in data.items())
+    except TypeError:
+        # Keys that aren't strings
+        return _ENCODER.encode(data)
+    return "{" + items + "}"
+
+
+def _dumps(value: Any) -> str:
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    elif isinstance(value, RawJSON):
+        return value.to_json()
+    elif isinstance(value, list) and any(isinstance(item, RawJSON) for item in value):
+        return "[" + ", ".join(_dumps(item) for item in value) + "]"
+    return _ENCODER.encode(value)
+
+
+def _escape(value: Any) -> str:
+    return encode_basestring_ascii(value if isinstance(value, str) else str(value))[1:-1]
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, RawJSON):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_ENCODER = json.JSONEncoder(default=_decode)
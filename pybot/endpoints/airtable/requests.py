@@ -9,6 +9,7 @@ from pybot.endpoints.airtable.utils import (
     _post_messages,
     _slack_user_id_from_email,
 )
+from pybot.endpoints.slack.utils import MENTOR_CHANNEL
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +40,12 @@ async def mentor_request(request: dict, app: SirBot) -> None:
     service_translation, requested_mentor_message, mentors = await asyncio.gather(*futures)
 
     first_message, *children = _create_messages(
-        mentors, request, requested_mentor_message, service_translation, slack_id
+        mentors,
+        request,
+        requested_mentor_message,
+        service_translation,
+        slack_id,
+        channel=app.plugins["slack"].channels.id(MENTOR_CHANNEL),
     )
 
     await _post_messages(first_message, children, app)
@@ -7,6 +7,7 @@ from pybot._vendor.slack.exceptions import SlackAPIError
 from pybot._vendor.slack.io.aiohttp import SlackAPI
 from pybot.endpoints.slack.utils import MENTOR_CHANNEL
 from pybot.plugins.airtable.api import AirtableAPI
+from pybot.plugins.airtable.records import Mentor
 
 from .message_templates.messages import claim_mentee_attachment, mentor_request_text
 
@@ -19,12 +20,11 @@ async def _get_requested_mentor(
     try:
         if not requested_mentor:
             return None
-        mentor = await airtable.get_row_from_record_id("Mentors", requested_mentor)
-        # mentor could be {} if the record wasn't found or an error occurred
-        email = mentor.get("Email")
-        if not email:
+        mentor = await airtable.get_record(Mentor, requested_mentor)
+        # mentor is None if the record wasn't found or an error occurred
+        if not mentor or not mentor.email:
             return None
-        slack_user_id = await _slack_user_id_from_email(email, slack)
+        slack_user_id = await _slack_user_id_from_email(mentor.email, slack)
         return f" Requested mentor: <@{slack_user_id}>"
     except SlackAPIError:
         return None
@@ -48,12 +48,11 @@ async def _get_matching_skillset_mentors(
     mentors = await airtable.find_mentors_with_matching_skillsets(skillsets)
     mentor_ids = []
     for mentor in mentors:
-        email = mentor.get("Email")
-        fallback = mentor.get("Slack Name", "Unknown Mentor")
-        if email:
-            mentor_id = await _slack_user_id_from_email(email, slack, fallback=fallback)
+        fallback = mentor.slack_name or "Unknown Mentor"
+        if mentor.email:
+            mentor_id = await _slack_user_id_from_email(mentor.email, slack, fallback=fallback)
             mentor_ids.append(mentor_id)
-        elif fallback:
+        else:
             mentor_ids.append(fallback)
     return [f"<@{mentor}>" for mentor in mentor_ids]
 
@@ -64,6 +63,7 @@ def _create_messages(
     requested_mentor_message: str,
     service_translation: str,
     slack_id: str,
+    channel: str = MENTOR_CHANNEL,
 ) -> tuple[dict, dict, dict]:
     first_message = {
         "text": mentor_request_text(
@@ -74,23 +74,31 @@ def _create_messages(
             requested_mentor_message,
         ),
         "attachments": claim_mentee_attachment(request["record"]),
-        "channel": MENTOR_CHANNEL,
+        "channel": channel,
     }
 
     details_message = {
         "text": f"Additional details: {request.get('details', 'None Given')}",
-        "channel": MENTOR_CHANNEL,
+        "channel": channel,
     }
 
     matching_mentors_message = {
         "text": "Mentors matching all or some of the requested skillsets: " + " ".join(mentors),
-        "channel": MENTOR_CHANNEL,
+        "channel": channel,
     }
 
     return first_message, details_message, matching_mentors_message
 
 
 async def _post_messages(parent: Message, children: list[Message], app: SirBot) -> None:
+    spool = app.plugins["slack"].spool
+    if spool:
+        # Threaded to the parent once it is posted, in order
+        parent_id = await spool.enqueue(parent)
+        for child in children:
+            await spool.enqueue(child, thread_of=parent_id)
+        return
+
     response = await app.plugins["slack"].api.query(url=methods.CHAT_POST_MESSAGE, data=parent)
 
     # Safely get timestamp from response - if missing, children won't be threaded
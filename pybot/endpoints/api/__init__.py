@@ -1,5 +1,6 @@
-from . import slack_api
+from . import admin, slack_api
 
 
 def create_endpoints(plugin):
     slack_api.create_endpoints(plugin)
+    admin.create_endpoints(plugin)
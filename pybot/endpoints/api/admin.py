@@ -0,0 +1,45 @@
+import logging
+
+from aiohttp import web
+
+from pybot._vendor.sirbot import SirBot
+from pybot.plugins import APIPlugin
+from pybot.plugins.api.request import AdminApiRequest
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MAX_SECONDS = 60
+
+
+def create_endpoints(plugin: APIPlugin):
+    plugin.on_admin("profile", profile, wait=True, deadline=PROFILE_MAX_SECONDS + 10)
+    plugin.on_admin("stalls", stalls, wait=True)
+
+
+async def profile(request: AdminApiRequest, app: SirBot) -> dict | web.Response:
+    """
+    Samples the stack of the event loop for ``seconds`` (default 10, at most 60)
+
+    :return: The sampled stacks in the collapsed format of flamegraph tools,
+        one ``outer;...;inner count`` line per stack
+    """
+    try:
+        seconds = float(request.query.get("seconds", 10))
+    except ValueError:
+        return {"error": "`seconds` must be a number"}
+    if not 0 < seconds <= PROFILE_MAX_SECONDS:
+        return {"error": f"`seconds` must be between 0 and {PROFILE_MAX_SECONDS}"}
+
+    logger.info(f"Profiling the event loop for {seconds}s")
+    try:
+        stacks = await app.profiler.profile(seconds)
+    except RuntimeError as e:
+        return {"error": str(e)}
+    return web.Response(text=stacks)
+
+
+async def stalls(request: AdminApiRequest, app: SirBot) -> dict:
+    """
+    :return: The last stalls of the event loop, with the handler running and its stack
+    """
+    return app.stalls.status()
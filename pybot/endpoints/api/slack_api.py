@@ -1,4 +1,9 @@
+import asyncio
+import json
 import logging
+from contextlib import aclosing
+
+from aiohttp import web
 
 from pybot._vendor.sirbot import SirBot
 from pybot._vendor.slack import ROOT_URL
@@ -6,16 +11,29 @@ from pybot._vendor.slack.exceptions import SlackAPIError
 from pybot.endpoints.api.utils import (
     _slack_info_from_email,
     handle_slack_invite_error,
+    normalize_email,
     production_only,
+    verify_emails,
 )
+from pybot.endpoints.slack.utils import OPS_CHANNEL
 from pybot.plugins import APIPlugin
 from pybot.plugins.api.request import SlackApiRequest
 
 logger = logging.getLogger(__name__)
 
+# users.lookupByEmail is a Tier 3 method, Slack allows about 50 lookups per minute
+LOOKUPS_PER_MINUTE = 50
+BULK_VERIFY_LIMIT = 500
+BULK_VERIFY_CONCURRENCY = 10
+# Time to look up the largest batches at the rate Slack allows, the stream ends with an
+# error line past it, before the deadline of the handler
+BULK_VERIFY_TIMEOUT = BULK_VERIFY_LIMIT / LOOKUPS_PER_MINUTE * 60 + 60
+BULK_VERIFY_DEADLINE = BULK_VERIFY_TIMEOUT + 30
+
 
 def create_endpoints(plugin: APIPlugin):
     plugin.on_get("verify", verify, wait=True)
+    plugin.on_get("bulk_verify", bulk_verify, wait=True, deadline=BULK_VERIFY_DEADLINE)
     plugin.on_get("invite", invite, wait=True)
 
 
@@ -27,14 +45,60 @@ async def verify(request: SlackApiRequest, app: SirBot) -> dict:
     :return: The user's slack id and displayName if they exist
     """
     slack = app.plugins["slack"].api
+    known_users = app.plugins["api"].known_users
     email = request.query["email"]
 
-    user = await _slack_info_from_email(email, slack)
+    user = known_users.get(normalize_email(email))
+    if user is None:
+        user = await _slack_info_from_email(email, slack)
+        if user:
+            known_users.set(normalize_email(email), {"id": user["id"], "name": user["name"]})
+
     if user:
         return {"exists": True, "id": user["id"], "displayName": user["name"]}
     return {"exists": False}
 
 
+async def bulk_verify(request: SlackApiRequest, app: SirBot) -> dict | web.StreamResponse:
+    """
+    Verifies a list of emails, posted as ``{"emails": [...]}``
+
+    :return: One JSON line per distinct email, as they are verified, with the email and
+        the fields of :func:`verify`, or an ``error`` when it couldn't be looked up.
+        A last line with only an ``error`` tells the batch was stopped before its end
+    """
+    body = await request.json()
+    emails = body.get("emails") if isinstance(body, dict) else None
+    if not isinstance(emails, list) or not all(isinstance(email, str) for email in emails):
+        return {"error": "Must contain `emails` JSON list"}
+    if len(emails) > BULK_VERIFY_LIMIT:
+        return {"error": f"At most {BULK_VERIFY_LIMIT} emails per request"}
+
+    response = await request.stream(headers={"Content-Type": "application/x-ndjson"})
+
+    results = verify_emails(
+        emails,
+        app.plugins["slack"].api,
+        app.plugins["api"].known_users,
+        concurrency=BULK_VERIFY_CONCURRENCY,
+    )
+    try:
+        async with asyncio.timeout(BULK_VERIFY_TIMEOUT), aclosing(results):
+            async for result in results:
+                await response.write(json.dumps(result).encode() + b"\n")
+    except ConnectionResetError:
+        logger.info("Bulk verification client disconnected")
+        return response
+    except Exception as e:
+        logger.exception("Bulk verification failed")
+        # The results sent so far stand, the last line tells the batch is incomplete
+        error = "timeout" if isinstance(e, TimeoutError) else type(e).__name__
+        await response.write(json.dumps({"error": error}).encode() + b"\n")
+
+    await response.write_eof()
+    return response
+
+
 @production_only
 async def invite(request: SlackApiRequest, app: SirBot):
     """
@@ -46,6 +110,7 @@ async def invite(request: SlackApiRequest, app: SirBot):
 
     admin_slack = app.plugins["admin_slack"].api
     slack = app.plugins["slack"].api
+    ops_channel = app.plugins["slack"].channels.id(OPS_CHANNEL)
     body = await request.json()
 
     if "email" not in body:
@@ -60,10 +125,10 @@ async def invite(request: SlackApiRequest, app: SirBot):
 
     except SlackAPIError as e:
         logger.info("Slack invite resulted in SlackAPIError: " + e.error)
-        await handle_slack_invite_error(email, e, slack)
+        await handle_slack_invite_error(email, e, slack, channel=ops_channel)
         return e.data
 
     except Exception as e:
         logger.exception(e)
-        await handle_slack_invite_error(email, e, slack)
+        await handle_slack_invite_error(email, e, slack, channel=ops_channel)
         return e
@@ -1,14 +1,15 @@
+import asyncio
 import logging
+from collections.abc import AsyncIterator, Iterable
 
+from pybot._vendor.sirbot.ttl import TTLStore
 from pybot._vendor.slack import ROOT_URL
-from pybot._vendor.slack.exceptions import SlackAPIError
+from pybot._vendor.slack.exceptions import RateLimited, SlackAPIError
 from pybot._vendor.slack.io.abc import SlackAPI
 from pybot._vendor.slack.methods import Methods
+from pybot._vendor.slack.templates import RawJSON, Template
 from pybot.endpoints.slack.utils import OPS_CHANNEL, PYBOT_ENV
-from pybot.endpoints.slack.utils.action_messages import (
-    TICKET_OPTIONS,
-    not_claimed_attachment,
-)
+from pybot.endpoints.slack.utils.action_messages import NOT_CLAIMED, TICKET_OPTIONS
 from pybot.plugins.api.request import SlackApiRequest
 
 logger = logging.getLogger(__name__)
@@ -22,16 +23,95 @@ async def _slack_info_from_email(email: str, slack: SlackAPI, fallback: dict | N
         return fallback
 
 
-def invite_failure_attachments(email: str, error: str) -> list:
-    attachments = [
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def verification(email: str, user: dict | None) -> dict:
+    """Answer of the verification endpoints for `email`, found as `user` or not."""
+    if user:
+        return {"email": email, "exists": True, "id": user["id"], "displayName": user["name"]}
+    return {"email": email, "exists": False}
+
+
+async def verify_emails(
+    emails: Iterable[str],
+    slack: SlackAPI,
+    known_users: TTLStore,
+    concurrency: int = 10,
+    attempts: int = 3,
+) -> AsyncIterator[dict]:
+    """
+    Verify each distinct email, yielding the answers as they come.
+
+    Users in `known_users` are answered first, the other emails are looked up by `concurrency`
+    workers. A rate limited lookup is retried after the delay Slack asks for, up to `attempts`
+    times, and a lookup failing otherwise is answered with an ``error``.
+    """
+    pending = asyncio.Queue()
+    for email in dict.fromkeys(filter(None, map(normalize_email, emails))):
+        user = known_users.get(email)
+        if user:
+            yield verification(email, user)
+        else:
+            pending.put_nowait(email)
+
+    results = asyncio.Queue()
+    count = pending.qsize()
+
+    async def worker():
+        while not pending.empty():
+            email = pending.get_nowait()
+            try:
+                result = await _verify_email(email, slack, known_users, attempts)
+            except Exception as e:
+                # Every email is answered, a worker failing would leave its result missing
+                logger.exception(f"Failed to verify {email}")
+                result = {"email": email, "error": type(e).__name__}
+            await results.put(result)
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, count))]
+    try:
+        for _ in range(count):
+            yield await results.get()
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+async def _verify_email(email: str, slack: SlackAPI, known_users: TTLStore, attempts: int) -> dict:
+    for _ in range(attempts):
+        try:
+            response = await slack.query(
+                url=ROOT_URL + "users.lookupByEmail", data={"email": email}
+            )
+            user = {"id": response["user"]["id"], "name": response["user"]["name"]}
+        except RateLimited as e:
+            await asyncio.sleep(e.retry_after)
+            continue
+        except SlackAPIError as e:
+            if e.error == "users_not_found":
+                return verification(email, None)
+            return {"email": email, "error": e.error}
+        except Exception as e:
+            logger.exception(f"Failed to look up {email}")
+            return {"email": email, "error": type(e).__name__}
+
+        known_users.set(email, user)
+        return verification(email, user)
+    return {"email": email, "error": "ratelimited"}
+
+
+INVITE_FAILURE = Template(
+    [
         {
             "text": "",
             "callback_id": "ticket_status",
             "response_type": "in_channel",
             "fallback": "",
             "fields": [
-                {"title": "Email", "value": f"{email}", "short": True},
-                {"title": "Error", "value": f"{error}", "short": True},
+                {"title": "Email", "value": "${email}", "short": True},
+                {"title": "Error", "value": "${error}", "short": True},
             ],
             "actions": [
                 {
@@ -45,12 +125,16 @@ def invite_failure_attachments(email: str, error: str) -> list:
                 }
             ],
         },
-        not_claimed_attachment(),
+        NOT_CLAIMED.render(),
     ]
-    return attachments
+)
+
+
+def invite_failure_attachments(email: str, error: str) -> RawJSON:
+    return INVITE_FAILURE.render(email=email, error=error)
 
 
-async def handle_slack_invite_error(email, error, slack):
+async def handle_slack_invite_error(email, error, slack, channel=OPS_CHANNEL):
     if error.error == "already_invited":
         return error.data
 
@@ -67,7 +151,7 @@ async def handle_slack_invite_error(email, error, slack):
         )
 
     response = {
-        "channel": OPS_CHANNEL,
+        "channel": channel,
         "attachments": attachments,
         "text": "User Slack Invite Error",
     }
@@ -61,6 +61,8 @@ def create_endpoints(plugin: SlackPlugin):
     plugin.on_block("mentor", set_requested_mentor, action_id="mentor_select", wait=False)
     plugin.on_block("comments", open_details_dialog, action_id="comments_btn", wait=False)
     plugin.on_block("mentor_details_submit", mentor_details_submit, wait=False)
+    # The submission of the details dialog reads the form holding the comments block back
+    plugin.record_messages(block_id="comments")
     plugin.on_block("affiliation", set_group, action_id="affiliation_select", wait=False)
     plugin.on_block("submission", mentor_request_submit, action_id="submit_mentor_btn", wait=False)
 
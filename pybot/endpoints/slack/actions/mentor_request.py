@@ -9,6 +9,7 @@ from pybot.endpoints.slack.message_templates.mentor_request import (
     MentorRequestClaim,
 )
 from pybot.endpoints.slack.utils.action_messages import mentor_details_dialog
+from pybot.plugins.airtable.records import Mentor
 
 logger = logging.getLogger(__name__)
 
@@ -52,10 +53,14 @@ async def mentor_details_submit(action: Action, app: SirBot):
     state = json.loads(action["state"])
     channel = state["channel"]
     ts = state["ts"]
-    search = {"inclusive": True, "channel": channel, "oldest": ts, "latest": ts}
 
-    history = await slack.query(methods.CONVERSATIONS_HISTORY, search)
-    request["message"] = history["messages"][0]
+    # The form as last rendered by the bot, unless it was forgotten since
+    message = await app.plugins["slack"].messages.get(channel, ts)
+    if message is None:
+        search = {"inclusive": True, "channel": channel, "oldest": ts, "latest": ts}
+        history = await slack.query(methods.CONVERSATIONS_HISTORY, search)
+        message = history["messages"][0]
+    request["message"] = message
     request.details = action["submission"]["details"]
 
     await request.update_message(slack)
@@ -148,10 +153,8 @@ async def claim_mentee(action: Action, app: SirBot):
                 await event.update_message()
                 return
 
-            mentor_records = await airtable.find_records(
-                table_name="Mentors", field="Email", value=clicker_email
-            )
-            mentor_id = mentor_records[0]["id"] if mentor_records else False
+            mentors = await airtable.find(Mentor, "Email", clicker_email)
+            mentor_id = mentors[0].id if mentors else False
 
             await event.claim_request(mentor_id)
         else:
@@ -53,7 +53,7 @@ async def submit_mentor_volunteer(action: Action, app: SirBot) -> None:
         try:
             await admin_slack.query(
                 methods.CONVERSATIONS_INVITE,
-                {"channel": MENTOR_CHANNEL, "users": [user_id]},
+                {"channel": app.plugins["slack"].channels.id(MENTOR_CHANNEL), "users": [user_id]},
             )
         except SlackAPIError as error:
             logger.debug(
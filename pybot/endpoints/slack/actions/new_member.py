@@ -46,7 +46,7 @@ async def post_suggestion(action: Action, app: SirBot):
 
     response = {
         "text": new_suggestion_text(suggesting_user, suggestion),
-        "channel": COMMUNITY_CHANNEL,
+        "channel": app.plugins["slack"].channels.id(COMMUNITY_CHANNEL),
     }
 
     await app.plugins["slack"].api.query(methods.CHAT_POST_MESSAGE, response)
@@ -68,8 +68,7 @@ async def reset_greet(action: Action, app: SirBot):
     Resets the claim greet button back to its initial state and appends the user that hit reset and the time
     """
     response = base_response(action)
-    response["attachments"] = not_greeted_attachment()
-    response["attachments"][0]["text"] = reset_greet_message(action["user"]["id"])
+    response["attachments"] = not_greeted_attachment(reset_greet_message(action["user"]["id"]))
 
     await app.plugins["slack"].api.query(methods.CHAT_UPDATE, response)
 
@@ -90,7 +89,8 @@ async def reset_message(action: Action, app: SirBot):
     Resets the claim messaged button back to its initial state and appends the user that hit reset and the time
     """
     response = base_response(action)
-    response["attachments"] = not_direct_messaged_attachment()
-    response["attachments"][0]["text"] = reset_greet_message(action["user"]["id"])
+    response["attachments"] = not_direct_messaged_attachment(
+        reset_greet_message(action["user"]["id"])
+    )
 
     await app.plugins["slack"].api.query(methods.CHAT_UPDATE, response)
@@ -3,6 +3,7 @@ import json
 from pybot._vendor.sirbot import SirBot
 from pybot._vendor.slack import methods
 from pybot._vendor.slack.actions import Action
+from pybot.endpoints.slack.utils import MODERATOR_CHANNEL
 from pybot.endpoints.slack.utils.action_messages import (
     build_report_message,
     report_dialog,
@@ -18,9 +19,14 @@ async def send_report(action: Action, app: SirBot):
     details = action["submission"]["details"]
     message_details = json.loads(action["state"])
 
-    response = build_report_message(slack_id, details, message_details)
+    channel = app["plugins"]["slack"].channels.id(MODERATOR_CHANNEL)
+    response = build_report_message(slack_id, details, message_details, channel=channel)
 
-    await app["plugins"]["slack"].api.query(methods.CHAT_POST_MESSAGE, response)
+    slack = app["plugins"]["slack"]
+    if slack.spool:
+        await slack.spool.enqueue(response)
+    else:
+        await slack.api.query(methods.CHAT_POST_MESSAGE, response)
 
 
 async def open_report_dialog(action: Action, app: SirBot):
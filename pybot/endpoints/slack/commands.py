@@ -12,18 +12,19 @@ from pybot.endpoints.slack.message_templates.commands import (
 )
 from pybot.endpoints.slack.utils import MODERATOR_CHANNEL
 from pybot.endpoints.slack.utils.action_messages import not_claimed_attachment
-from pybot.endpoints.slack.utils.command_utils import get_slash_repeat_messages
+from pybot.endpoints.slack.utils.command_utils import get_slash_repeat_response
 from pybot.endpoints.slack.utils.general_utils import catch_command_slack_error
-from pybot.endpoints.slack.utils.slash_lunch import LunchCommand
+from pybot.endpoints.slack.utils.slash_lunch import LunchCommand, load_zipcodes
+from pybot.plugins.airtable.records import Service, Skillset
 
 logger = logging.getLogger(__name__)
 
 
 def create_endpoints(plugin: SlackPlugin):
-    plugin.on_command("/lunch", slash_lunch, wait=False)
-    plugin.on_command("/repeat", slash_repeat, wait=False)
+    plugin.on_command("/lunch", slash_lunch, inline=True)
+    plugin.on_command("/repeat", slash_repeat, inline=True)
     plugin.on_command("/report", slash_report, wait=False)
-    plugin.on_command("/roll", slash_roll, wait=False)
+    plugin.on_command("/roll", slash_roll, inline=True)
     plugin.on_command("/mentor", slash_mentor, wait=False)
     plugin.on_command("/mentor-volunteer", slash_mentor_volunteer, wait=False)
 
@@ -31,8 +32,10 @@ def create_endpoints(plugin: SlackPlugin):
 @catch_command_slack_error
 async def slash_mentor(command: Command, app: SirBot):
     airtable = app.plugins["airtable"].api
-    services = await airtable.get_all_records("Services", "Name")
-    skillsets = await airtable.get_all_records("Skillsets", "Name")
+    services = [service.name for service in await airtable.list_records(Service) if service.name]
+    skillsets = [
+        skillset.name for skillset in await airtable.list_records(Skillset) if skillset.name
+    ]
 
     blocks = mentor_request_blocks(services, skillsets)
 
@@ -71,7 +74,7 @@ async def slash_report(command: Command, app: SirBot):
 
     response = {
         "text": message,
-        "channel": MODERATOR_CHANNEL,
+        "channel": app.plugins["slack"].channels.id(MODERATOR_CHANNEL),
         "attachments": [not_claimed_attachment()],
     }
 
@@ -79,11 +82,14 @@ async def slash_report(command: Command, app: SirBot):
 
 
 @catch_command_slack_error
-async def slash_lunch(command: Command, app: SirBot):
+async def slash_lunch(command: Command, app: SirBot) -> dict:
     """
     Provides the user with a random restaurant in their area.
+
+    Answered inline, or through the command's response_url when Yelp is slow.
     """
     logger.debug(command)
+    await load_zipcodes()
     lunch = LunchCommand(
         command["channel_id"],
         command["user_id"],
@@ -91,62 +97,45 @@ async def slash_lunch(command: Command, app: SirBot):
         command["user_name"],
     )
 
-    slack = app["plugins"]["slack"].api
-
     try:
         request = lunch.get_yelp_request()
-        async with app.http_session.get(**request) as r:
+        async with app.http_client("yelp").get(**request) as r:
             r.raise_for_status()
-            message_params = lunch.select_random_lunch(await r.json())
+            lunch_message = lunch.select_random_lunch(await r.json())
     except aiohttp.ClientResponseError as e:
         logger.error(f"Yelp API HTTP error for {command['user_name']}: {e.status} {e.message}")
-        message_params = {
-            "user": command["user_id"],
-            "channel": command["channel_id"],
-            "text": "Sorry, I couldn't reach the Yelp API right now. Please try again later.",
-        }
+        text = "Sorry, I couldn't reach the Yelp API right now. Please try again later."
     except aiohttp.ClientError as e:
         logger.error(f"Yelp API connection error for {command['user_name']}: {e}")
-        message_params = {
-            "user": command["user_id"],
-            "channel": command["channel_id"],
-            "text": "Sorry, I couldn't connect to Yelp. Please try again later.",
-        }
+        text = "Sorry, I couldn't connect to Yelp. Please try again later."
+    else:
+        if lunch_message is None:
+            # No restaurants found in the area
+            text = "Sorry, I couldn't find any restaurants in that area. Try a different zip code!"
+        else:
+            text = lunch_message["text"]
 
-    if message_params is None:
-        # No restaurants found in the area
-        message_params = {
-            "user": command["user_id"],
-            "channel": command["channel_id"],
-            "text": "Sorry, I couldn't find any restaurants in that area. Try a different zip code!",
-        }
-
-    await slack.query(methods.CHAT_POST_EPHEMERAL, message_params)
+    return dict(response_type="ephemeral", text=text)
 
 
 @catch_command_slack_error
-async def slash_repeat(command: Command, app: SirBot):
+async def slash_repeat(command: Command, app: SirBot) -> dict:
     logger.info(f"repeat command data incoming {command}")
     channel_id = command["channel_id"]
     slack_id = command["user_id"]
-    slack = app["plugins"]["slack"].api
 
-    method_type, message = get_slash_repeat_messages(slack_id, channel_id, command["text"])
-
-    await slack.query(method_type, message)
+    return get_slash_repeat_response(slack_id, channel_id, command["text"])
 
 
 @catch_command_slack_error
-async def slash_roll(command: Command, app: SirBot):
+async def slash_roll(command: Command, app: SirBot) -> dict:
     """
     Invoked via the command /roll XdY, where X is an integer between 1 and 10,
     and y is an integer between 1 and 20.
 
     Parses the number of dice and the type from the command
     """
-    slack = app["plugins"]["slack"].api
     slack_id = command["user_id"]
-    channel_id = command["channel_id"]
     text = command["text"]
 
     try:
@@ -156,17 +145,14 @@ async def slash_roll(command: Command, app: SirBot):
             raise ValueError
     except ValueError:
         logger.debug("invalid input to roll: %s", text)
-        response = dict(
-            user=slack_id,
-            channel=channel_id,
+        return dict(
+            response_type="ephemeral",
             text=(
                 "Sorry, I didn't understand your input. "
                 "Should be XDYY where X is the number of dice, and YY is the number of sides"
             ),
         )
-        return await slack.query(methods.CHAT_POST_EPHEMERAL, response)
 
     dice = [random.randint(1, typedice) for _ in range(numdice)]
     message = f"<@{slack_id}> Rolled {numdice} D{typedice}: {dice}"
-    response = dict(channel=channel_id, text=message)
-    await slack.query(methods.CHAT_POST_MESSAGE, response)
+    return dict(response_type="in_channel", text=message)
@@ -3,19 +3,23 @@ import logging
 
 from pybot._vendor.sirbot import SirBot
 from pybot._vendor.slack.events import Event
+from pybot.endpoints.slack.utils import COMMUNITY_CHANNEL, TEAM_JOIN_DELAY, TEAM_JOIN_SCHEDULE
 from pybot.endpoints.slack.utils.event_utils import (
     build_messages,
     get_backend_auth_headers,
     link_backend_user,
+    schedule_team_join_messages,
     send_community_notification,
     send_user_greetings,
+    spool_messages,
 )
 
 logger = logging.getLogger(__name__)
 
 
 def create_endpoints(plugin):
-    plugin.on_event("team_join", team_join, wait=False)
+    # The greetings are sent after `TEAM_JOIN_DELAY`, the deadline has to leave room for it
+    plugin.on_event("team_join", team_join, wait=False, deadline=TEAM_JOIN_DELAY + 60)
 
 
 async def team_join(event: Event, app: SirBot) -> None:
@@ -24,20 +28,37 @@ async def team_join(event: Event, app: SirBot) -> None:
 
     After 30 seconds sends the new user a greeting, some resource links, and
     notifies the community channel of the new member.
+
+    With `TEAM_JOIN_SCHEDULE` enabled the messages are handed to Slack's
+    `chat.scheduleMessage` up front, only the ones Slack refuses are sent
+    after sleeping in process. With the outbound spool enabled they are
+    persisted instead, so a restart during the delay doesn't lose them.
     """
-    slack_api = app.plugins["slack"].api
+    slack = app.plugins["slack"]
+    slack_api = slack.api
     user_id = event["user"]["id"]
 
-    *user_messages, community_message, outreach_team_message = build_messages(user_id)
+    *user_messages, community_message, outreach_team_message = build_messages(
+        user_id, community_channel=slack.channels.id(COMMUNITY_CHANNEL)
+    )
+    community_messages = [community_message, outreach_team_message]
 
     logger.info(f"New team join event: {event}")
-    await asyncio.sleep(30)
-    await asyncio.gather(
-        send_user_greetings(user_messages, slack_api),
-        send_community_notification(community_message, slack_api),
-        send_community_notification(outreach_team_message, slack_api),
-    )
+    if TEAM_JOIN_SCHEDULE:
+        user_messages, community_messages = await schedule_team_join_messages(
+            user_id, user_messages, community_messages, slack_api, TEAM_JOIN_DELAY
+        )
+
+    if slack.spool:
+        await spool_messages([*user_messages, *community_messages], slack.spool, TEAM_JOIN_DELAY)
+    elif user_messages or community_messages:
+        await asyncio.sleep(TEAM_JOIN_DELAY)
+        await asyncio.gather(
+            send_user_greetings(user_messages, slack_api),
+            *[send_community_notification(message, slack_api) for message in community_messages],
+        )
 
-    headers = await get_backend_auth_headers(app.http_session)
+    backend = app.http_client("backend")
+    headers = await get_backend_auth_headers(backend)
     if headers:
-        await link_backend_user(user_id, headers, slack_api, app.http_session)
+        await link_backend_user(user_id, headers, slack_api, backend)
@@ -7,6 +7,7 @@ from pybot._vendor.slack.actions import Action
 from pybot._vendor.slack.io.abc import SlackAPI
 from pybot.endpoints.slack.utils.action_messages import now
 from pybot.plugins.airtable.api import AirtableAPI
+from pybot.plugins.airtable.records import Service
 
 from .block_action import BlockAction
 
@@ -96,15 +97,15 @@ class MentorRequest(BlockAction):
         if self.details:
             params["Additional Details"] = self.details
 
-        service_records = await airtable.find_records("Services", "Name", self.service)
-        if not service_records:
+        services = await airtable.find(Service, "Name", self.service)
+        if not services:
             return {
                 "error": {
                     "type": "SERVICE_NOT_FOUND",
                     "message": f"Service '{self.service}' not found in Airtable",
                 }
             }
-        params["Service"] = [service_records[0]["id"]]
+        params["Service"] = [services[0].id]
         return await airtable.add_record("Mentor Request", {"fields": params})
 
     def submission_error(self, airtable_response, slack: SlackAPI) -> Coroutine[Any, Any, dict]:
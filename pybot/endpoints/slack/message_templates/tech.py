@@ -1,7 +1,6 @@
 import logging
 import re
 from collections.abc import Generator
-from datetime import datetime, timedelta
 from random import choice, random
 from re import Pattern
 
@@ -11,18 +10,24 @@ logger = logging.getLogger(__name__)
 class TechTermsGrabber:
     # shared across all instances
     TERM_URL = "https://raw.githubusercontent.com/togakangaroo/tech-terms/master/terms.org"
-    LAST_UPDATE = datetime(2012, 1, 1, 1, 1)
+    STATE_KEY = "tech_terms"
     HOURS_BEFORE_REFRESH = 3
 
     def __init__(self, app):
         self.app = app
 
-    def get_terms(self):
-        if (datetime.now() - timedelta(hours=self.HOURS_BEFORE_REFRESH)) > self.LAST_UPDATE:
-            self.TERMS = self._update_terms()
-        return self.TERMS
+    async def get_terms(self) -> dict[str, str]:
+        """Terms from the shared state, fetched from GitHub at most once per refresh period."""
+        return await self.app.state.get_or_set(
+            self.STATE_KEY, self._update_terms, ttl=self.HOURS_BEFORE_REFRESH * 3600
+        )
+
+    async def refresh(self) -> None:
+        """Fetch the terms and replace the cached ones."""
+        terms = await self._update_terms()
+        await self.app.state.set(self.STATE_KEY, terms, ttl=self.HOURS_BEFORE_REFRESH * 3600 * 2)
 
-    async def _update_terms(self) -> dict[str, list]:
+    async def _update_terms(self) -> dict[str, str]:
         two_col_org_row: Pattern[str] = self._compile_regex_from_parts()
 
         content = await self._grab_data_from_github()
@@ -34,7 +39,7 @@ class TechTermsGrabber:
         }
 
     async def _grab_data_from_github(self) -> str:
-        async with self.app.http_session.get(self.TERM_URL) as r:
+        async with self.app.http_client("github").get(self.TERM_URL) as r:
             r.raise_for_status()
             return await r.text(encoding="utf-8")
 
@@ -57,6 +62,16 @@ class TechTermsGrabber:
                 yield match
 
 
+async def refresh_tech_terms(app) -> None:
+    """Scheduled job keeping the tech terms cached, so `!tech` never waits on GitHub."""
+    await TechTermsGrabber(app).refresh()
+
+
+async def warm_tech_terms(app) -> None:
+    """Load the tech terms unless they are cached already."""
+    await TechTermsGrabber(app).get_terms()
+
+
 class TechTerms:
     # shared across all instances
     TERMS = {}
@@ -13,10 +13,16 @@ logger = logging.getLogger(__name__)
 def create_endpoints(plugin):
     plugin.on_message(r".*", message_changed, subtype="message_changed")
     plugin.on_message(r".*", message_deleted, subtype="message_deleted")
-    plugin.on_message(r".*\!tech", tech_tips)
-    plugin.on_message(r".*\<\!here\>", here_bad)
-    plugin.on_message(r".*\<\!channel\>", here_bad)
-    plugin.on_message(r".*\!pybot", advertise_pybot)
+    # The auto-responders reply at most once per window, whatever the number of messages.
+    # Messages they ignore are filtered first, and don't start a window.
+    plugin.on_message(r".*\!tech", tech_tips, when=not_bot_message, cooldown={"user": 30})
+    plugin.on_message(
+        r".*\<\!here\>", here_bad, when=in_channel, cooldown={"user": 600, "channel": 60}
+    )
+    plugin.on_message(
+        r".*\<\!channel\>", here_bad, when=in_channel, cooldown={"user": 600, "channel": 60}
+    )
+    plugin.on_message(r".*\!pybot", advertise_pybot, cooldown={"channel": 600})
 
 
 def not_bot_message(event: Message):
@@ -27,6 +33,10 @@ def not_bot_message(event: Message):
     )
 
 
+def in_channel(event: Message):
+    return "channel_type" in event and event["channel_type"] != "im"
+
+
 def not_bot_delete(event: Message):
     return "previous_message" in event and "bot_id" not in event["previous_message"]
 
@@ -41,7 +51,7 @@ async def advertise_pybot(event: Message, app: SirBot):
 
 
 async def here_bad(event: Message, app: SirBot) -> None:
-    if "channel_type" in event and event["channel_type"] != "im":
+    if in_channel(event):
         user = event.get("user")
         user_id = f"<@{user}>" if user else "Hey you"
         await app.plugins["slack"].api.query(
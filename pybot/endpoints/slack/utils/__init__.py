@@ -13,13 +13,42 @@ SLACK_BOT_ID = os.environ.get("SLACK_BOT_ID", "ABC123")
 YELP_TOKEN = os.environ.get("YELP_TOKEN", "token")
 PORT = os.environ.get("SIRBOT_PORT", 5000)
 HOST = os.environ.get("SIRBOT_ADDR", "0.0.0.0")
+WORKERS = int(os.environ.get("SIRBOT_WORKERS", 1))
+WARMUP_TIMEOUT = float(os.environ.get("SIRBOT_WARMUP_TIMEOUT", 30))
+HANDLER_DEADLINE = float(os.environ.get("SIRBOT_HANDLER_DEADLINE", 120)) or None
+STALL_THRESHOLD = float(os.environ.get("SIRBOT_STALL_THRESHOLD", 0.5)) or None
 PYBOT_ENV = os.environ.get("PYBOT_ENV", "dev")
 BACKEND_URL = os.environ.get("BACKEND_URL", "https://api.operationcode.org")
 BACKEND_USERNAME = os.environ.get("BACKEND_USERNAME", "Pybot@test.test")
 BACKEND_PASS = os.environ.get("BACKEND_PASS", "fakePassword")
+TEAM_JOIN_DELAY = int(os.environ.get("TEAM_JOIN_DELAY", 30))
+TEAM_JOIN_SCHEDULE = os.environ.get("TEAM_JOIN_SCHEDULE", "false").lower() == "true"
+# memory (default), sqlite:///path/to/state.db or redis://[:password@]host:port/db
+STATE_BACKEND = os.environ.get("STATE_BACKEND")
+# Elect the scheduler leader with a file lock instead of a lock in STATE_BACKEND
+SCHEDULER_LOCK_FILE = os.environ.get("SCHEDULER_LOCK_FILE")
+# YAML file of the /repeat replies, the one next to slash_repeat.py by default
+REPEAT_CATALOG = os.environ.get("REPEAT_CATALOG")
 
 BOT_URL = "https://github.com/OperationCode/operationcode-pybot"
 
+# Connection pool and timeout settings per upstream, see sirbot.clients.ClientSettings
+HTTP_CLIENTS = {
+    "slack": {"limit": 50, "limit_per_host": 25, "read_timeout": 15},
+    # Airtable allows 5 requests per second per base
+    "airtable": {"limit": 10, "limit_per_host": 5, "read_timeout": 15},
+    # /lunch answers inline, Yelp has to be fast
+    "yelp": {
+        "limit": 5,
+        "limit_per_host": 5,
+        "connect_timeout": 2,
+        "read_timeout": 5,
+        "breaker_threshold": 3,
+    },
+    "backend": {"limit": 10, "limit_per_host": 10, "read_timeout": 10},
+    "github": {"limit": 2, "limit_per_host": 2, "read_timeout": 10},
+}
+
 slack_configs = {
     "token": BOT_USER_OAUTH_ACCESS_TOKEN
     or BOT_OAUTH_TOKEN
@@ -29,4 +58,5 @@ slack_configs = {
     "verify": os.environ.get("VERIFICATION_TOKEN"),
     "bot_id": SLACK_BOT_ID,
     "bot_user_id": SLACK_BOT_USER_ID,
+    "channels": [MENTOR_CHANNEL, COMMUNITY_CHANNEL, MODERATOR_CHANNEL, OPS_CHANNEL],
 }
@@ -1,6 +1,7 @@
 import json
 from time import time
 
+from pybot._vendor.slack.templates import RawJSON, Template
 from pybot.endpoints.slack.utils import MODERATOR_CHANNEL
 
 TICKET_OPTIONS = {
@@ -53,22 +54,58 @@ def updated_ticket_status(action):
     return response, selected_option
 
 
-def ticket_attachments(action):
-    user_id = action["user"]["id"]
-    request_type = action["submission"]["type"]
-    email = action["submission"]["email"]
-    details = action["submission"]["details"]
-    attachments = [
+NOT_CLAIMED = Template(
+    {
+        "text": "",
+        "fallback": "not claimed attachment",
+        "color": "#3AA3E3",
+        "callback_id": "claimed",
+        "attachment_type": "default",
+        "short": True,
+        "actions": [
+            {
+                "name": "claimed",
+                "text": "Claim",
+                "type": "button",
+                "style": "primary",
+                "value": "claimed",
+            }
+        ],
+    }
+)
+
+CLAIMED = Template(
+    {
+        "text": "Claimed by <@${user_id}>\n"
+        "<!date^${ts}^Claimed at {date_num} {time_secs}|Failed to parse time>",
+        "fallback": "",
+        "color": "#3AA3E3",
+        "callback_id": "claimed",
+        "attachment_type": "default",
+        "actions": [
+            {
+                "name": "reset_claim",
+                "text": "Reset claim",
+                "type": "button",
+                "style": "danger",
+                "value": "reset_claim",
+            }
+        ],
+    }
+)
+
+TICKET_ATTACHMENTS = Template(
+    [
         {
             "text": "",
             "callback_id": "ticket_status",
             "response_type": "in_channel",
             "fallback": "request details should have been here",
             "fields": [
-                {"title": "User", "value": f"<@{user_id}>", "short": True},
-                {"title": "Email", "value": f"{email}", "short": True},
-                {"title": "Request Type", "value": f"{request_type}", "short": True},
-                {"title": "Details", "value": f"{details}", "short": True},
+                {"title": "User", "value": "<@${user_id}>", "short": True},
+                {"title": "Email", "value": "${email}", "short": True},
+                {"title": "Request Type", "value": "${request_type}", "short": True},
+                {"title": "Details", "value": "${details}", "short": True},
             ],
             "actions": [
                 {
@@ -82,16 +119,15 @@ def ticket_attachments(action):
                 }
             ],
         },
-        not_claimed_attachment(),
+        NOT_CLAIMED.render(),
     ]
-    return attachments
-
+)
 
-def greeted_attachment(user_id: str) -> list[dict]:
-    return [
+GREETED = Template(
+    [
         {
-            "text": f":100:<@{user_id}> has greeted the new user!:100:\n"
-            f"<!date^{now()}^Greeted at {{date_num}} {{time_secs}}|Failed to parse time>",
+            "text": ":100:<@${user_id}> has greeted the new user!:100:\n"
+            "<!date^${ts}^Greeted at {date_num} {time_secs}|Failed to parse time>",
             "fallback": "",
             "color": "#3AA3E3",
             "callback_id": "greeted",
@@ -107,12 +143,12 @@ def greeted_attachment(user_id: str) -> list[dict]:
             ],
         }
     ]
+)
 
-
-def not_greeted_attachment():
-    return [
+NOT_GREETED = Template(
+    [
         {
-            "text": "",
+            "text": "${text}",
             "fallback": "Someone should greet them!",
             "color": "#3AA3E3",
             "callback_id": "greeted",
@@ -128,13 +164,13 @@ def not_greeted_attachment():
             ],
         }
     ]
+)
 
-
-def direct_messaged_attachment(user_id: str) -> list[dict]:
-    return [
+DIRECT_MESSAGED = Template(
+    [
         {
-            "text": f":100:<@{user_id}> has DMed the new user!:100:\n"
-            f"<!date^{now()}^DMed at {{date_num}} {{time_secs}}|Failed to parse time>",
+            "text": ":100:<@${user_id}> has DMed the new user!:100:\n"
+            "<!date^${ts}^DMed at {date_num} {time_secs}|Failed to parse time>",
             "fallback": "",
             "color": "#3AA3E3",
             "callback_id": "messaged",
@@ -150,12 +186,12 @@ def direct_messaged_attachment(user_id: str) -> list[dict]:
             ],
         }
     ]
+)
 
-
-def not_direct_messaged_attachment():
-    return [
+NOT_DIRECT_MESSAGED = Template(
+    [
         {
-            "text": "",
+            "text": "${text}",
             "fallback": "Someone should DM them!",
             "color": "#3AA3E3",
             "callback_id": "messaged",
@@ -171,46 +207,41 @@ def not_direct_messaged_attachment():
             ],
         }
     ]
+)
 
 
-def not_claimed_attachment():
-    return {
-        "text": "",
-        "fallback": "not claimed attachment",
-        "color": "#3AA3E3",
-        "callback_id": "claimed",
-        "attachment_type": "default",
-        "short": True,
-        "actions": [
-            {
-                "name": "claimed",
-                "text": "Claim",
-                "type": "button",
-                "style": "primary",
-                "value": "claimed",
-            }
-        ],
-    }
+def ticket_attachments(action) -> RawJSON:
+    submission = action["submission"]
+    return TICKET_ATTACHMENTS.render(
+        user_id=action["user"]["id"],
+        email=submission["email"],
+        request_type=submission["type"],
+        details=submission["details"],
+    )
 
 
-def claimed_attachment(user_id):
-    return {
-        "text": f"Claimed by <@{user_id}>\n"
-        f"<!date^{now()}^Claimed at {{date_num}} {{time_secs}}|Failed to parse time>",
-        "fallback": "",
-        "color": "#3AA3E3",
-        "callback_id": "claimed",
-        "attachment_type": "default",
-        "actions": [
-            {
-                "name": "reset_claim",
-                "text": "Reset claim",
-                "type": "button",
-                "style": "danger",
-                "value": "reset_claim",
-            }
-        ],
-    }
+def greeted_attachment(user_id: str) -> RawJSON:
+    return GREETED.render(user_id=user_id, ts=now())
+
+
+def not_greeted_attachment(text: str = "") -> RawJSON:
+    return NOT_GREETED.render(text=text)
+
+
+def direct_messaged_attachment(user_id: str) -> RawJSON:
+    return DIRECT_MESSAGED.render(user_id=user_id, ts=now())
+
+
+def not_direct_messaged_attachment(text: str = "") -> RawJSON:
+    return NOT_DIRECT_MESSAGED.render(text=text)
+
+
+def not_claimed_attachment() -> RawJSON:
+    return NOT_CLAIMED.render()
+
+
+def claimed_attachment(user_id) -> RawJSON:
+    return CLAIMED.render(user_id=user_id, ts=now())
 
 
 def reset_greet_message(user_id):
@@ -263,7 +294,7 @@ def report_dialog(action):
     }
 
 
-def build_report_message(slack_id, details, message_details):
+def build_report_message(slack_id, details, message_details, channel=MODERATOR_CHANNEL):
     message = f"<@{slack_id}> sent a report with details: {details}"
 
     attachment = [
@@ -285,7 +316,7 @@ def build_report_message(slack_id, details, message_details):
         not_claimed_attachment(),
     ]
 
-    return {"text": message, "channel": MODERATOR_CHANNEL, "attachments": attachment}
+    return {"text": message, "channel": channel, "attachments": attachment}
 
 
 def mentor_details_dialog(action, cur_details):
@@ -1,15 +1,14 @@
-from pybot._vendor.slack import methods
 from pybot.endpoints.slack.utils.slash_repeat import repeat_items
 
 
-def get_slash_repeat_messages(user_id, channel, text):
-    response_type = {
-        "ephemeral": methods.CHAT_POST_EPHEMERAL,
-        "message": methods.CHAT_POST_MESSAGE,
-    }
-
+def get_slash_repeat_response(user_id, channel, text):
+    """
+    Builds the /repeat reply as an inline slash command response
+    """
     values_dict = repeat_items(text, user_id, channel)
-    return response_type[values_dict["type"]], values_dict["message"]
+    message = {k: v for k, v in values_dict["message"].items() if k not in ("channel", "user")}
+    message["response_type"] = "in_channel" if values_dict["type"] == "message" else "ephemeral"
+    return message
 
 
 def action_value(attachment):
@@ -1,3 +1,6 @@
+from pybot._vendor.slack.templates import RawJSON, Template
+
+
 def team_join_initial_message(user_id: str) -> str:
     return (
         f"Hi <@{user_id}>,\n\n"
@@ -22,8 +25,8 @@ def second_team_join_message() -> str:
     )
 
 
-def external_button_attachments() -> list[dict]:
-    return [
+EXTERNAL_BUTTONS = Template(
+    [
         {
             "text": "",
             "fallback": "",
@@ -55,10 +58,10 @@ def external_button_attachments() -> list[dict]:
             ],
         }
     ]
+)
 
-
-def base_resources():
-    return [
+BASE_RESOURCES = Template(
+    [
         {
             "text": "",
             "fallback": "",
@@ -97,3 +100,12 @@ def base_resources():
             ],
         },
     ]
+)
+
+
+def external_button_attachments() -> RawJSON:
+    return EXTERNAL_BUTTONS.render()
+
+
+def base_resources() -> RawJSON:
+    return BASE_RESOURCES.render()
@@ -1,9 +1,14 @@
+import asyncio
 import logging
+from time import time
 
+import aiohttp
 from aiohttp import ClientSession
 
+from pybot._vendor.sirbot.plugins.slack.spool import OutboundSpool
 from pybot._vendor.slack import methods
 from pybot._vendor.slack.events import Message
+from pybot._vendor.slack.exceptions import HTTPException, SlackAPIError
 from pybot._vendor.slack.io.abc import SlackAPI
 from pybot.endpoints.slack.utils import (
     BACKEND_PASS,
@@ -24,6 +29,9 @@ from pybot.endpoints.slack.utils.event_messages import (
 
 logger = logging.getLogger(__name__)
 
+# Slack refusing the call, rate limiting it or being unreachable (including an open circuit)
+SCHEDULE_ERRORS = (SlackAPIError, HTTPException, aiohttp.ClientError, asyncio.TimeoutError)
+
 
 def base_user_message(user_id: str) -> Message:
     message = Message()
@@ -32,7 +40,9 @@ def base_user_message(user_id: str) -> Message:
     return message
 
 
-def build_messages(user_id) -> tuple[Message, Message, Message, Message, Message]:
+def build_messages(
+    user_id, community_channel: str = COMMUNITY_CHANNEL
+) -> tuple[Message, Message, Message, Message, Message]:
     initial_message = base_user_message(user_id)
     initial_message["text"] = team_join_initial_message(user_id)
 
@@ -47,7 +57,7 @@ def build_messages(user_id) -> tuple[Message, Message, Message, Message, Message
     community_message = Message()
     community_message["text"] = f":tada: <@{user_id}> has joined! :tada:"
     community_message["attachments"] = not_greeted_attachment()
-    community_message["channel"] = COMMUNITY_CHANNEL
+    community_message["channel"] = community_channel
 
     outreach_team_message = Message()
     outreach_team_message["text"] = (
@@ -55,7 +65,7 @@ def build_messages(user_id) -> tuple[Message, Message, Message, Message, Message
         f":spiral_note_pad: "
     )
     outreach_team_message["attachments"] = not_direct_messaged_attachment()
-    outreach_team_message["channel"] = COMMUNITY_CHANNEL
+    outreach_team_message["channel"] = community_channel
 
     return (
         initial_message,
@@ -75,6 +85,68 @@ async def send_community_notification(community_message: Message, slack_api: Sla
     return await slack_api.query(url=methods.CHAT_POST_MESSAGE, data=community_message)
 
 
+async def spool_messages(messages: list[Message], spool: OutboundSpool, delay: int) -> None:
+    """
+    Persists the messages to the Slack outbound spool, to be posted `delay`
+    seconds from now in order.
+    """
+    for message in messages:
+        await spool.enqueue(message, delay=delay)
+
+
+async def schedule_messages(
+    messages: list[Message], slack_api: SlackAPI, delay: int, channel: str | None = None
+) -> list[Message]:
+    """
+    Submits the messages to Slack's `chat.scheduleMessage` so they are posted
+    `delay` seconds from now, one second apart to keep their order.
+
+    :return: The messages that could not be scheduled, in order
+    """
+    post_at = int(time()) + delay
+    for index, message in enumerate(messages):
+        data = {**message, "post_at": post_at + index}
+        if channel:
+            data["channel"] = channel
+        try:
+            await slack_api.query(methods.CHAT_SCHEDULE_MESSAGE, data)
+        except SCHEDULE_ERRORS as e:
+            logger.warning(f"Could not schedule message for {data['channel']}: {e!r}")
+            return messages[index:]
+    return []
+
+
+async def schedule_team_join_messages(
+    user_id: str,
+    user_messages: list[Message],
+    community_messages: list[Message],
+    slack_api: SlackAPI,
+    delay: int,
+) -> tuple[list[Message], list[Message]]:
+    """
+    Schedules the new member greetings and community notifications with Slack
+    instead of holding them in process until they are due.
+
+    `chat.scheduleMessage` needs a conversation ID so the DM with the new member
+    is opened first.
+
+    :return: The user and community messages left to send in process
+    """
+    try:
+        response = await slack_api.query(methods.CONVERSATIONS_OPEN, {"users": user_id})
+        dm_channel = response["channel"]["id"]
+    except SCHEDULE_ERRORS as e:
+        logger.warning(f"Could not open DM with {user_id}: {e!r}")
+        unscheduled_user_messages = user_messages
+    else:
+        unscheduled_user_messages = await schedule_messages(
+            user_messages, slack_api, delay, channel=dm_channel
+        )
+
+    unscheduled_community_messages = await schedule_messages(community_messages, slack_api, delay)
+    return unscheduled_user_messages, unscheduled_community_messages
+
+
 async def link_backend_user(
     slack_id: str,
     auth_header: dict[str, str],
@@ -18,7 +18,7 @@ def catch_command_slack_error(func):
     @functools.wraps(func)
     async def handler(command: Command, app: SirBot, *args, **kwargs):
         try:
-            await func(command, app, *args, **kwargs)
+            return await func(command, app, *args, **kwargs)
 
         except SlackAPIError:
             channel_id = command["channel_id"]
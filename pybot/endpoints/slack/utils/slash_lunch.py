@@ -1,12 +1,34 @@
+import asyncio
+import importlib
 import logging
 from random import randint
-
-from zipcodes import is_real
+from typing import Any
 
 from pybot.endpoints.slack.utils import YELP_TOKEN
 
 logger = logging.getLogger(__name__)
 
+_zipcodes = None
+
+
+async def load_zipcodes(app: Any = None) -> None:
+    """
+    Imports `zipcodes` in a thread: loading its dataset slows the startup, and would block
+    the event loop for most of a second on the first /lunch.
+    """
+    global _zipcodes
+    if _zipcodes is None:
+        _zipcodes = await asyncio.to_thread(importlib.import_module, "zipcodes")
+
+
+def is_real(zipcode: str) -> bool:
+    """`zipcodes.is_real`, imported on first use unless :func:`load_zipcodes` did already."""
+    if _zipcodes is None:
+        from zipcodes import is_real
+
+        return is_real(zipcode)
+    return _zipcodes.is_real(zipcode)
+
 
 class LunchCommand:
     DEFAULT_LUNCH_DISTANCE = 20
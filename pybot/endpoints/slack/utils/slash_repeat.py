@@ -1,21 +1,18 @@
-from collections.abc import Iterable
+import logging
+import os
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from types import MappingProxyType
 
+import yaml
 
-# TODO: use the github api to find the file even if location changes
-def find_resources() -> dict:
-    return {
-        "link": "https://operationcode.org/resources",
-        "title": "A searchable database of learning resources",
-        "pretext": "Would you like some learning resources?",
-    }
+from pybot._vendor.slack.templates import Template
+from pybot.endpoints.slack.utils import REPEAT_CATALOG
 
+logger = logging.getLogger(__name__)
 
-def ask() -> dict:
-    return {
-        "link": "http://sol.gfxile.net/dontask.html",
-        "title": "Asking Questions",
-        "pretext": "You can just ask, we're all here to help",
-    }
+DEFAULT_CATALOG = Path(__file__).with_name("repeat.yml")
 
 
 def default_repeat_message(message_options: Iterable) -> str:
@@ -24,75 +21,89 @@ def default_repeat_message(message_options: Iterable) -> str:
     )
 
 
-def modify_params(modify_options: dict) -> dict:
-    message = {
-        "channel": modify_options["channel_id"],
-        "attachments": [
+def reply_template(item: dict) -> Template:
+    """The attachments of a /repeat reply, with the requesting user as the `slack_id` slot."""
+    template = Template(
+        [
             {
-                "pretext": "Text before block",
-                "title": "Text of link",
-                "title_link": "https://groove.hq/path/to/ticket/1943",
+                "pretext": "<@${slack_id}>: " + item["pretext"],
+                "title": item["title"],
+                "title_link": item["link"],
             }
-        ],
-    }
-
-    message["attachments"][0]["pretext"] = (
-        f"<@{modify_options['slack_id']}>: {modify_options['pretext']}"
+        ]
     )
-    message["attachments"][0]["title"] = modify_options["title"]
-    message["attachments"][0]["title_link"] = modify_options["link"]
+    if template.slots != {"slack_id"}:
+        raise ValueError(f"Unexpected slots in /repeat {item['names']}: {template.slots}")
+    return template
+
+
+class RepeatCatalog:
+    """
+    The /repeat replies, compiled from a YAML file and reloaded when its mtime changes.
+
+    The file is checked at most every `check_interval` seconds. A file failing to load is
+    logged and the replies it was meant to replace are kept.
+    """
+
+    def __init__(self, path: str | Path, check_interval: float = 1.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.replies: Mapping[str, Template] = MappingProxyType({})
+        self.help = default_repeat_message(())
+        self._mtime: int | None = None
+        self._checked = 0.0
+        self.load()
+
+    def load(self) -> None:
+        mtime = os.stat(self.path).st_mtime_ns
+        with open(self.path) as f:
+            items = yaml.safe_load(f)
+
+        replies = {}
+        for item in items:
+            template = reply_template(item)
+            for name in item["names"]:
+                replies[str(name).lower()] = template
+
+        self.replies = MappingProxyType(replies)
+        self.help = default_repeat_message(replies)
+        self._mtime = mtime
+        self._checked = time.monotonic()
+        logger.info(f"Loaded {len(replies)} /repeat replies from {self.path}")
 
-    return message
+    def refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return
+
+        self._checked = now
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime != self._mtime:
+                # Not retried until the file changes again
+                self._mtime = mtime
+                self.load()
+        except Exception:
+            logger.exception(f"Failed to reload the /repeat replies from {self.path}")
+
+    def get(self, name: str) -> Template | None:
+        self.refresh()
+        return self.replies.get(name.lower())
+
+
+catalog = RepeatCatalog(REPEAT_CATALOG or DEFAULT_CATALOG)
 
 
 def repeat_items(requested_text: str, slack_id: str, channel_id: str) -> dict:
-    # TODO: get better way of only showing unique values
-    # for keys instead of my wonky way of adding more options
-    messages = {
-        "10000": {
-            "link": "https://xkcd.com/1053/",
-            "title": "XKCD: lucky",
-            "pretext": "Looks like you're one of the lucky 10,000 today!",
-        },
-        "ask": ask(),
-        "asking": ask(),
-        "ldap": {
-            "link": "http://large-type.com/#yes",
-            "title": "Is someone complaining about LDAP?",
-            "pretext": "What's that I hear about LDAP?",
-        },
-        "merge": {
-            "link": "http://large-type.com/#WILL",
-            "title": "Who is that force merging to master?",
-            "pretext": "git push -f origin master",
-        },
-        "firstpr": {
-            "link": "https://goo.gl/forms/r02wt0pBNhkxYciI3",
-            "title": "Get your sticker here!",
-            "pretext": ":firstpr:",
-        },
-        "channels": {
-            "link": "https://github.com/OperationCode/operationcode_docs/blob/master/community/slack_channel_guide.md",
-            "title": "Channel Guide!",
-            "pretext": "Check out the Channel Guide!",
-        },
-        # TODO: make this into a url call.
-        "resources": find_resources(),
-        "resource": find_resources(),
-    }
-
-    modify_options = messages.get(requested_text.lower())
-
-    if modify_options:
-        modify_options["slack_id"] = slack_id
-        modify_options["channel_id"] = channel_id
-        return {"type": "message", "message": modify_params(modify_options)}
+    template = catalog.get(requested_text)
+
+    if template:
+        return {
+            "type": "message",
+            "message": {"channel": channel_id, "attachments": template.render(slack_id=slack_id)},
+        }
     else:
         return {
             "type": "ephemeral",
-            "message": {
-                "channel": channel_id,
-                "user": slack_id,
-                "text": default_repeat_message(messages.keys()),
-            },
+            "message": {"channel": channel_id, "user": slack_id, "text": catalog.help},
         }
@@ -1,19 +1,49 @@
 import logging
-from collections import defaultdict
+from typing import TypeVar
 
 from multidict import MultiDict
 
+from pybot._vendor.sirbot.state import MemoryBackend, StateBackend
+from pybot.plugins.airtable.batch import WriteBuffer
+from pybot.plugins.airtable.records import Mentor, Record
+from pybot.plugins.airtable.resolver import RecordResolver
+
 logger = logging.getLogger(__name__)
 
+R = TypeVar("R", bound=Record)
+
+
+class AirtableError(Exception):
+    """Error response of Airtable to a write."""
+
+    def __init__(self, error):
+        super().__init__(error)
+        self.error = error
+
 
 class AirtableAPI:
     API_ROOT = "https://api.airtable.com/v0/"
-    record_id_to_name = defaultdict(dict)
-
-    def __init__(self, session, api_key, base_key):
+    # Reference tables rarely change, their names are refreshed in the background
+    REFERENCE_TABLES = ("Services", "Skillsets")
+    NAMES_TTL = 3600
+
+    def __init__(
+        self,
+        session,
+        api_key,
+        base_key,
+        api_root=None,
+        state: StateBackend | None = None,
+        write_window: float = 0.05,
+    ):
         self.session = session
+        self.api_root = (api_root or self.API_ROOT).rstrip("/") + "/"
         self.api_key = api_key
         self.base_key = base_key
+        self.state = state or MemoryBackend()
+        # Creates and updates are batched, 10 records per request
+        self.writes = WriteBuffer(self, window=write_window)
+        self._resolvers: dict[tuple[str, str], RecordResolver] = {}
 
     async def get(self, url, **kwargs):
         auth_header = {"Authorization": f"Bearer {self.api_key}"}
@@ -32,6 +62,12 @@ class AirtableAPI:
         async with self.session.post(url, headers=auth_header, **kwargs) as r:
             return await r.json()
 
+    async def request(self, method, url, **kwargs) -> tuple[int, dict]:
+        """Status and JSON body of the response, errors included."""
+        auth_header = {"authorization": f"Bearer {self.api_key}"}
+        async with self.session.request(method, url, headers=auth_header, **kwargs) as r:
+            return r.status, await r.json()
+
     async def _depaginate_records(self, url, params, offset):
         records = []
         while offset:
@@ -48,33 +84,87 @@ class AirtableAPI:
         return records
 
     def table_url(self, table_name, record_id=None):
-        url = f"{self.API_ROOT}{self.base_key}/{table_name}"
+        url = f"{self.api_root}{self.base_key}/{table_name}"
         if record_id:
             url += f"/{record_id}"
         return url
 
     async def get_name_from_record_id(self, table_name: str, record_id):
-        if self.record_id_to_name[table_name]:
-            return self.record_id_to_name[table_name].get(record_id)
+        if table_name in self.REFERENCE_TABLES:
+            name = (await self.get_record_names(table_name)).get(record_id)
+            if name is not None:
+                return name
+        # Records of other tables, or added since the names were cached
+        return await self.resolver(table_name).get(record_id)
+
+    def resolver(self, table_name: str, field: str = "Name") -> RecordResolver:
+        """Cached values of `field` of the records of `table_name`, by record ID."""
+        resolver = self._resolvers.get((table_name, field))
+        if resolver is None:
+            resolver = self._resolvers[table_name, field] = RecordResolver(
+                self, table_name, field, ttl=self.NAMES_TTL
+            )
+        return resolver
+
+    async def find_records_by_id(
+        self, table_name: str, record_ids: list[str], fields: list[str] | None = None
+    ) -> list[dict] | None:
+        """Records of `table_name` among `record_ids`, ``None`` on error."""
+        url = self.table_url(table_name)
+        params = MultiDict([("filterByFormula", _record_id_formula(record_ids))])
+        params.extend(("fields[]", field) for field in fields or ())
+        response = await self.get(url, params=params)
+
+        if "error" in response:
+            error_msg = response["error"].get("message", "Unknown error")
+            logger.error(f"Airtable API error for {table_name} table: {error_msg}")
+            return None
 
-        url = self.table_url("Services")
+        records = response["records"]
+        if response.get("offset"):
+            records.extend(await self._depaginate_records(url, params, response["offset"]))
+        return records
+
+    async def get_record_names(self, table_name: str) -> dict[str, str]:
+        """Names of the records of `table_name` by record ID, cached."""
+        names = await self.state.get_or_set(
+            self._names_key(table_name),
+            lambda: self._get_record_names(table_name),
+            ttl=self.NAMES_TTL,
+        )
+        return names or {}
+
+    async def refresh_record_names(self, table_name: str) -> None:
+        """Fetch the names of the records of `table_name` and replace the cached ones."""
+        names = await self._get_record_names(table_name)
+        if names:
+            await self.state.set(self._names_key(table_name), names, ttl=self.NAMES_TTL)
+
+    def _names_key(self, table_name: str) -> str:
+        return f"airtable:{self.base_key}:names:{table_name}"
+
+    async def _get_record_names(self, table_name: str) -> dict[str, str] | None:
+        url = self.table_url(table_name)
         params = {"fields[]": "Name"}
         res_json = await self.get(url, params=params)
 
         # Check for Airtable API error response
         if "error" in res_json:
             error_msg = res_json["error"].get("message", "Unknown error")
-            logger.error(f"Airtable API error for Services table: {error_msg}")
+            logger.error(f"Airtable API error for {table_name} table: {error_msg}")
             return None
 
         records = res_json["records"]
+        if res_json.get("offset"):
+            records.extend(await self._depaginate_records(url, params, res_json["offset"]))
         # Skip records that don't have a Name field (Airtable omits empty fields)
-        self.record_id_to_name[table_name] = {
+        names = {
             record["id"]: record["fields"]["Name"]
             for record in records
             if "Name" in record.get("fields", {})
         }
-        return self.record_id_to_name[table_name].get(record_id)
+        # An empty table is not cached, the next lookup asks again
+        return names or None
 
     async def get_row_from_record_id(self, table_name: str, record_id: str) -> dict:
         url = self.table_url(table_name, record_id)
@@ -123,37 +213,58 @@ class AirtableAPI:
         else:
             return res_json["records"]
 
-    async def find_mentors_with_matching_skillsets(self, skillsets):
-        url = self.table_url("Mentors")
-        params = MultiDict([("fields", "Email"), ("fields", "Skillsets"), ("fields", "Slack Name")])
-        skillsets = skillsets.split(",")
-        response = await self.get(url, params=params)
+    async def get_record(self, model: type[R], record_id: str) -> R | None:
+        """The record `record_id` of the table of `model`, ``None`` if not found or on error."""
+        try:
+            records = await self.list_records(model, _record_id_formula([record_id]))
+        except Exception:
+            logger.exception(f"Couldn't get record {record_id} from {model.table}")
+            return None
+        return records[0] if records else None
 
-        # Check for Airtable API error response
-        if "error" in response:
-            error_msg = response["error"].get("message", "Unknown error")
-            logger.error(f"Airtable API error for Mentors table: {error_msg}")
-            return []
+    async def list_records(self, model: type[R], formula: str | None = None) -> list[R]:
+        """
+        Records of the table of `model`, all pages, with only the fields of the model.
 
-        offset = response.get("offset")
-        mentors = response["records"]
+        An error stops the listing, the records read until then are returned.
+        """
+        url = self.table_url(model.table)
+        params = MultiDict(("fields[]", name) for name in model.field_names())
+        if formula:
+            params["filterByFormula"] = formula
 
-        if offset:
-            additional_mentors = await self._depaginate_records(url, params, offset)
-            mentors.extend(additional_mentors)
+        records = []
+        while True:
+            response = await self.get(url, params=params)
+            if "error" in response:
+                error_msg = response["error"].get("message", "Unknown error")
+                logger.error(f"Airtable API error for {model.table} table: {error_msg}")
+                break
+            records.extend(map(model.from_airtable, response.get("records", ())))
+            if not response.get("offset"):
+                break
+            params["offset"] = response["offset"]
+        return records
+
+    async def find(self, model: type[R], field: str, value: str) -> list[R]:
+        """Records of the table of `model` whose Airtable `field` contains `value`, ignoring case."""
+        return await self.list_records(model, _find_formula(field, value))
+
+    async def find_mentors_with_matching_skillsets(self, skillsets) -> list[Mentor]:
+        skillsets = skillsets.split(",")
+        mentors = await self.list_records(Mentor)
 
         partial_match = []
         complete_match = []
         try:
             for mentor in mentors:
-                if all(skillset in mentor["fields"].get("Skillsets", []) for skillset in skillsets):
-                    complete_match.append(mentor["fields"])
+                if all(skillset in mentor.skillsets for skillset in skillsets):
+                    complete_match.append(mentor)
                 if any(
-                    mentor["fields"] not in complete_match
-                    and skillset in mentor["fields"].get("Skillsets", [])
+                    mentor not in complete_match and skillset in mentor.skillsets
                     for skillset in skillsets
                 ):
-                    partial_match.append(mentor["fields"])
+                    partial_match.append(mentor)
         except Exception:
             logger.exception("Exception while trying to filter mentors by skillset")
             return []
@@ -166,7 +277,7 @@ class AirtableAPI:
     async def find_records(self, table_name: str, field: str, value: str) -> list:
         url = self.table_url(table_name)
 
-        params = {"filterByFormula": f"FIND(LOWER('{value}'), LOWER({{{field}}}))"}
+        params = {"filterByFormula": _find_formula(field, value)}
 
         try:
             response = await self.get(url, params=params)
@@ -183,10 +294,23 @@ class AirtableAPI:
             return []
 
     async def update_request(self, request_record, mentor_id):
-        url = self.table_url("Mentor Request", request_record)
-        data = {"fields": {"Mentor Assigned": [mentor_id] if mentor_id else None}}
-        return await self.patch(url, json=data)
+        fields = {"Mentor Assigned": [mentor_id] if mentor_id else None}
+        response = await self.writes.update("Mentor Request", request_record, fields)
+        if "error" in response:
+            raise AirtableError(response["error"])
+        return response
 
     async def add_record(self, table, json):
-        url = self.table_url(table)
-        return await self.post(url, json=json)
+        """Create a record, returns it or Airtable's error response."""
+        return await self.writes.create(table, json.get("fields", {}))
+
+
+def _find_formula(field: str, value: str) -> str:
+    return f"FIND(LOWER('{value}'), LOWER({{{field}}}))"
+
+
+def _record_id_formula(record_ids) -> str:
+    ids = ", ".join(
+        "RECORD_ID()='{}'".format(record_id.replace("'", "\\'")) for record_id in record_ids
+    )
+    return f"OR({ids})"
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBuffer:
+    """
+    Write-behind buffer of Airtable record creates and updates.
+
+    Writes to the same table made within `window` seconds of each other are sent together, in
+    requests of up to ``BATCH_SIZE`` records, and each caller gets a future of its own record.
+    Updates of a record already waiting are merged into one. Rate limited and failed requests
+    are retried with backoff; a batch rejected as a whole for a bad record is split, so the
+    other records are still written and only the bad one gets the error.
+
+    Futures resolve to the record Airtable returned, or to its ``{"error": ...}`` response.
+
+    Args:
+        api: :class:`~pybot.plugins.airtable.api.AirtableAPI` sending the requests.
+        window: Seconds a write waits for others to share its request.
+        retries: Number of times a failed request is retried.
+        backoff: Seconds before the first retry, doubled after each one.
+    """
+
+    BATCH_SIZE = 10
+    RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+    def __init__(self, api, window: float = 0.05, retries: int = 3, backoff: float = 1.0):
+        self.api = api
+        self.window = window
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = {"records": 0, "requests": 0, "retries": 0, "failed": 0}
+
+        # (method, table) -> record ID or creation index -> [record, futures]
+        self._pending: dict[tuple[str, str], dict[Any, list]] = defaultdict(dict)
+        self._timers: dict[tuple[str, str], asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._created = 0
+
+    def create(self, table: str, fields: dict) -> asyncio.Future:
+        self._created += 1
+        return self._add("POST", table, self._created, {"fields": fields})
+
+    def update(self, table: str, record_id: str, fields: dict) -> asyncio.Future:
+        key = ("PATCH", table)
+        if record_id in self._pending[key]:
+            self._pending[key][record_id][0]["fields"].update(fields)
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key][record_id][1].append(future)
+            return future
+        return self._add("PATCH", table, record_id, {"id": record_id, "fields": dict(fields)})
+
+    async def flush(self) -> None:
+        """Send the waiting writes now, and wait for every request in flight."""
+        for key in list(self._pending):
+            self._send_pending(key)
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    @property
+    def pending(self) -> int:
+        return sum(len(records) for records in self._pending.values())
+
+    def _add(self, method: str, table: str, index: Any, record: dict) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (method, table)
+        self._pending[key][index] = [record, [future]]
+        self.stats["records"] += 1
+
+        if len(self._pending[key]) >= self.BATCH_SIZE:
+            self._send_pending(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._send_pending, key)
+        return future
+
+    def _send_pending(self, key: tuple[str, str]) -> None:
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+
+        entries = list(self._pending.pop(key, {}).values())
+        for start in range(0, len(entries), self.BATCH_SIZE):
+            task = asyncio.create_task(self._send(*key, entries[start : start + self.BATCH_SIZE]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, method: str, table: str, entries: list[list]) -> None:
+        try:
+            status, response = await self._request(method, table, [r for r, _ in entries])
+        except Exception as e:
+            logger.exception(f"Failed to write {len(entries)} records to Airtable {table}")
+            self.stats["failed"] += len(entries)
+            for _, futures in entries:
+                _resolve(futures, exception=e)
+            return
+
+        if "error" not in response and len(response.get("records", ())) != len(entries):
+            response = {
+                "error": {"type": "INVALID_RESPONSE", "message": "Unexpected number of records"}
+            }
+
+        if "error" not in response:
+            for (_, futures), record in zip(entries, response["records"], strict=True):
+                _resolve(futures, record)
+        elif len(entries) > 1 and status not in self.RETRY_STATUSES:
+            # Airtable rejects the whole batch for one bad record, find it
+            logger.info(f"Airtable rejected a batch of {table} records, sending them one by one")
+            await asyncio.gather(*(self._send(method, table, [entry]) for entry in entries))
+        else:
+            logger.error(f"Airtable error writing to {table}: {response['error']}")
+            self.stats["failed"] += len(entries)
+            for _, futures in entries:
+                _resolve(futures, response)
+
+    async def _request(self, method: str, table: str, records: list[dict]) -> tuple[int, dict]:
+        url = self.api.table_url(table)
+        for attempt in range(self.retries + 1):
+            self.stats["requests"] += 1
+            status, response = await self.api.request(method, url, json={"records": records})
+            if status not in self.RETRY_STATUSES or attempt == self.retries:
+                break
+
+            self.stats["retries"] += 1
+            delay = self.backoff * 2**attempt
+            logger.warning(f"Airtable answered {status} writing to {table}, retry in {delay}s")
+            await asyncio.sleep(delay)
+        return status, response
+
+
+def _resolve(futures: list[asyncio.Future], result: Any = None, exception=None) -> None:
+    for future in futures:
+        # Callers may have stopped waiting
+        if future.done():
+            continue
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
@@ -0,0 +1,60 @@
+import logging
+from typing import Any
+
+from pybot._vendor.sirbot.state import StateBackend
+
+logger = logging.getLogger(__name__)
+
+IN_FLIGHT = "in_flight"
+DONE = "done"
+
+
+class Deliveries:
+    """
+    Webhook deliveries being or already processed, so the retries of Zapier are ignored.
+
+    Deliveries are kept in the shared state, a retry landing on another worker or replica is
+    ignored too. A delivery is claimed atomically by :meth:`begin` and in flight until
+    :meth:`finish`, then remembered as done for `ttl` seconds. A delivery failing is forgotten,
+    its retry is processed again, as is one still in flight after `in_flight_ttl` seconds, its
+    worker having died.
+
+    Args:
+        state: Shared state backend.
+        ttl: Seconds a processed delivery is remembered.
+        in_flight_ttl: Seconds a delivery may be in flight.
+    """
+
+    KEY = "airtable:delivery"
+
+    def __init__(self, state: StateBackend, ttl: float = 24 * 3600, in_flight_ttl: float = 600):
+        self.state = state
+        self.ttl = ttl
+        self.in_flight_ttl = in_flight_ttl
+        self.stats = {"processed": 0, "failed": 0, "duplicates": 0, "in_flight_duplicates": 0}
+
+    def _key(self, request_type: str, record: str) -> str:
+        return f"{self.KEY}:{request_type}:{record}"
+
+    async def begin(self, request_type: str, record: str) -> bool:
+        """Whether the delivery of `record` should be processed, claiming it if so."""
+        key = self._key(request_type, record)
+        if await self.state.add(key, IN_FLIGHT, ttl=self.in_flight_ttl):
+            return True
+
+        state = await self.state.get(key)
+        self.stats["duplicates" if state == DONE else "in_flight_duplicates"] += 1
+        logger.info(f"Ignoring duplicate delivery {key}, {state}")
+        return False
+
+    async def finish(self, request_type: str, record: str, ok: bool) -> None:
+        key = self._key(request_type, record)
+        if ok:
+            await self.state.set(key, DONE, ttl=self.ttl)
+            self.stats["processed"] += 1
+        else:
+            await self.state.delete(key)
+            self.stats["failed"] += 1
+
+    def status(self) -> dict[str, Any]:
+        return {"backend": self.state.name, **self.stats}
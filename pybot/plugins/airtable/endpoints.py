@@ -1,6 +1,7 @@
 import asyncio
 import logging
 
+from aiohttp import web
 from aiohttp.web_response import Response
 
 logger = logging.getLogger(__name__)
@@ -14,19 +15,39 @@ async def incoming_request(request):
     if payload["token"] != airtable.verify:
         return Response(status=401)
 
-    futures = list(_dispatch(airtable.routers["request"], payload, request.app))
+    # Zapier retries the requests it finds slow, each record is processed once
+    key = (payload.get("type"), payload["record"]) if payload.get("record") else None
+    if key and not await airtable.deliveries.begin(*key):
+        return Response(status=200)
+
+    dispatched = list(_dispatch(airtable.routers["request"], payload, request.app))
+    if key:
+        finish = asyncio.ensure_future(
+            _finish_when_done(airtable.deliveries, key, [f for f, _ in dispatched])
+        )
+        finish.add_done_callback(_callback)
+
+    futures = [f for f, wait in dispatched if wait]
     if futures:
         return await _wait_and_check_result(futures)
     return Response(status=200)
 
 
+async def deliveries(request):
+    return web.json_response(request.app.plugins["airtable"].deliveries.status())
+
+
 def _dispatch(router, event, app):
     for handler, configuration in router.dispatch(event):
-        f = asyncio.ensure_future(handler(event, app))
-        if configuration["wait"]:
-            yield f
-        else:
+        f = app.deadlines.run(handler, configuration, event, app)
+        if not configuration["wait"]:
             f.add_done_callback(_callback)
+        yield f, configuration["wait"]
+
+
+async def _finish_when_done(deliveries, key, futures):
+    results = await asyncio.gather(*futures, return_exceptions=True)
+    await deliveries.finish(*key, ok=not any(isinstance(r, BaseException) for r in results))
 
 
 def _callback(f):
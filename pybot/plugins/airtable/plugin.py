@@ -7,6 +7,7 @@ from typing import Any
 
 from pybot.plugins.airtable import endpoints
 from pybot.plugins.airtable.api import AirtableAPI
+from pybot.plugins.airtable.deliveries import Deliveries
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +33,11 @@ class AirtablePlugin:
         self.base_key = None
         self.api = None
         self.verify = None
+        self.api_root = None
+        self.write_window = None
 
         self.routers = {"request": RequestRouter()}
+        self.deliveries = None
 
     def load(
         self,
@@ -41,24 +45,67 @@ class AirtablePlugin:
         api_key: str | None = None,
         base_key: str | None = None,
         verify: str | None = None,
+        api_root: str | None = None,
+        write_window: float | None = None,
     ) -> None:
         # Store reference to sirbot for later initialization
         self._sirbot = sirbot
         self.api_key = api_key or os.environ.get("AIRTABLE_API_KEY", "")
         self.base_key = base_key or os.environ.get("AIRTABLE_BASE_KEY", "")
         self.verify = verify or os.environ.get("AIRTABLE_VERIFY", "")
+        self.api_root = api_root or os.environ.get("AIRTABLE_API_ROOT")
+        if write_window is None:
+            write_window = float(os.environ.get("AIRTABLE_WRITE_WINDOW", 0.05))
+        self.write_window = write_window
+        self.deliveries = Deliveries(sirbot.state)
 
         # Initialize API after session is created
         sirbot.on_startup.append(self._initialize_api)
+        sirbot.add_warmup("airtable_reference_tables", self.warm_reference_tables)
+        # Before sirbot closes the HTTP client the buffered writes are sent with
+        sirbot.on_shutdown.insert(0, self.flush_writes)
 
         sirbot.router.add_route("POST", "/airtable/request", endpoints.incoming_request)
+        sirbot.router.add_route("GET", "/airtable/deliveries", endpoints.deliveries)
 
     async def _initialize_api(self, app: Any) -> None:
-        """Initialize AirtableAPI after http_session is created."""
+        """Initialize AirtableAPI on startup, with the `airtable` HTTP client."""
         if self.api is None:
             logger.info("Initializing Airtable API client")
-            self.session = self._sirbot.http_session
-            self.api = AirtableAPI(self.session, self.api_key, self.base_key)
+            self.session = self._sirbot.http_client("airtable")
+            self.api = AirtableAPI(
+                self.session,
+                self.api_key,
+                self.base_key,
+                self.api_root,
+                state=app.state,
+                write_window=self.write_window,
+            )
+            # Once the API exists, a job added earlier could run before this hook. Missed runs
+            # are skipped, the tables are loaded by the warm-up or on demand.
+            app.scheduler.add(
+                "airtable_reference_tables",
+                self.refresh_reference_tables,
+                every=self.api.NAMES_TTL / 2,
+                jitter=60,
+                max_runtime=60,
+                missed="skip",
+            )
+
+    async def flush_writes(self, app: Any) -> None:
+        if self.api:
+            await self.api.writes.flush()
+
+    async def warm_reference_tables(self, app: Any) -> None:
+        """Load the record names of the reference tables unless they are cached already."""
+        await asyncio.gather(
+            *(self.api.get_record_names(table_name) for table_name in self.api.REFERENCE_TABLES)
+        )
+
+    async def refresh_reference_tables(self, app: Any) -> None:
+        """Keep the record names of the reference tables cached."""
+        for table_name in self.api.REFERENCE_TABLES:
+            await self.api.refresh_record_names(table_name)
 
     def on_request(self, request: str, handler: AsyncHandler, **kwargs: Any) -> None:
         handler = _ensure_async(handler)
@@ -0,0 +1,72 @@
+"""
+Records of the Airtable tables used by the bot.
+
+Each model declares the fields it needs, the API only asks Airtable for those (``fields[]``)
+and decodes the records straight into slotted instances. Fields missing from a record, which
+Airtable omits when empty, take their default.
+"""
+
+import functools
+from collections.abc import Sequence
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Self
+
+
+def column(name: str, **kwargs: Any) -> Any:
+    """A field of the model, stored in the Airtable field `name`."""
+    kwargs.setdefault("default", None)
+    return field(metadata={"airtable": name}, **kwargs)
+
+
+class Record:
+    """Base of the models, ``id`` is the Airtable record ID."""
+
+    __slots__ = ()
+
+    table: ClassVar[str]
+    id: str
+
+    @classmethod
+    def field_names(cls) -> tuple[str, ...]:
+        """The Airtable fields of the model."""
+        return tuple(_columns(cls).values())
+
+    @classmethod
+    def from_airtable(cls, record: dict) -> Self:
+        values = record.get("fields", {})
+        return cls(
+            id=record["id"],
+            **{attr: values[name] for attr, name in _columns(cls).items() if name in values},
+        )
+
+
+@functools.cache
+def _columns(model: type[Record]) -> dict[str, str]:
+    return {f.name: f.metadata["airtable"] for f in fields(model) if "airtable" in f.metadata}
+
+
+@dataclass(slots=True)
+class Mentor(Record):
+    table: ClassVar[str] = "Mentors"
+
+    id: str
+    name: str | None = column("Name")
+    email: str | None = column("Email")
+    slack_name: str | None = column("Slack Name")
+    skillsets: Sequence[str] = column("Skillsets", default=())
+
+
+@dataclass(slots=True)
+class Service(Record):
+    table: ClassVar[str] = "Services"
+
+    id: str
+    name: str | None = column("Name")
+
+
+@dataclass(slots=True)
+class Skillset(Record):
+    table: ClassVar[str] = "Skillsets"
+
+    id: str
+    name: str | None = column("Name")
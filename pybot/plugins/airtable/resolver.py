@@ -0,0 +1,93 @@
+import asyncio
+import logging
+from typing import Any
+
+from pybot._vendor.sirbot.ttl import TTLStore
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class RecordResolver:
+    """
+    Value of a field of the records of a table by record ID, e.g. the names of linked records.
+
+    IDs missing from the cache are looked up together: those asked for in the same iteration of
+    the event loop, e.g. by gathered lookups, share ``filterByFormula`` requests of up to ``BATCH_SIZE`` IDs, and an ID
+    already being looked up isn't asked for again. Results, including the records that don't
+    exist or don't have the field, are cached for `ttl` seconds. A lookup failing isn't
+    cached, its IDs resolve to ``None``.
+
+    Args:
+        api: :class:`~pybot.plugins.airtable.api.AirtableAPI` sending the requests.
+        table: Name of the table.
+        field: Name of the field resolved.
+        ttl: Seconds a value is cached.
+        maxsize: Maximum number of values cached.
+    """
+
+    BATCH_SIZE = 50
+
+    def __init__(
+        self, api, table: str, field: str = "Name", ttl: float = 3600, maxsize: int = 1000
+    ):
+        self.api = api
+        self.table = table
+        self.field = field
+        self.cache = TTLStore(ttl, maxsize=maxsize)
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "requests": 0}
+
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._queued: list[str] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get(self, record_id: str) -> Any:
+        """Value of the field of `record_id`, ``None`` for a record without one."""
+        value = self.cache.get(record_id, _MISSING)
+        if value is not _MISSING:
+            self.stats["hits"] += 1
+            return value
+
+        future = self._inflight.get(record_id)
+        if future is None:
+            future = self._queue(record_id)
+        else:
+            self.stats["coalesced"] += 1
+        # Shielded, other callers may be waiting for the same lookup
+        return await asyncio.shield(future)
+
+    def _queue(self, record_id: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = self._inflight[record_id] = loop.create_future()
+        if not self._queued:
+            loop.call_soon(self._fetch_queued)
+        self._queued.append(record_id)
+        self.stats["misses"] += 1
+        return future
+
+    def _fetch_queued(self) -> None:
+        queued, self._queued = self._queued, []
+        for start in range(0, len(queued), self.BATCH_SIZE):
+            task = asyncio.create_task(self._fetch(queued[start : start + self.BATCH_SIZE]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, record_ids: list[str]) -> None:
+        values = dict.fromkeys(record_ids)
+        try:
+            self.stats["requests"] += 1
+            records = await self.api.find_records_by_id(self.table, record_ids, [self.field])
+            if records is not None:
+                for record in records:
+                    if record["id"] in values:
+                        values[record["id"]] = record.get("fields", {}).get(self.field)
+                for record_id, value in values.items():
+                    self.cache.set(record_id, value)
+        except Exception:
+            logger.exception(f"Failed to resolve {len(record_ids)} {self.table} record IDs")
+        finally:
+            for record_id, value in values.items():
+                future = self._inflight.pop(record_id)
+                if not future.done():
+                    future.set_result(value)
@@ -2,42 +2,49 @@ import asyncio
 import json
 import logging
 
-from aiohttp.web_response import Response
+from aiohttp.web_response import Response, StreamResponse
 
-from pybot.plugins.api.request import FailedVerification, SlackApiRequest
+from pybot.plugins.api.request import AdminApiRequest, FailedVerification, SlackApiRequest
 
 logger = logging.getLogger(__name__)
 
 
 async def slack_api(request):
-    api_plugin = request.app.plugins["api"]
+    return await _handle(request, SlackApiRequest, request.app.plugins["api"].routers["slack"])
 
+
+async def admin_api(request):
+    return await _handle(request, AdminApiRequest, request.app.plugins["api"].routers["admin"])
+
+
+async def _handle(request, request_class, router):
     try:
-        slack_request = SlackApiRequest.from_request(request)
+        api_request = request_class.from_request(request)
     except FailedVerification:
         logger.info(f"Failed verification to API route {request.url}.")
         return Response(status=401)
 
-    futures = list(_dispatch(api_plugin.routers["slack"], slack_request, request.app))
+    futures = list(_dispatch(router, api_request, request.app))
 
     if futures:
-        return await _wait_and_check_result(futures)
+        return await _wait_and_check_result(futures, api_request)
     return Response(status=200)
 
 
 def _dispatch(router, event, app):
     for handler, configuration in router.dispatch(event):
-        f = asyncio.ensure_future(handler(event, app))
+        f = app.deadlines.run(handler, configuration, event, app)
         yield f
 
 
-async def _wait_and_check_result(futures):
+async def _wait_and_check_result(futures, request):
     dones, _ = await asyncio.wait(futures, return_when=asyncio.ALL_COMPLETED)
     try:
         results = [done.result() for done in dones]
     except Exception as e:
         logger.exception(e)
-        return Response(status=500)
+        # A streamed response is on the wire already, it is ended instead of replaced
+        return request.response or Response(status=500)
 
     if len(results) > 1:
         logger.warning("Multiple web.Response for handler, returning none")
@@ -45,7 +52,7 @@ async def _wait_and_check_result(futures):
     elif results:
         result = (
             results[0]
-            if isinstance(results[0], Response)
+            if isinstance(results[0], StreamResponse)
             else Response(body=json.dumps(results[0]))
         )
 
@@ -4,6 +4,7 @@ from collections import defaultdict
 from collections.abc import Callable, Coroutine
 from typing import Any
 
+from pybot._vendor.sirbot.ttl import TTLStore
 from pybot.plugins.api import endpoints
 
 logger = logging.getLogger(__name__)
@@ -25,20 +26,26 @@ class APIPlugin:
     __name__ = "api"
 
     def __init__(self):
-        self.session = None
-        self.routers = {"slack": SlackAPIRequestRouter()}
+        self.routers = {"slack": SlackAPIRequestRouter(), "admin": SlackAPIRequestRouter()}
+        # Slack users found by email, normalized, for the verification endpoints
+        self.known_users = TTLStore(ttl=6 * 3600, maxsize=50_000)
 
     def load(self, sirbot: Any) -> None:
-        self.session = sirbot.http_session
-
         sirbot.router.add_route("GET", "/pybot/api/v1/slack/{resource}", endpoints.slack_api)
         sirbot.router.add_route("POST", "/pybot/api/v1/slack/{resource}", endpoints.slack_api)
+        sirbot.router.add_route("GET", "/pybot/api/v1/admin/{resource}", endpoints.admin_api)
 
     def on_get(self, request: str, handler: AsyncHandler, **kwargs: Any) -> None:
         handler = _ensure_async(handler)
         options = {**kwargs, "wait": False}
         self.routers["slack"].register(request, (handler, options))
 
+    def on_admin(self, request: str, handler: AsyncHandler, **kwargs: Any) -> None:
+        """Register handler for an admin request, authorized by `ADMIN_AUTH_TOKEN`."""
+        handler = _ensure_async(handler)
+        options = {**kwargs, "wait": False}
+        self.routers["admin"].register(request, (handler, options))
+
 
 class SlackAPIRequestRouter:
     def __init__(self):
@@ -1,8 +1,12 @@
 import copy
 import os
 from collections.abc import MutableMapping
+from typing import Any
+
+from aiohttp import web
 
 BACKEND_AUTH_TOKEN = os.environ.get("BACKEND_AUTH_TOKEN", "devBackendToken")
+ADMIN_AUTH_TOKEN = os.environ.get("ADMIN_AUTH_TOKEN")
 
 
 class SlackApiRequest(MutableMapping):
@@ -15,6 +19,8 @@ class SlackApiRequest(MutableMapping):
         query: Querystring params as a dict
 
         token: Bearer Token provided with request
+
+        response: Response streamed by the handler, once started with :meth:`stream`
     """
 
     auth_tokens = {BACKEND_AUTH_TOKEN}
@@ -24,6 +30,7 @@ class SlackApiRequest(MutableMapping):
         self.resource = resource
         self.query = query
         self.token = self.__get_token(raw_request)
+        self.response: web.StreamResponse | None = None
 
         if not self.authorized:
             raise FailedVerification(self.token)
@@ -38,6 +45,17 @@ class SlackApiRequest(MutableMapping):
         else:
             return {}
 
+    async def stream(self, **kwargs: Any) -> web.StreamResponse:
+        """
+        Start streaming the response, with the :class:`aiohttp.web.StreamResponse` `kwargs`.
+
+        Once started, the response is sent even if the handler fails: it ends the stream with
+        an error of its own rather than answering with another response.
+        """
+        self.response = web.StreamResponse(**kwargs)
+        await self.response.prepare(self.request)
+        return self.response
+
     @classmethod
     def from_request(cls, raw_request):
         resource = raw_request.match_info["resource"]
@@ -79,6 +97,15 @@ class SlackApiRequest(MutableMapping):
         )
 
 
+class AdminApiRequest(SlackApiRequest):
+    """
+    Request to the admin API, authorized by `ADMIN_AUTH_TOKEN` only. Without it every request
+    fails verification.
+    """
+
+    auth_tokens = {ADMIN_AUTH_TOKEN} if ADMIN_AUTH_TOKEN else set()
+
+
 class FailedVerification(Exception):
     """
     Raised when incoming API request fails verification
@@ -8,10 +8,6 @@ the same standards as OperationCode/back-end.
 import logging
 import os
 
-import sentry_sdk
-from sentry_sdk.integrations.aiohttp import AioHttpIntegration
-from sentry_sdk.integrations.logging import LoggingIntegration
-
 
 def strtobool(value):
     """Convert string to boolean."""
@@ -114,13 +110,17 @@ def init_sentry():
     """
     Initialize Sentry with tracing, profiling, and logging.
 
-    Only initializes if SENTRY_DSN is set in environment.
+    Only initializes if SENTRY_DSN is set in environment, the SDK isn't even imported otherwise.
     """
     sentry_dsn = config("SENTRY_DSN", default="")
 
     if not sentry_dsn:
         return
 
+    import sentry_sdk
+    from sentry_sdk.integrations.aiohttp import AioHttpIntegration
+    from sentry_sdk.integrations.logging import LoggingIntegration
+
     sentry_sdk.init(
         dsn=sentry_dsn,
         integrations=[
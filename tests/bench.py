@@ -0,0 +1,460 @@
+"""
+Microbenchmarks of the per-request hot paths: routing, payload parsing, sansio and templates.
+
+Every benchmark is a setup function, registered with :func:`benchmark`, returning the
+zero-argument callable to time. Payloads come from `tests.data` and the routers are filled by
+the production ``create_endpoints``.
+
+Results are JSON (``{"meta": ..., "benchmarks": {name: timings}}``) and a previous result
+file can be used as a baseline to flag regressions.
+
+Usage:
+    python -m tests.bench --output bench.json
+    python -m tests.bench --baseline bench.json --threshold 0.15
+"""
+
+import argparse
+import copy
+import datetime
+import hashlib
+import hmac
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+BENCHMARKS: dict[str, Callable[[], Callable[[], Any]]] = {}
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def benchmark(name: str) -> Callable:
+    """Register a benchmark setup function under `name`."""
+
+    def decorator(setup: Callable[[], Callable[[], Any]]) -> Callable[[], Callable[[], Any]]:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+def _slack_plugin():
+    from pybot import endpoints
+    from pybot._vendor.sirbot.plugins.slack import SlackPlugin
+
+    slack = SlackPlugin(
+        token="token", verify="supersecuretoken", bot_id="B00000000", bot_user_id="U00000000"
+    )
+    endpoints.slack.create_endpoints(slack)
+    for name in ("event", "command", "action"):
+        slack.routers[name].freeze()
+    return slack
+
+
+def _message(text: str, channel: str = "C00000A00") -> Any:
+    from pybot._vendor.slack.events import Message
+
+    return Message({"type": "message", "channel": channel, "user": "U000AA000", "text": text})
+
+
+def _block_action(block_id: str, action_id: str) -> Any:
+    from pybot._vendor.slack.actions import Action
+    from tests.data.blocks import make_mentor_request_action
+
+    raw = make_mentor_request_action(service="Resume Review", skillsets=["Python", "AWS"])
+    raw["actions"] = [{"block_id": block_id, "action_id": action_id, "type": "button"}]
+    return Action(raw)
+
+
+# Routers
+
+
+@benchmark("router.event.dispatch")
+def bench_event_dispatch():
+    from pybot._vendor.slack.events import Event
+    from tests.data.events import TEAM_JOIN
+
+    router = _slack_plugin().routers["event"]
+    event = Event.from_http(copy.deepcopy(TEAM_JOIN))
+    return lambda: list(router.dispatch(event))
+
+
+@benchmark("router.event.dispatch_unknown_type")
+def bench_event_dispatch_unknown_type():
+    from pybot._vendor.slack.events import Event
+
+    router = _slack_plugin().routers["event"]
+    event = Event({"type": "reaction_added", "user": "U000AA000", "reaction": "wave"})
+    return lambda: list(router.dispatch(event))
+
+
+@benchmark("router.message.dispatch")
+def bench_message_dispatch():
+    router = _slack_plugin().routers["message"]
+    message = _message("has anyone tried <!here> with !pybot before? " * 4)
+    return lambda: list(router.dispatch(message))
+
+
+@benchmark("router.message.dispatch_no_match")
+def bench_message_dispatch_no_match():
+    router = _slack_plugin().routers["message"]
+    message = _message("just a regular message about python and career advice " * 4)
+    return lambda: list(router.dispatch(message))
+
+
+@benchmark("router.command.dispatch")
+def bench_command_dispatch():
+    from pybot._vendor.slack.commands import Command
+    from tests.data.commands import make_command
+
+    router = _slack_plugin().routers["command"]
+    command = Command(make_command("/roll", "2d6"))
+    return lambda: list(router.dispatch(command))
+
+
+@benchmark("router.command.dispatch_unknown")
+def bench_command_dispatch_unknown():
+    from pybot._vendor.slack.commands import Command
+    from tests.data.commands import make_command
+
+    router = _slack_plugin().routers["command"]
+    command = Command(make_command("/unknown", "2d6"))
+    return lambda: list(router.dispatch(command))
+
+
+@benchmark("router.action.dispatch_block_actions")
+def bench_block_action_dispatch():
+    router = _slack_plugin().routers["action"]
+    action = _block_action("submission", "submit_mentor_btn")
+    return lambda: list(router.dispatch(action))
+
+
+@benchmark("router.action.dispatch_unknown_block")
+def bench_unknown_block_action_dispatch():
+    router = _slack_plugin().routers["action"]
+    action = _block_action("unknown_block", "unknown_action")
+    return lambda: list(router.dispatch(action))
+
+
+@benchmark("router.action.dispatch_interactive_message")
+def bench_interactive_message_dispatch():
+    from pybot._vendor.slack.actions import Action
+    from tests.data.actions import Action as ActionPayload
+
+    router = _slack_plugin().routers["action"]
+    action = Action.from_http(ActionPayload.claim_mentee.value)
+    return lambda: list(router.dispatch(action))
+
+
+@benchmark("router.freeze")
+def bench_router_freeze():
+    slack = _slack_plugin()
+    routers = [slack.routers[name] for name in ("event", "command", "action")]
+
+    def freeze():
+        for router in routers:
+            router.freeze()
+
+    return freeze
+
+
+# Incoming payloads
+
+
+@benchmark("events.Event.from_http")
+def bench_event_from_http():
+    from pybot._vendor.slack.events import Event
+    from tests.data.events import TEAM_JOIN
+
+    return lambda: Event.from_http(TEAM_JOIN, verification_token="supersecuretoken")
+
+
+@benchmark("actions.Action.from_http")
+def bench_action_from_http():
+    from pybot._vendor.slack.actions import Action
+    from tests.data.blocks import BlockActionPayload
+
+    payload = {"payload": BlockActionPayload.MENTOR_REQUEST_SUBMIT.value}
+    return lambda: Action.from_http(payload, verification_token="supersecuretoken")
+
+
+# Sansio
+
+
+@benchmark("sansio.prepare_request.json")
+def bench_prepare_request_json():
+    from pybot._vendor.slack import methods, sansio
+    from pybot.endpoints.slack.utils.event_utils import build_messages
+
+    message = build_messages("U000AA000")[1]
+    return lambda: sansio.prepare_request(
+        methods.CHAT_POST_MESSAGE, message, None, {}, "xoxb-token"
+    )
+
+
+@benchmark("sansio.prepare_request.form")
+def bench_prepare_request_form():
+    from pybot._vendor.slack import methods, sansio
+
+    return lambda: sansio.prepare_request(
+        methods.USERS_INFO, {"user": "U000AA000"}, None, {}, "xoxb-token"
+    )
+
+
+@benchmark("sansio.decode_response")
+def bench_decode_response():
+    from pybot._vendor.slack import sansio
+
+    body = json.dumps(
+        {
+            "ok": True,
+            "channel": "C00000A00",
+            "ts": "1540497949.000100",
+            "message": {"type": "message", "text": "hello " * 50, "ts": "1540497949.000100"},
+        }
+    ).encode()
+    headers = {"content-type": "application/json; charset=utf-8"}
+    return lambda: sansio.decode_response(200, headers, body)
+
+
+@benchmark("sansio.validate_request_signature")
+def bench_validate_request_signature():
+    from pybot._vendor.slack import sansio
+    from tests.data.blocks import BlockActionPayload
+
+    secret = "8f742231b10e8888abcd99yyyzzz85a5"
+    body = f"payload={BlockActionPayload.MENTOR_REQUEST_SUBMIT.value}"
+    timestamp = str(int(time.time()))
+    signature = hmac.new(
+        secret.encode(), f"v0:{timestamp}:{body}".encode(), hashlib.sha256
+    ).hexdigest()
+    headers = {"X-Slack-Request-Timestamp": timestamp, "X-Slack-Signature": f"v0={signature}"}
+    return lambda: sansio.validate_request_signature(body, headers, secret)
+
+
+# Templates and models
+
+
+@benchmark("templates.mentor_request_blocks")
+def bench_mentor_request_blocks():
+    from pybot.endpoints.slack.message_templates.commands import mentor_request_blocks
+
+    services = [f"Service {i}" for i in range(10)]
+    skillsets = [f"Skillset {i}" for i in range(60)]
+    return lambda: mentor_request_blocks(services, skillsets)
+
+
+@benchmark("templates.build_messages")
+def bench_build_messages():
+    from pybot.endpoints.slack.utils.event_utils import build_messages
+
+    return lambda: build_messages("U000AA000")
+
+
+@benchmark("templates.claim_update")
+def bench_claim_update():
+    from pybot._vendor.slack import methods, sansio
+    from pybot.endpoints.slack.utils.action_messages import claimed_attachment
+
+    def claim():
+        message = {
+            "text": "<@U000AA000> sent report: spam",
+            "channel": "C000AA000",
+            "ts": "1700000000.000100",
+            "attachments": [{"text": "Report", "callback_id": "report"}],
+        }
+        message["attachments"].append(claimed_attachment("U000AA001"))
+        return sansio.prepare_request(methods.CHAT_UPDATE, message, None, {}, "xoxb-token")
+
+    return claim
+
+
+@benchmark("templates.repeat")
+def bench_repeat():
+    from pybot.endpoints.slack.utils.command_utils import get_slash_repeat_response
+    from pybot.endpoints.slack.utils.slash_repeat import catalog
+
+    # Only the lookup and the rendering
+    catalog.check_interval = float("inf")
+    return lambda: get_slash_repeat_response("U000AA000", "C000AA000", "resources")
+
+
+@benchmark("models.MentorRequest.properties")
+def bench_mentor_request_properties():
+    from pybot.endpoints.slack.message_templates.mentor_request import MentorRequest
+    from tests.data.blocks import make_mentor_request_action
+
+    request = MentorRequest(
+        make_mentor_request_action(
+            service="Resume Review",
+            skillsets=["Python", "AWS", "JavaScript"],
+            details="Need help with my resume",
+            affiliation="veteran",
+        )
+    )
+
+    def access():
+        return (
+            request.service,
+            request.skillsets,
+            request.details,
+            request.affiliation,
+            request.validate_self(),
+        )
+
+    return access
+
+
+def measure(func: Callable[[], Any], repeat: int = 5, number: int | None = None) -> dict:
+    """
+    Time `func`, in nanoseconds per call.
+
+    Args:
+        func: Zero-argument callable to time.
+        repeat: Number of timing rounds.
+        number: Calls per round, by default enough for a round to last at least 0.2s.
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+
+    per_call = [t / number * 1e9 for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_ns": round(min(per_call), 1),
+        "median_ns": round(statistics.median(per_call), 1),
+        "stdev_ns": round(statistics.stdev(per_call), 1) if repeat > 1 else 0.0,
+    }
+
+
+def run(
+    names: list[str] | None = None, repeat: int = 5, number: int | None = None
+) -> dict[str, Any]:
+    """Run the benchmarks whose name contains one of `names` (all by default)."""
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if names and not any(n in name for n in names):
+            continue
+        results[name] = measure(setup(), repeat=repeat, number=number)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "date": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], threshold: float = DEFAULT_THRESHOLD
+) -> dict[str, dict[str, Any]]:
+    """
+    Compare two :func:`run` results on their fastest round.
+
+    Returns:
+        By benchmark name, the ``ratio`` to the baseline and a ``status``: ``regression`` when
+        slower by more than `threshold`, ``improvement`` when faster by as much, ``ok``
+        otherwise, or ``new`` without a baseline.
+    """
+    comparison = {}
+    for name, timing in results["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base:
+            comparison[name] = {"ratio": None, "status": "new"}
+            continue
+
+        ratio = timing["min_ns"] / base["min_ns"]
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+        comparison[name] = {"ratio": round(ratio, 3), "status": status}
+
+    return comparison
+
+
+def format_results(results: dict[str, Any], comparison: dict[str, dict] | None = None) -> str:
+    """Human readable table of a :func:`run` result, with its baseline comparison if any."""
+    lines = [f"{'benchmark':<48} {'min':>12} {'median':>12}  {'vs baseline':>14}"]
+    for name, timing in results["benchmarks"].items():
+        line = (
+            f"{name:<48} {_format_ns(timing['min_ns']):>12} {_format_ns(timing['median_ns']):>12}"
+        )
+        if comparison and name in comparison:
+            ratio, status = comparison[name]["ratio"], comparison[name]["status"]
+            line += f"  {f'{ratio:.2f}x ' if ratio else ''}{status:>11}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    elif ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run the benchmarks, optionally saving them and comparing them to a baseline.
+
+    Exits with status 1 when a benchmark is slower than the baseline by more than the threshold.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run the routing, sansio and template microbenchmarks"
+    )
+    parser.add_argument(
+        "names", nargs="*", help="Only run benchmarks whose name contains one of these values"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timing rounds per benchmark (default: 5)"
+    )
+    parser.add_argument("--output", help="Save the results as JSON to this file")
+    parser.add_argument("--baseline", help="Results file to compare against, exits 1 on regression")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Slowdown ratio flagged as a regression (default: 0.10)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    # Keep the handler registration logs out of the results
+    logging.basicConfig(level=logging.WARNING)
+
+    results = run(args.names, repeat=args.repeat)
+    if not results["benchmarks"]:
+        sys.exit(f"No benchmark matching {args.names}")
+
+    comparison = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            comparison = compare(results, json.load(f), args.threshold)
+        results["comparison"] = comparison
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    print(json.dumps(results, indent=2) if args.json else format_results(results, comparison))
+
+    regressions = [name for name, c in (comparison or {}).items() if c["status"] == "regression"]
+    if regressions:
+        sys.exit(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,11 +24,7 @@ def action(request):
 
 @pytest.fixture
 async def bot() -> SirBot:
-    import aiohttp
-
     b = SirBot()
-    # Manually create session for testing (normally done on startup)
-    b["http_session"] = aiohttp.ClientSession()
 
     slack = SlackPlugin(
         token="token",
@@ -54,8 +50,8 @@ async def bot() -> SirBot:
 
     yield b
 
-    # Cleanup session
-    await b["http_session"].close()
+    # Cleanup sessions
+    await b.http_clients.close()
 
 
 @pytest.fixture
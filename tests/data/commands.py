@@ -0,0 +1,20 @@
+RESPONSE_URL = "https://hooks.slack.com/commands/T000AAA0A/123/abc"
+
+
+def make_command(
+    command: str,
+    text: str = "",
+    user_id: str = "U123TEST",
+    response_url: str = RESPONSE_URL,
+) -> dict:
+    """Create a slash command form payload."""
+    return {
+        "token": "supersecuretoken",
+        "team_id": "T000AAA0A",
+        "command": command,
+        "text": text,
+        "user_id": user_id,
+        "user_name": "testuser",
+        "channel_id": "C123",
+        "response_url": response_url,
+    }
@@ -5,11 +5,14 @@ Covers: mentor_request webhook handler, utility functions for creating messages,
         finding mentors, and posting to Slack.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from pybot._vendor.sirbot import SirBot
+from pybot._vendor.sirbot.plugins.slack.spool import OutboundSpool
+from pybot._vendor.sirbot.state import MemoryBackend
 from pybot.endpoints.airtable.requests import mentor_request
 from pybot.endpoints.airtable.utils import (
     _create_messages,
@@ -18,6 +21,8 @@ from pybot.endpoints.airtable.utils import (
     _post_messages,
     _slack_user_id_from_email,
 )
+from pybot.plugins.airtable.deliveries import Deliveries
+from pybot.plugins.airtable.records import Mentor
 from tests.data.blocks import ZAPIER_MENTOR_REQUEST, ZAPIER_MENTOR_REQUEST_WITH_MENTOR
 from tests.fixtures import AirtableMock, SlackMock
 
@@ -127,7 +132,7 @@ class TestGetRequestedMentor:
         """Returns None when mentor record is empty."""
         slack_mock = AsyncMock()
         airtable_mock = AsyncMock()
-        airtable_mock.get_row_from_record_id.return_value = {}
+        airtable_mock.get_record.return_value = None
 
         result = await _get_requested_mentor("recMENTOR001", slack_mock, airtable_mock)
 
@@ -137,7 +142,7 @@ class TestGetRequestedMentor:
         """Returns None when mentor record has no email."""
         slack_mock = AsyncMock()
         airtable_mock = AsyncMock()
-        airtable_mock.get_row_from_record_id.return_value = {"Name": "John Mentor"}
+        airtable_mock.get_record.return_value = Mentor(id="recMENTOR001", name="John Mentor")
 
         result = await _get_requested_mentor("recMENTOR001", slack_mock, airtable_mock)
 
@@ -149,10 +154,9 @@ class TestGetRequestedMentor:
         slack_mock.query.return_value = {"user": {"id": "U123MENTOR"}}
 
         airtable_mock = AsyncMock()
-        airtable_mock.get_row_from_record_id.return_value = {
-            "Name": "Jane Mentor",
-            "Email": "mentor@example.com",
-        }
+        airtable_mock.get_record.return_value = Mentor(
+            id="recMENTOR001", name="Jane Mentor", email="mentor@example.com"
+        )
 
         result = await _get_requested_mentor("recMENTOR001", slack_mock, airtable_mock)
 
@@ -230,8 +234,8 @@ class TestGetMatchingSkillsetMentors:
 
         airtable_mock = AsyncMock()
         airtable_mock.find_mentors_with_matching_skillsets.return_value = [
-            {"Email": "mentor1@example.com", "Slack Name": "mentor1"},
-            {"Email": "mentor2@example.com", "Slack Name": "mentor2"},
+            Mentor(id="rec1", email="mentor1@example.com", slack_name="mentor1"),
+            Mentor(id="rec2", email="mentor2@example.com", slack_name="mentor2"),
         ]
 
         result = await _get_matching_skillset_mentors("Python", slack_mock, airtable_mock)
@@ -245,7 +249,7 @@ class TestGetMatchingSkillsetMentors:
         slack_mock = AsyncMock()
         airtable_mock = AsyncMock()
         airtable_mock.find_mentors_with_matching_skillsets.return_value = [
-            {"Slack Name": "johndoe"},  # No email
+            Mentor(id="rec1", slack_name="johndoe"),  # No email
         ]
 
         result = await _get_matching_skillset_mentors("Python", slack_mock, airtable_mock)
@@ -328,3 +332,86 @@ class TestPostMessages:
 
         # Should have posted messages (1 parent + 2 children in thread)
         slack_mock.assert_called_with_method("chat.postMessage", times=3)
+
+    async def test_spooled_children_are_threaded(
+        self, bot: SirBot, slack_mock: SlackMock, tmp_path
+    ):
+        """With the outbound spool, children are sent after and threaded to the parent."""
+        slack = bot.plugins["slack"]
+        slack.spool = OutboundSpool(str(tmp_path / "spool.db"))
+        await slack.spool.start(slack.api)
+        slack_mock.setup_method_response("chat.postMessage", {"ts": "123456.789"})
+
+        parent = {"text": "Parent message", "channel": "C123"}
+        children = [{"text": "Child 1", "channel": "C123"}, {"text": "Child 2", "channel": "C123"}]
+        await _post_messages(parent, children, bot)
+
+        async with asyncio.timeout(1):
+            while slack.spool.stats["sent"] < 3:
+                await asyncio.sleep(0.005)
+        await slack.spool.stop()
+
+        calls = slack_mock.get_calls("chat.postMessage")
+        assert [data["text"] for _, data in calls] == ["Parent message", "Child 1", "Child 2"]
+        assert [data.get("thread_ts") for _, data in calls] == [None, "123456.789", "123456.789"]
+
+
+class TestWebhookDeliveries:
+    """Tests for the deduplication of the webhooks retried by Zapier."""
+
+    async def test_duplicate_deliveries_are_ignored(self, bot: SirBot, aiohttp_client):
+        airtable = bot.plugins["airtable"]
+        release = asyncio.Event()
+        handled = []
+
+        async def handler(request, app):
+            handled.append(request["record"])
+            await release.wait()
+            if request["record"] == "recFAILED":
+                raise RuntimeError("Slack is down")
+
+        airtable.on_request("mentor_request", handler)
+        client = await aiohttp_client(bot)
+
+        async def deliver(record):
+            payload = {
+                **ZAPIER_MENTOR_REQUEST,
+                "record": record,
+                "type": "mentor_request",
+                "token": airtable.verify,
+            }
+            response = await client.post("/airtable/request", json=payload)
+            assert response.status == 200
+
+        await deliver("recABC123")
+        await deliver("recFAILED")
+        await deliver("recABC123")
+        release.set()
+        await asyncio.sleep(0.01)
+        await deliver("recABC123")
+        await deliver("recFAILED")
+
+        assert handled == ["recABC123", "recFAILED", "recFAILED"]
+        response = await client.get("/airtable/deliveries")
+        assert await response.json() == {
+            "backend": "memory",
+            "processed": 1,
+            "failed": 2,
+            "duplicates": 1,
+            "in_flight_duplicates": 1,
+        }
+
+    async def test_deliveries_are_claimed_in_the_shared_state(self):
+        state = MemoryBackend()
+        worker, other_worker = Deliveries(state), Deliveries(state)
+
+        assert await worker.begin("mentor_request", "recABC123")
+        assert not await other_worker.begin("mentor_request", "recABC123")
+        await worker.finish("mentor_request", "recABC123", ok=False)
+        assert await other_worker.begin("mentor_request", "recABC123")
+        await other_worker.finish("mentor_request", "recABC123", ok=True)
+        assert not await worker.begin("mentor_request", "recABC123")
+
+        assert await state.get("airtable:delivery:mentor_request:recABC123") == "done"
+        assert worker.stats["duplicates"] == 1
+        assert other_worker.stats["in_flight_duplicates"] == 1
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from pybot._vendor.sirbot import SirBot
+from pybot.plugins.api.request import AdminApiRequest
+
+AUTH_HEADER = {"Authorization": "Bearer adminToken"}
+
+
+@pytest.fixture(autouse=True)
+def admin_token(monkeypatch):
+    monkeypatch.setattr(AdminApiRequest, "auth_tokens", {"adminToken"})
+
+
+@pytest.mark.parametrize(
+    "headers, status",
+    [
+        (AUTH_HEADER, 200),
+        ({"Authorization": "Bearer devBackendToken"}, 401),
+        (None, 401),
+    ],
+)
+async def test_detect_credentials(bot: SirBot, aiohttp_client, headers, status):
+    client = await aiohttp_client(bot)
+
+    res = await client.get("/pybot/api/v1/admin/stalls", headers=headers)
+
+    assert res.status == status
+
+
+async def test_admin_api_disabled_without_token(bot: SirBot, aiohttp_client, monkeypatch):
+    monkeypatch.setattr(AdminApiRequest, "auth_tokens", set())
+    client = await aiohttp_client(bot)
+
+    res = await client.get("/pybot/api/v1/admin/stalls", headers=AUTH_HEADER)
+
+    assert res.status == 401
+
+
+async def test_profile_returns_collapsed_stacks(bot: SirBot, aiohttp_client):
+    client = await aiohttp_client(bot)
+
+    res = await client.get("/pybot/api/v1/admin/profile?seconds=0.05", headers=AUTH_HEADER)
+    stacks = await res.text()
+
+    assert res.status == 200
+    assert stacks
+    for line in stacks.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack
+        assert int(count) > 0
+
+
+@pytest.mark.parametrize("seconds", ["abc", "0", "61"])
+async def test_profile_rejects_invalid_durations(bot: SirBot, aiohttp_client, seconds):
+    client = await aiohttp_client(bot)
+
+    res = await client.get(f"/pybot/api/v1/admin/profile?seconds={seconds}", headers=AUTH_HEADER)
+    body = json.loads(await res.text())
+
+    assert "error" in body
+
+
+async def test_stalls_reports_the_detector(bot: SirBot, aiohttp_client):
+    client = await aiohttp_client(bot)
+
+    res = await client.get("/pybot/api/v1/admin/stalls", headers=AUTH_HEADER)
+    body = json.loads(await res.text())
+
+    assert body["detected"] == 0
+    assert body["stalls"] == []
@@ -1,9 +1,14 @@
+import asyncio
 import json
+from types import SimpleNamespace
 from unittest.mock import AsyncMock as CoroutineMock
 
+import aiohttp
 import pytest
 
 from pybot._vendor.sirbot import SirBot
+from pybot._vendor.slack.exceptions import RateLimited, SlackAPIError
+from pybot.endpoints.api import slack_api
 
 MOCK_USER_NAME = "userName"
 MOCK_USER_ID = "U8N6XBL7Q"
@@ -42,3 +47,144 @@ async def test_verify_returns_correct_success_params(bot: SirBot, aiohttp_client
     assert body["exists"] is True
     assert body["id"] == MOCK_USER_ID
     assert body["displayName"] == MOCK_USER_NAME
+
+
+def _lookup_by_email(calls):
+    async def query(url, data):
+        calls.append(data["email"])
+        if data["email"].startswith("missing"):
+            raise SlackAPIError("users_not_found", {}, {"ok": False})
+        if data["email"].startswith("limited") and calls.count(data["email"]) == 1:
+            raise RateLimited(0, "ratelimited", 429, {}, {"ok": False})
+        name = data["email"].split("@")[0]
+        return {"user": {"id": f"U{name.upper()}", "name": name}}
+
+    return query
+
+
+async def test_bulk_verify_streams_distinct_emails(bot: SirBot, aiohttp_client):
+    calls = []
+    bot.plugins["slack"].api.query = _lookup_by_email(calls)
+    bot.plugins["api"].known_users.set("known@test.test", {"id": "UKNOWN", "name": "known"})
+    client = await aiohttp_client(bot)
+    emails = ["a@test.test", "A@test.test ", "missing@test.test", "known@test.test", "limited@x.y"]
+
+    res = await client.post(
+        "/pybot/api/v1/slack/bulk_verify", json={"emails": emails}, headers=AUTH_HEADER
+    )
+    lines = [json.loads(line) for line in (await res.text()).splitlines()]
+
+    assert res.headers["Content-Type"] == "application/x-ndjson"
+    assert lines[0] == {
+        "email": "known@test.test",
+        "exists": True,
+        "id": "UKNOWN",
+        "displayName": "known",
+    }
+    assert {line["email"]: line["exists"] for line in lines} == {
+        "known@test.test": True,
+        "a@test.test": True,
+        "missing@test.test": False,
+        "limited@x.y": True,
+    }
+    assert sorted(calls) == ["a@test.test", "limited@x.y", "limited@x.y", "missing@test.test"]
+
+    # Found users are cached, for the single verification too
+    res = await client.get("/pybot/api/v1/slack/verify?email=A@test.test", headers=AUTH_HEADER)
+    assert json.loads(await res.text())["id"] == "UA"
+    assert len(calls) == 4
+
+
+async def test_bulk_verify_requires_a_list(bot: SirBot, aiohttp_client):
+    client = await aiohttp_client(bot)
+
+    res = await client.post(
+        "/pybot/api/v1/slack/bulk_verify", json={"emails": "a@test.test"}, headers=AUTH_HEADER
+    )
+
+    assert json.loads(await res.text()) == {"error": "Must contain `emails` JSON list"}
+
+
+async def test_bulk_verify_answers_every_email_despite_errors(bot: SirBot, aiohttp_client):
+    async def query(url, data):
+        if data["email"].startswith("odd"):
+            return {"ok": True}
+        return {"user": {"id": "UA", "name": "a"}}
+
+    bot.plugins["slack"].api.query = query
+    client = await aiohttp_client(bot)
+
+    res = await client.post(
+        "/pybot/api/v1/slack/bulk_verify",
+        json={"emails": ["odd@test.test", "a@test.test"]},
+        headers=AUTH_HEADER,
+    )
+    lines = [json.loads(line) for line in (await res.text()).splitlines()]
+
+    assert sorted(lines, key=lambda line: line["email"]) == [
+        {"email": "a@test.test", "exists": True, "id": "UA", "displayName": "a"},
+        {"email": "odd@test.test", "error": "KeyError"},
+    ]
+
+
+async def test_bulk_verify_stopped_batch_ends_with_an_error(
+    bot: SirBot, aiohttp_client, monkeypatch
+):
+    async def query(url, data):
+        if data["email"].startswith("slow"):
+            await asyncio.sleep(10)
+        return {"user": {"id": "UA", "name": "a"}}
+
+    monkeypatch.setattr(slack_api, "BULK_VERIFY_TIMEOUT", 0.1)
+    bot.plugins["slack"].api.query = query
+    client = await aiohttp_client(bot)
+
+    res = await client.post(
+        "/pybot/api/v1/slack/bulk_verify",
+        json={"emails": ["a@test.test", "slow@test.test"]},
+        headers=AUTH_HEADER,
+    )
+    lines = [json.loads(line) for line in (await res.text()).splitlines()]
+
+    assert res.status == 200
+    assert lines == [
+        {"email": "a@test.test", "exists": True, "id": "UA", "displayName": "a"},
+        {"error": "timeout"},
+    ]
+
+
+async def test_bulk_verify_past_its_deadline_keeps_the_stream(bot: SirBot, aiohttp_client):
+    async def query(url, data):
+        if data["email"].startswith("slow"):
+            await asyncio.sleep(10)
+        return {"user": {"id": "UA", "name": "a"}}
+
+    bot.plugins["slack"].api.query = query
+    for _, configuration in (
+        bot.plugins["api"].routers["slack"].dispatch(SimpleNamespace(resource="bulk_verify"))
+    ):
+        configuration["deadline"] = 0.1
+    client = await aiohttp_client(bot)
+
+    res = await client.post(
+        "/pybot/api/v1/slack/bulk_verify",
+        json={"emails": ["a@test.test", "slow@test.test"]},
+        headers=AUTH_HEADER,
+        timeout=aiohttp.ClientTimeout(total=5),
+    )
+
+    assert res.status == 200
+    assert [json.loads(line) for line in (await res.text()).splitlines()] == [
+        {"email": "a@test.test", "exists": True, "id": "UA", "displayName": "a"}
+    ]
+
+
+async def test_bulk_verify_is_limited(bot: SirBot, aiohttp_client):
+    client = await aiohttp_client(bot)
+    emails = [f"{i}@test.test" for i in range(slack_api.BULK_VERIFY_LIMIT + 1)]
+
+    res = await client.post(
+        "/pybot/api/v1/slack/bulk_verify", json={"emails": emails}, headers=AUTH_HEADER
+    )
+
+    assert "error" in json.loads(await res.text())
@@ -22,6 +22,8 @@ from pybot.endpoints.slack.actions.mentor_request import (
     set_group,
     set_requested_service,
 )
+from pybot.endpoints.slack.message_templates.commands import mentor_request_blocks
+from pybot.plugins.airtable.records import Mentor
 from tests.data.blocks import (
     make_claim_mentee_action,
     make_mentor_details_dialog_submission,
@@ -267,6 +269,27 @@ class TestMentorDetailsDialog:
 
         slack_mock.assert_called_with_method("chat.update")
 
+    async def test_submit_details_uses_the_recorded_form(self, bot: SirBot, slack_mock: SlackMock):
+        """The form rendered by the bot is reused instead of being fetched back."""
+        action = make_mentor_details_dialog_submission(
+            channel_id="C123", ts="123456.789", details="My updated detailed request"
+        )
+        await bot["plugins"]["slack"].messages.set(
+            "C123", "123456.789", make_mentor_request_action()["message"]
+        )
+
+        await mentor_details_submit(action, bot)
+
+        slack_mock.assert_called_with_method("conversations.history", times=0)
+        slack_mock.assert_called_with_method("chat.update")
+
+    async def test_only_the_form_is_recorded(self, bot: SirBot):
+        """The form is the only message of the bot read back."""
+        messages = bot["plugins"]["slack"].messages
+
+        assert messages.recorded({"blocks": mentor_request_blocks(["Resume Review"], ["Python"])})
+        assert not messages.recorded({"blocks": [{"type": "section", "block_id": "submission"}]})
+
 
 class TestClaimMentee:
     """Tests for claim_mentee handler."""
@@ -290,8 +313,9 @@ class TestClaimMentee:
 
         await claim_mentee(action, bot)
 
-        # Should have updated the request with the mentor
-        assert len(airtable_mock._update_history) > 0
+        # Should have updated the request with the mentor, found by email
+        assert airtable_mock._update_history == [("recREQ001", "recMENTOR001")]
+        airtable_mock.api.find.assert_called_once_with(Mentor, "Email", "mentor@example.com")
 
     async def test_claim_shows_warning_when_no_email(
         self, bot: SirBot, slack_mock: SlackMock, airtable_mock: AirtableMock
@@ -23,7 +23,7 @@ async def create_mocks(aiohttp_client, bot):
     slack_mock = CoroutineMock(return_value={"user": {"profile": {"email": "email@email.com"}}})
     airtable_mock = CoroutineMock(return_value="U123")
     bot["plugins"]["slack"].api.query = slack_mock
-    bot["plugins"]["airtable"].api.find_records = CoroutineMock(return_value=[])
+    bot["plugins"]["airtable"].api.find = CoroutineMock(return_value=[])
     bot["plugins"]["airtable"].api.update_request = airtable_mock
     bot["plugins"]["airtable"].api.get_name_from_record_id = airtable_mock
     bot["plugins"]["airtable"].api.get_row_from_record_id = airtable_mock
@@ -12,12 +12,16 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from pybot import endpoints
+from pybot._vendor.sirbot.breakers import CircuitOpenError
+from pybot._vendor.slack import methods
 from pybot._vendor.slack.events import Event
+from pybot._vendor.slack.exceptions import HTTPException, RateLimited, SlackAPIError
 from pybot.endpoints.slack.events import team_join
 from pybot.endpoints.slack.utils.event_utils import (
     build_messages,
     get_backend_auth_headers,
     link_backend_user,
+    schedule_team_join_messages,
     send_community_notification,
     send_user_greetings,
 )
@@ -215,3 +219,116 @@ class TestGetBackendAuthHeaders:
 
         assert "Authorization" in result
         assert "Bearer" in result["Authorization"]
+
+
+class TestScheduledTeamJoin:
+    """Tests for the chat.scheduleMessage onboarding mode."""
+
+    @staticmethod
+    def _slack_api(fail_on: str | None = None, error: Exception | None = None):
+        async def query(url, data=None):
+            if fail_on and fail_on in url.value.url:
+                raise error or SlackAPIError("missing_scope", {}, {})
+            if url == methods.CONVERSATIONS_OPEN:
+                return {"ok": True, "channel": {"id": "D123NEW"}}
+            return {"ok": True}
+
+        slack_api = MagicMock()
+        slack_api.query = AsyncMock(side_effect=query)
+        return slack_api
+
+    async def test_schedule_team_join_messages_schedules_everything(self):
+        """All messages are scheduled in order and none are left to send."""
+        slack_api = self._slack_api()
+        *user_messages, community, outreach = build_messages("U123TEST")
+
+        remaining = await schedule_team_join_messages(
+            "U123TEST", user_messages, [community, outreach], slack_api, 30
+        )
+
+        assert remaining == ([], [])
+        scheduled = [
+            call.args[1]
+            for call in slack_api.query.call_args_list
+            if call.args[0] == methods.CHAT_SCHEDULE_MESSAGE
+        ]
+        assert len(scheduled) == 5
+        assert [m["channel"] for m in scheduled[:3]] == ["D123NEW"] * 3
+        post_ats = [m["post_at"] for m in scheduled[:3]]
+        assert post_ats == sorted(post_ats)
+
+    async def test_schedule_failure_returns_unscheduled_messages(self):
+        """Messages Slack refuses to schedule are returned for in-process delivery."""
+        slack_api = self._slack_api(fail_on="chat.scheduleMessage")
+        *user_messages, community, outreach = build_messages("U123TEST")
+
+        remaining_user, remaining_community = await schedule_team_join_messages(
+            "U123TEST", user_messages, [community, outreach], slack_api, 30
+        )
+
+        assert remaining_user == user_messages
+        assert remaining_community == [community, outreach]
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            RateLimited(30, "ratelimited", 429, {}, {}),
+            HTTPException(503, {}, {}),
+            CircuitOpenError("slack", 30),
+            TimeoutError(),
+        ],
+    )
+    async def test_unreachable_slack_returns_unscheduled_messages(self, error):
+        """Rate limits and unreachable Slack fall back to in-process delivery too."""
+        slack_api = self._slack_api(fail_on="conversations.open", error=error)
+        *user_messages, community, outreach = build_messages("U123TEST")
+
+        remaining_user, remaining_community = await schedule_team_join_messages(
+            "U123TEST", user_messages, [community, outreach], slack_api, 30
+        )
+
+        assert remaining_user == user_messages
+        assert remaining_community == []
+
+    async def test_team_join_scheduled_does_not_sleep(self, bot):
+        """With scheduling enabled team_join returns without parking a sleep."""
+        event = Event.from_http(TEAM_JOIN, verification_token="supersecuretoken")
+        bot.plugins["slack"].api = self._slack_api()
+
+        with (
+            patch("pybot.endpoints.slack.events.TEAM_JOIN_SCHEDULE", True),
+            patch("pybot.endpoints.slack.events.asyncio.sleep", new_callable=AsyncMock) as sleep,
+            patch(
+                "pybot.endpoints.slack.events.get_backend_auth_headers",
+                new_callable=AsyncMock,
+                return_value={},
+            ),
+        ):
+            await team_join(event, bot)
+
+        sleep.assert_not_called()
+
+    async def test_team_join_falls_back_to_delay(self, bot):
+        """When scheduling fails the messages are posted after the in-process delay."""
+        event = Event.from_http(TEAM_JOIN, verification_token="supersecuretoken")
+        slack_api = self._slack_api(fail_on="chat.scheduleMessage")
+        bot.plugins["slack"].api = slack_api
+
+        with (
+            patch("pybot.endpoints.slack.events.TEAM_JOIN_SCHEDULE", True),
+            patch("pybot.endpoints.slack.events.asyncio.sleep", new_callable=AsyncMock) as sleep,
+            patch(
+                "pybot.endpoints.slack.events.get_backend_auth_headers",
+                new_callable=AsyncMock,
+                return_value={},
+            ),
+        ):
+            await team_join(event, bot)
+
+        sleep.assert_called_once_with(30)
+        posted = [
+            call
+            for call in slack_api.query.call_args_list
+            if call.kwargs.get("url") == methods.CHAT_POST_MESSAGE
+        ]
+        assert len(posted) == 5
@@ -0,0 +1,143 @@
+"""
+Tests for slash command endpoints.
+
+Covers: inline command responses, response_url fallback for slow handlers,
+        /roll and /repeat replies, the /mentor form.
+"""
+
+import asyncio
+import json
+
+from pybot._vendor.sirbot import SirBot
+from pybot.endpoints.slack.utils.slash_lunch import LunchCommand
+from pybot.plugins.airtable.records import Service, Skillset
+from tests.data.commands import RESPONSE_URL, make_command
+from tests.fixtures import AirtableMock, SlackMock
+
+
+class TestInlineCommands:
+    """Inline handlers answer the command in the HTTP response."""
+
+    async def test_roll_is_answered_inline(
+        self, bot: SirBot, aiohttp_client, slack_mock: SlackMock
+    ):
+        client = await aiohttp_client(bot)
+
+        res = await client.post("/slack/commands", data=make_command("/roll", "2d6"))
+        body = await res.json()
+
+        assert res.status == 200
+        assert body["response_type"] == "in_channel"
+        assert "<@U123TEST> Rolled 2 D6" in body["text"]
+        assert slack_mock.get_calls() == []
+
+    async def test_roll_invalid_input_is_ephemeral(
+        self, bot: SirBot, aiohttp_client, slack_mock: SlackMock
+    ):
+        client = await aiohttp_client(bot)
+
+        res = await client.post("/slack/commands", data=make_command("/roll", "abc"))
+        body = await res.json()
+
+        assert body["response_type"] == "ephemeral"
+        assert "didn't understand" in body["text"]
+
+    async def test_repeat_is_answered_inline(
+        self, bot: SirBot, aiohttp_client, slack_mock: SlackMock
+    ):
+        client = await aiohttp_client(bot)
+
+        res = await client.post("/slack/commands", data=make_command("/repeat", "ask"))
+        body = await res.json()
+
+        assert body["response_type"] == "in_channel"
+        assert body["attachments"][0]["title"] == "Asking Questions"
+        assert "channel" not in body
+
+    async def test_repeat_unknown_option_is_ephemeral(
+        self, bot: SirBot, aiohttp_client, slack_mock: SlackMock
+    ):
+        client = await aiohttp_client(bot)
+
+        res = await client.post("/slack/commands", data=make_command("/repeat", "nope"))
+        body = await res.json()
+
+        assert body["response_type"] == "ephemeral"
+        assert "not a valid option" in body["text"]
+
+    async def test_lunch_failure_is_answered_with_text_only(
+        self, bot: SirBot, aiohttp_client, slack_mock: SlackMock, monkeypatch, unused_tcp_port
+    ):
+        url = f"http://127.0.0.1:{unused_tcp_port}/businesses/search"
+        monkeypatch.setattr(LunchCommand, "get_yelp_request", lambda self: {"url": url})
+        client = await aiohttp_client(bot)
+
+        res = await client.post("/slack/commands", data=make_command("/lunch", "80020"))
+
+        assert await res.json() == {
+            "response_type": "ephemeral",
+            "text": "Sorry, I couldn't connect to Yelp. Please try again later.",
+        }
+
+
+class TestResponseUrlFallback:
+    """Inline handlers missing the deadline are delivered to the response_url."""
+
+    async def test_slow_handler_posts_to_response_url(
+        self, bot: SirBot, aiohttp_client, slack_mock: SlackMock
+    ):
+        done = asyncio.Event()
+
+        async def slow(command, app):
+            await asyncio.sleep(0.05)
+            done.set()
+            return {"text": "slow answer"}
+
+        slack = bot.plugins["slack"]
+        slack.command_deadline = 0.01
+        slack.on_command("/slow", slow, inline=True)
+        client = await aiohttp_client(bot)
+
+        res = await client.post("/slack/commands", data=make_command("/slow"))
+
+        assert res.status == 200
+        assert await res.text() == ""
+
+        await asyncio.wait_for(done.wait(), timeout=1)
+        await asyncio.sleep(0)
+
+        calls = slack_mock.get_calls(RESPONSE_URL)
+        assert calls == [(RESPONSE_URL, {"text": "slow answer"})]
+
+    async def test_handler_returning_nothing_is_acknowledged(
+        self, bot: SirBot, aiohttp_client, slack_mock: SlackMock
+    ):
+        async def silent(command, app):
+            return None
+
+        bot.plugins["slack"].on_command("/silent", silent, inline=True)
+        client = await aiohttp_client(bot)
+
+        res = await client.post("/slack/commands", data=make_command("/silent"))
+
+        assert res.status == 200
+        assert slack_mock.get_calls() == []
+
+
+class TestMentorCommand:
+    async def test_mentor_form_lists_the_services(
+        self, bot: SirBot, aiohttp_client, slack_mock: SlackMock, airtable_mock: AirtableMock
+    ):
+        airtable_mock.setup_service("Resume Review").setup_service("Code Review")
+        client = await aiohttp_client(bot)
+
+        await client.post("/slack/commands", data=make_command("/mentor"))
+        await asyncio.sleep(0.01)
+
+        (_, form), *_ = slack_mock.get_calls("chat.postMessage")
+        assert "Resume Review" in json.dumps(form["blocks"])
+        assert "Code Review" in json.dumps(form["blocks"])
+        assert {call.args[0] for call in airtable_mock.api.list_records.call_args_list} == {
+            Service,
+            Skillset,
+        }
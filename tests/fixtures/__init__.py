@@ -5,6 +5,8 @@ Reusable mock classes for testing Slack and Airtable integrations.
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
+from pybot.plugins.airtable.records import Mentor
+
 
 class SlackMock:
     """
@@ -203,10 +205,13 @@ class AirtableMock:
         self.api.update_request = AsyncMock(side_effect=self._handle_update_request)
         self.api.get_name_from_record_id = AsyncMock(side_effect=self._handle_get_name)
         self.api.get_row_from_record_id = AsyncMock(side_effect=self._handle_get_row)
+        self.api.get_record = AsyncMock(side_effect=self._handle_get_record)
         self.api.find_mentors_with_matching_skillsets = AsyncMock(
             side_effect=self._handle_find_mentors
         )
         self.api.get_all_records = AsyncMock(side_effect=self._handle_get_all_records)
+        self.api.list_records = AsyncMock(side_effect=self._handle_list_records)
+        self.api.find = AsyncMock(side_effect=self._handle_find)
 
     async def _handle_find_records(self, table_name: str, field: str, value: str) -> list[dict]:
         """Handle find_records calls."""
@@ -233,6 +238,19 @@ class AirtableMock:
 
         return []
 
+    async def _handle_find(self, model: type, field: str, value: str) -> list:
+        """Handle find calls."""
+        records = await self._handle_find_records(model.table, field, value)
+        return [model.from_airtable(record) for record in records]
+
+    async def _handle_list_records(self, model: type, formula: str | None = None) -> list:
+        """Handle list_records calls, without filtering."""
+        tables = {"Services": self._services, "Mentors": self._mentors}
+        return [
+            model.from_airtable({"id": record_id, "fields": fields})
+            for record_id, fields in tables.get(model.table, {}).items()
+        ]
+
     async def _handle_add_record(self, table: str, data: dict) -> dict:
         """Handle add_record calls."""
         self._add_record_history.append((table, data))
@@ -264,7 +282,12 @@ class AirtableMock:
             return self._services[record_id]
         return {}
 
-    async def _handle_find_mentors(self, skillsets: str) -> list[dict]:
+    async def _handle_get_record(self, model: type, record_id: str) -> Any:
+        """Handle get_record calls."""
+        fields = await self._handle_get_row(model.table, record_id)
+        return model.from_airtable({"id": record_id, "fields": fields}) if fields else None
+
+    async def _handle_find_mentors(self, skillsets: str) -> list[Mentor]:
         """Handle find_mentors_with_matching_skillsets calls."""
         if not skillsets:
             return []
@@ -272,10 +295,10 @@ class AirtableMock:
         results = []
         requested_skillsets = set(s.strip() for s in skillsets.split(","))
 
-        for mentor in self._mentors.values():
+        for mentor_id, mentor in self._mentors.items():
             mentor_skillsets = set(mentor.get("Skillsets", []))
             if mentor_skillsets & requested_skillsets:
-                results.append(mentor)
+                results.append(Mentor.from_airtable({"id": mentor_id, "fields": mentor}))
 
         return results
 
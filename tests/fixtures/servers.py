@@ -0,0 +1,688 @@
+"""
+Local stand-in servers for the Slack Web API, the Airtable REST API and Redis.
+
+Unlike `SlackMock` and `AirtableMock` these are real servers: the bot talks to them over the
+network through its pooled clients, so they can be used to measure end-to-end behaviour.
+The HTTP servers support configurable latency, error and 429 injection, and pagination.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import re
+import time
+from collections import Counter, defaultdict, deque
+from collections.abc import Callable
+from typing import Any
+
+from aiohttp import web
+
+from pybot._vendor.sirbot.state import INCR_SCRIPT, RELEASE_SCRIPT, RENEW_SCRIPT
+
+
+class FakeServer:
+    """
+    Base class of the stand-in servers.
+
+    Args:
+        latency: Seconds added to every response.
+        jitter: Maximum random seconds added on top of `latency`.
+        error_rate: Probability (0-1) of answering a call with an upstream error.
+        ratelimit_rate: Probability (0-1) of answering a call with a 429.
+        retry_after: `Retry-After` header value of the injected 429 responses.
+        page_size: Default number of items per page of paginated calls.
+        seed: Seed of the random generator, for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        ratelimit_rate: float = 0.0,
+        retry_after: int = 1,
+        page_size: int = 100,
+        seed: int | None = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.ratelimit_rate = ratelimit_rate
+        self.retry_after = retry_after
+        self.page_size = page_size
+
+        self.calls: Counter[str] = Counter()
+        self.history: deque[tuple[str, dict]] = deque(maxlen=1000)
+        self._failures: dict[str, deque[int]] = defaultdict(deque)
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.setup_routes(self.app.router)
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        raise NotImplementedError()
+
+    def call_name(self, request: web.Request) -> str:
+        return request.path
+
+    def error_response(self, name: str, status: int) -> web.Response:
+        return web.json_response({"error": "injected"}, status=status)
+
+    def ratelimited_response(self, name: str) -> web.Response:
+        return web.json_response(
+            {"error": "ratelimited"},
+            status=429,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    def fail(self, name: str, status: int = 500, times: int = 1) -> "FakeServer":
+        """Answer the next `times` calls to `name` with `status`."""
+        self._failures[name].extend([status] * times)
+        return self
+
+    def get_calls(self, name: str = "") -> list[tuple[str, dict]]:
+        """Recorded calls (most recent 1000), optionally filtered by name substring."""
+        return [call for call in self.history if name in call[0]]
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.history.clear()
+        self._failures.clear()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Callable) -> web.StreamResponse:
+        name = self.call_name(request)
+        self.calls[name] += 1
+
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._failures.get(name):
+            status = self._failures[name].popleft()
+            return (
+                self.ratelimited_response(name)
+                if status == 429
+                else self.error_response(name, status)
+            )
+        elif self.ratelimit_rate and self._random.random() < self.ratelimit_rate:
+            return self.ratelimited_response(name)
+        elif self.error_rate and self._random.random() < self.error_rate:
+            return self.error_response(name, 500)
+
+        return await handler(request)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving, on a random free port by default, and return the base URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{bound_port}"
+        return self.url
+
+    async def close(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+
+class FakeSlack(FakeServer):
+    """
+    Stand-in for the Slack Web API (``/api/<method>``) and incoming webhooks (``/hooks/...``).
+
+    Messages posted with ``chat.postMessage`` are kept per channel and returned by
+    ``conversations.history``. Methods without a built-in answer reply ``{"ok": true}``
+    unless a response is set with :meth:`set_response`.
+
+    ``apps.connections.open`` hands out Socket Mode WebSocket URLs (``/socket/<n>``), envelopes
+    are pushed to the connected bot with :meth:`send_envelope`.
+
+    Args:
+        channels: Channel names listed by ``conversations.list``.
+        users: Number of members listed by ``users.list``.
+    """
+
+    def __init__(
+        self,
+        *,
+        channels: list[str] | None = None,
+        users: int = 10,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.channels: list[dict] = []
+        self.add_channels(*(channels or ["general"]))
+        self.users = [self._user(f"U{i:08d}") for i in range(1, users + 1)]
+        self.messages: dict[str, deque[dict]] = defaultdict(lambda: deque(maxlen=100))
+        self._responses: dict[str, Any] = {}
+        self._ts = itertools.count(1)
+        self.sockets: dict[int, web.WebSocketResponse] = {}
+        self._socket_ids = itertools.count(1)
+        self._envelope_ids = itertools.count(1)
+        self._acks: dict[str, asyncio.Future] = {}
+        self.app.on_shutdown.append(self._close_sockets)
+
+        self._builtin = {
+            "apps.connections.open": self._connections_open,
+            "chat.postMessage": self._post_message,
+            "chat.postEphemeral": self._post_message,
+            "chat.update": self._post_message,
+            "chat.scheduleMessage": self._schedule_message,
+            "conversations.history": self._history,
+            "conversations.list": lambda data: self._paginate(self.channels, "channels", data),
+            "conversations.open": self._open,
+            "users.info": lambda data: {"ok": True, "user": self._user(data.get("user", ""))},
+            "users.list": lambda data: self._paginate(self.users, "members", data),
+            "users.lookupByEmail": self._lookup_by_email,
+        }
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        router.add_route("*", "/api/{method}", self._api)
+        router.add_post("/hooks/{path:.*}", self._hook)
+        router.add_get("/socket/{id}", self._socket)
+
+    def call_name(self, request: web.Request) -> str:
+        if request.path.startswith("/hooks/"):
+            return "hooks"
+        elif request.path.startswith("/socket/"):
+            return "socket"
+        return request.match_info.get("method", request.path)
+
+    def error_response(self, name: str, status: int) -> web.Response:
+        return web.json_response({"ok": False, "error": "internal_error"}, status=status)
+
+    def ratelimited_response(self, name: str) -> web.Response:
+        return web.json_response(
+            {"ok": False, "error": "ratelimited"},
+            status=429,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    def add_channels(self, *names: str) -> "FakeSlack":
+        """Add channels to the ``conversations.list`` results."""
+        for name in names:
+            channel_id = f"C{len(self.channels) + 1:08d}"
+            self.channels.append({"id": channel_id, "name": name, "is_archived": False})
+        return self
+
+    def set_response(self, method: str, response: dict | Callable[[dict], dict]) -> "FakeSlack":
+        """Answer `method` with a fixed body, or the result of calling `response` with the data."""
+        self._responses[method] = response
+        return self
+
+    async def wait_connected(self, count: int = 1, timeout: float = 1.0) -> None:
+        """Wait for `count` Socket Mode connections to be open."""
+        async with asyncio.timeout(timeout):
+            while sum(not ws.closed for ws in self.sockets.values()) < count:
+                await asyncio.sleep(0.005)
+
+    async def send_envelope(
+        self, type_: str, payload: dict, envelope_id: str | None = None, timeout: float = 1.0
+    ) -> dict:
+        """
+        Push a Socket Mode envelope to a connected bot, round robin across connections.
+
+        Returns:
+            The acknowledgement sent back by the bot.
+        """
+        await self.wait_connected(timeout=timeout)
+        count = next(self._envelope_ids)
+        envelope_id = envelope_id or f"envelope-{count}"
+        sockets = [ws for ws in self.sockets.values() if not ws.closed]
+        ws = sockets[count % len(sockets)]
+
+        ack = self._acks[envelope_id] = asyncio.get_running_loop().create_future()
+        await ws.send_json(
+            {
+                "envelope_id": envelope_id,
+                "type": type_,
+                "payload": payload,
+                "accepts_response_payload": type_ != "events_api",
+            }
+        )
+        try:
+            async with asyncio.timeout(timeout):
+                return await ack
+        finally:
+            self._acks.pop(envelope_id, None)
+
+    async def disconnect(self, reason: str = "refresh_requested") -> None:
+        """Ask every connected bot to reconnect, like Slack does before recycling a server."""
+        for ws in list(self.sockets.values()):
+            if not ws.closed:
+                await ws.send_json({"type": "disconnect", "reason": reason})
+
+    async def _socket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        socket_id = int(request.match_info["id"])
+        self.sockets[socket_id] = ws
+        await ws.send_json({"type": "hello", "num_connections": len(self.sockets)})
+
+        try:
+            async for message in ws:
+                data = json.loads(message.data)
+                self.history.append(("socket.ack", data))
+                ack = self._acks.get(data.get("envelope_id", ""))
+                if ack and not ack.done():
+                    ack.set_result(data)
+        finally:
+            self.sockets.pop(socket_id, None)
+        return ws
+
+    async def _close_sockets(self, app: web.Application) -> None:
+        for ws in list(self.sockets.values()):
+            await ws.close()
+
+    async def _api(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        data = await _read_body(request)
+        self.history.append((method, data))
+
+        response = self._responses.get(method) or self._builtin.get(method)
+        if callable(response):
+            response = response(data)
+        return web.json_response(response or {"ok": True})
+
+    async def _hook(self, request: web.Request) -> web.Response:
+        self.history.append((request.path, await _read_body(request)))
+        return web.Response(text="ok")
+
+    def _next_ts(self) -> str:
+        return f"{time.time():.0f}.{next(self._ts):06d}"
+
+    def _post_message(self, data: dict) -> dict:
+        channel = data.get("channel", "")
+        message = {**data, "ts": data.get("ts") or self._next_ts(), "type": "message"}
+        self.messages[channel].append(message)
+        return {"ok": True, "channel": channel, "ts": message["ts"], "message": message}
+
+    def _connections_open(self, data: dict) -> dict:
+        url = self.url.replace("http://", "ws://", 1)
+        return {"ok": True, "url": f"{url}/socket/{next(self._socket_ids)}"}
+
+    def _schedule_message(self, data: dict) -> dict:
+        return {
+            "ok": True,
+            "channel": data.get("channel", ""),
+            "scheduled_message_id": f"Q{next(self._ts):08d}",
+            "post_at": data.get("post_at"),
+        }
+
+    def _history(self, data: dict) -> dict:
+        messages = list(reversed(self.messages.get(data.get("channel", ""), ())))
+        if "latest" in data:
+            messages = [m for m in messages if m["ts"] <= data["latest"]]
+        return {"ok": True, "messages": messages[: int(data.get("limit", self.page_size))]}
+
+    def _open(self, data: dict) -> dict:
+        users = data.get("users", "")
+        return {"ok": True, "channel": {"id": f"D{users.split(',')[0][1:]}"}}
+
+    def _lookup_by_email(self, data: dict) -> dict:
+        local = data.get("email", "").split("@")[0]
+        return {"ok": True, "user": self._user(f"U{local.upper()}")}
+
+    def _paginate(self, items: list, key: str, data: dict) -> dict:
+        start = int(data.get("cursor") or 0)
+        end = start + int(data.get("limit") or self.page_size)
+        next_cursor = str(end) if end < len(items) else ""
+        return {
+            "ok": True,
+            key: items[start:end],
+            "response_metadata": {"next_cursor": next_cursor},
+        }
+
+    @staticmethod
+    def _user(user_id: str) -> dict:
+        name = user_id.lower()
+        return {
+            "id": user_id,
+            "name": name,
+            "real_name": name,
+            "profile": {"email": f"{name}@example.com", "real_name": name, "bot_id": "B00000000"},
+        }
+
+
+class FakeAirtable(FakeServer):
+    """
+    Stand-in for the Airtable REST API (``/v0/<base>/<table>[/<record>]``).
+
+    Lists are paginated with ``pageSize``/``offset`` and projected with ``fields[]``.
+    ``filterByFormula`` supports the ``FIND(LOWER('value'), LOWER({Field}))`` and
+    ``RECORD_ID()='rec...'`` (alone or inside ``OR(...)``) forms used by the bot.
+
+    Args:
+        tables: Initial records of each table, by table name. Defaults to :data:`AIRTABLE_TABLES`.
+    """
+
+    MAX_BATCH = 10
+
+    def __init__(self, *, tables: dict[str, list[dict]] | None = None, **kwargs: Any) -> None:
+        kwargs.setdefault("page_size", 100)
+        super().__init__(**kwargs)
+        self.tables: dict[str, list[dict]] = defaultdict(list)
+        for table, records in (AIRTABLE_TABLES if tables is None else tables).items():
+            self.tables[table] = [json.loads(json.dumps(record)) for record in records]
+        self._ids = itertools.count(1)
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        router.add_get("/v0/{base}/{table}", self._list)
+        router.add_post("/v0/{base}/{table}", self._create)
+        router.add_patch("/v0/{base}/{table}", self._update_many)
+        router.add_get("/v0/{base}/{table}/{record}", self._get)
+        router.add_patch("/v0/{base}/{table}/{record}", self._update)
+
+    def call_name(self, request: web.Request) -> str:
+        return f"{request.method} {request.match_info.get('table', request.path)}"
+
+    def error_response(self, name: str, status: int) -> web.Response:
+        return web.json_response(
+            {"error": {"type": "SERVER_ERROR", "message": "Injected error"}}, status=status
+        )
+
+    def ratelimited_response(self, name: str) -> web.Response:
+        return web.json_response(
+            {"error": {"type": "RATE_LIMIT_REACHED", "message": "Rate limit exceeded"}},
+            status=429,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    def _find(self, table: str, record_id: str) -> dict | None:
+        return next((r for r in self.tables.get(table, ()) if r["id"] == record_id), None)
+
+    async def _list(self, request: web.Request) -> web.Response:
+        table = request.match_info["table"]
+        query = request.query
+        self.history.append((self.call_name(request), dict(query)))
+
+        records = self.tables.get(table, [])
+        if "filterByFormula" in query:
+            records = [r for r in records if _matches(query["filterByFormula"], r)]
+
+        fields = query.getall("fields[]", []) + query.getall("fields", [])
+        if fields:
+            records = [
+                {**r, "fields": {k: v for k, v in r["fields"].items() if k in fields}}
+                for r in records
+            ]
+
+        start = int(query.get("offset") or 0)
+        size = min(int(query.get("pageSize") or self.page_size), 100)
+        body: dict[str, Any] = {"records": records[start : start + size]}
+        if start + size < len(records):
+            body["offset"] = str(start + size)
+        return web.json_response(body)
+
+    async def _get(self, request: web.Request) -> web.Response:
+        self.history.append((self.call_name(request), {"id": request.match_info["record"]}))
+        record = self._find(request.match_info["table"], request.match_info["record"])
+        if record is None:
+            return web.json_response({"error": "NOT_FOUND"}, status=404)
+        return web.json_response(record)
+
+    async def _create(self, request: web.Request) -> web.Response:
+        table = request.match_info["table"]
+        data = await request.json()
+        self.history.append((self.call_name(request), data))
+
+        if "records" not in data:
+            return web.json_response(self._insert(table, data.get("fields", {})))
+        elif len(data["records"]) > self.MAX_BATCH:
+            return _invalid_request("Too many records in a single request")
+        return web.json_response(
+            {"records": [self._insert(table, r.get("fields", {})) for r in data["records"]]}
+        )
+
+    async def _update(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        self.history.append((self.call_name(request), data))
+        record = self._find(request.match_info["table"], request.match_info["record"])
+        if record is None:
+            return web.json_response({"error": "NOT_FOUND"}, status=404)
+        record["fields"].update(data.get("fields", {}))
+        return web.json_response(record)
+
+    async def _update_many(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        self.history.append((self.call_name(request), data))
+        if len(data.get("records", ())) > self.MAX_BATCH:
+            return _invalid_request("Too many records in a single request")
+
+        updated = []
+        for update in data.get("records", ()):
+            record = self._find(request.match_info["table"], update.get("id", ""))
+            if record is None:
+                return web.json_response({"error": "NOT_FOUND"}, status=404)
+            record["fields"].update(update.get("fields", {}))
+            updated.append(record)
+        return web.json_response({"records": updated})
+
+    def _insert(self, table: str, fields: dict) -> dict:
+        record = {
+            "id": f"recFAKE{next(self._ids):010d}",
+            "createdTime": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
+            "fields": fields,
+        }
+        self.tables[table].append(record)
+        return record
+
+
+AIRTABLE_TABLES: dict[str, list[dict]] = {
+    "Services": [
+        {"id": "recSVC001", "fields": {"Name": "Resume Review"}},
+        {"id": "recSVC002", "fields": {"Name": "Mock Interview"}},
+        {"id": "recSVC003", "fields": {"Name": "Code Review"}},
+    ],
+    "Skillsets": [
+        {"id": f"recSKL{i:03d}", "fields": {"Name": name}}
+        for i, name in enumerate(["Python", "JavaScript", "AWS", "Java", "Go"], start=1)
+    ],
+    "Mentors": [
+        {
+            "id": f"recMENTOR{i:03d}",
+            "fields": {
+                "Name": f"Mentor {i}",
+                "Email": f"mentor{i}@example.com",
+                "Slack Name": f"mentor{i}",
+                "Skillsets": [["Python", "AWS"], ["JavaScript"], ["Python", "JavaScript"]][i % 3],
+            },
+        }
+        for i in range(1, 13)
+    ],
+    "Mentor Request": [],
+}
+"""Default content of :class:`FakeAirtable`, matching the ids of the `tests.data` payloads."""
+
+
+_FIND = re.compile(r"FIND\(LOWER\('(?P<value>[^']*)'\), LOWER\(\{(?P<field>[^}]+)\}\)\)")
+_RECORD_ID = re.compile(r"RECORD_ID\(\)\s*=\s*'(?P<id>[^']+)'")
+
+
+def _matches(formula: str, record: dict) -> bool:
+    if match := _FIND.fullmatch(formula):
+        value = str(record["fields"].get(match["field"], ""))
+        return match["value"].lower() in value.lower()
+
+    ids = _RECORD_ID.findall(formula)
+    if ids:
+        return record["id"] in ids
+
+    return True
+
+
+def _invalid_request(message: str) -> web.Response:
+    return web.json_response({"error": {"type": "INVALID_REQUEST", "message": message}}, status=422)
+
+
+async def _read_body(request: web.Request) -> dict:
+    if request.content_type == "application/json":
+        return await request.json()
+    elif request.can_read_body:
+        return dict(await request.post())
+    return dict(request.query)
+
+
+class FakeRedis:
+    """
+    Stand-in for a Redis server, speaking RESP over TCP.
+
+    Supports the commands used by `RedisBackend`: ``PING``, ``AUTH``, ``SELECT``, ``GET``,
+    ``SET`` (with ``NX``, ``EX`` and ``PX``), ``DEL``, ``INCRBY``, ``PEXPIRE``, ``PTTL``,
+    ``FLUSHDB`` and ``EVAL`` of the lock release and renew and the counter scripts. Commands
+    of different connections are served concurrently.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.data: dict[str, tuple[str, float | None]] = {}
+        self.calls: Counter[str] = Counter()
+        self.url = ""
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._server = await asyncio.start_server(self._serve, host, port)
+        bound_port = self._server.sockets[0].getsockname()[1]
+        self.url = f"redis://{host}:{bound_port}/0"
+        return self.url
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeRedis":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def drop_connections(self) -> None:
+        """Close the client connections, like a server restart."""
+        for writer in list(self._connections):
+            writer.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                command = await self._read_command(reader)
+                self.calls[command[0].upper()] += 1
+                reply = self._encode(self._execute(command))
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> list[str]:
+        count = int((await reader.readuntil(b"\r\n"))[1:-2])
+        args = []
+        for _ in range(count):
+            length = int((await reader.readuntil(b"\r\n"))[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2].decode())
+        return args
+
+    @staticmethod
+    def _encode(reply: Any) -> bytes:
+        if reply is None:
+            return b"$-1\r\n"
+        elif isinstance(reply, Exception):
+            return f"-ERR {reply}\r\n".encode()
+        elif isinstance(reply, bool):
+            return b"+OK\r\n"
+        elif isinstance(reply, int):
+            return f":{reply}\r\n".encode()
+        data = reply.encode()
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+
+    def _get(self, key: str) -> str | None:
+        item = self.data.get(key)
+        if item and item[1] is not None and item[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return item[0] if item else None
+
+    def _execute(self, command: list[str]) -> Any:
+        name, args = command[0].upper(), command[1:]
+        if name in ("PING", "AUTH", "SELECT"):
+            return True
+        elif name == "FLUSHDB":
+            self.data.clear()
+            return True
+        elif name == "GET":
+            return self._get(args[0])
+        elif name == "SET":
+            return self._set(args)
+        elif name == "DEL":
+            return sum(self.data.pop(key, None) is not None for key in args)
+        elif name == "INCRBY":
+            value = int(self._get(args[0]) or 0) + int(args[1])
+            expires = self.data[args[0]][1] if args[0] in self.data else None
+            self.data[args[0]] = (str(value), expires)
+            return value
+        elif name == "PEXPIRE":
+            if self._get(args[0]) is None:
+                return 0
+            self.data[args[0]] = (self.data[args[0]][0], time.monotonic() + int(args[1]) / 1000)
+            return 1
+        elif name == "PTTL":
+            if self._get(args[0]) is None:
+                return -2
+            expires = self.data[args[0]][1]
+            return -1 if expires is None else int((expires - time.monotonic()) * 1000)
+        elif name == "EVAL":
+            return self._eval(args[0], args[2], args[3:])
+        return ValueError(f"unknown command '{name}'")
+
+    def _set(self, args: list[str]) -> Any:
+        key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+        if "NX" in options and self._get(key) is not None:
+            return None
+
+        expires = None
+        if "PX" in options:
+            expires = time.monotonic() + int(args[2 + options.index("PX") + 1]) / 1000
+        elif "EX" in options:
+            expires = time.monotonic() + int(args[2 + options.index("EX") + 1])
+        self.data[key] = (value, expires)
+        return True
+
+    def _eval(self, script: str, key: str, argv: list[str]) -> Any:
+        if script == INCR_SCRIPT:
+            new = self._get(key) is None
+            value = self._execute(["INCRBY", key, argv[0]])
+            if new:
+                self._execute(["PEXPIRE", key, argv[1]])
+            return value
+        elif self._get(key) != argv[0]:
+            return 0
+        elif script == RELEASE_SCRIPT:
+            del self.data[key]
+            return 1
+        elif script == RENEW_SCRIPT:
+            return self._execute(["PEXPIRE", key, argv[1]])
+        return ValueError("unsupported script")
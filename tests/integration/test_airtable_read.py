@@ -15,6 +15,7 @@ import aiohttp
 import pytest
 
 from pybot.plugins.airtable.api import AirtableAPI
+from pybot.plugins.airtable.records import Mentor
 
 
 def get_airtable_base_key():
@@ -119,7 +120,7 @@ class TestAirtableReadMentors:
 
         # If mentors are returned, verify they have expected fields
         for mentor in mentors:
-            assert isinstance(mentor, dict)
+            assert isinstance(mentor, Mentor)
             # Should have at least Skillsets field (may not have Email)
             # Note: We now handle missing Email gracefully
 
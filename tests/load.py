@@ -0,0 +1,440 @@
+"""
+Load generator replaying the `tests.data` payloads against a SirBot.
+
+The bot runs in-process, wired to a local :class:`FakeSlack` and :class:`FakeAirtable`, and
+every scenario is replayed at a fixed rate. For each scenario the report gives the ack latency
+(HTTP response to Slack/Zapier), the handler completion latency and the outbound calls made
+to each stand-in.
+
+Usage:
+    python -m tests.load --rate 50 --requests 200
+    python -m tests.load --scenario team_join --ratelimit-rate 0.05
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+from tests.fixtures.servers import FakeAirtable, FakeSlack
+
+VERIFY = "supersecuretoken"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    A payload type to replay.
+
+    Attributes:
+        name: Name of the scenario in the report.
+        path: Bot endpoint receiving the payload.
+        make: Build the payload of the i-th request, given the Slack stand-in base URL.
+        form: Send the payload form encoded instead of JSON.
+    """
+
+    name: str
+    path: str
+    make: Callable[[int, str], dict]
+    form: bool = False
+
+    def request(self, i: int, slack_url: str) -> dict[str, Any]:
+        payload = self.make(i, slack_url)
+        return {"data": payload} if self.form else {"json": payload}
+
+
+def _static(payload: dict) -> Callable[[int, str], dict]:
+    return lambda i, slack_url: copy.deepcopy(payload)
+
+
+def _command(command: str, text: str) -> Callable[[int, str], dict]:
+    from tests.data.commands import make_command
+
+    def make(i: int, slack_url: str) -> dict:
+        return make_command(command, text, response_url=f"{slack_url}/hooks/commands/{i}")
+
+    return make
+
+
+def _mentor_request(i: int, slack_url: str) -> dict:
+    from tests.data.blocks import ZAPIER_MENTOR_REQUEST
+
+    return {
+        **ZAPIER_MENTOR_REQUEST,
+        "record": f"recLOAD{i:06d}",
+        "type": "mentor_request",
+        "token": VERIFY,
+    }
+
+
+def default_scenarios() -> list[Scenario]:
+    from tests.data import events
+    from tests.data.actions import Action
+    from tests.data.blocks import BlockActionPayload
+
+    return [
+        Scenario("event:team_join", "/slack/events", _static(events.TEAM_JOIN)),
+        Scenario("event:message", "/slack/events", _static(events.PLAIN_MESSAGE)),
+        Scenario("event:message_changed", "/slack/events", _static(events.MESSAGE_EDIT)),
+        Scenario("event:message_deleted", "/slack/events", _static(events.MESSAGE_DELETE)),
+        Scenario("command:/roll", "/slack/commands", _command("/roll", "2d6"), form=True),
+        Scenario("command:/repeat", "/slack/commands", _command("/repeat", "ask"), form=True),
+        *(
+            Scenario(f"action:{action.name}", "/slack/actions", _static(action.value), form=True)
+            for action in Action
+        ),
+        *(
+            Scenario(
+                f"block:{payload.name.lower()}",
+                "/slack/actions",
+                _static({"payload": payload.value}),
+                form=True,
+            )
+            for payload in BlockActionPayload
+        ),
+        Scenario("airtable:mentor_request", "/airtable/request", _mentor_request),
+    ]
+
+
+class HandlerTimer:
+    """
+    Time the handlers dispatched by the bot routers.
+
+    Completions are attributed to the scenario running when the handler was dispatched.
+    """
+
+    def __init__(self) -> None:
+        self.scenario = ""
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: Counter[str] = Counter()
+        self.pending = 0
+
+    def instrument(self, router: Any) -> None:
+        dispatch = router.dispatch
+
+        def timed_dispatch(event):
+            for handler, configuration in dispatch(event):
+                yield self._timed(handler), configuration
+
+        router.dispatch = timed_dispatch
+
+    def _timed(self, handler: Callable) -> Callable:
+        scenario, start = self.scenario, time.perf_counter()
+        self.pending += 1
+
+        async def timed(event, app):
+            try:
+                return await handler(event, app)
+            except Exception:
+                self.errors[scenario] += 1
+                raise
+            finally:
+                self.samples[scenario].append(time.perf_counter() - start)
+                self.pending -= 1
+
+        return timed
+
+    async def drain(self, timeout: float) -> None:
+        """Wait for the in-flight handlers, background ones included."""
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+
+def percentiles(samples: list[float]) -> dict[str, float | int]:
+    """p50/p95/p99/max of `samples` seconds, in milliseconds."""
+    if not samples:
+        return {"count": 0}
+    elif len(samples) == 1:
+        quantiles = samples * 99
+    else:
+        quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "count": len(samples),
+        "p50": round(quantiles[49] * 1000, 2),
+        "p95": round(quantiles[94] * 1000, 2),
+        "p99": round(quantiles[98] * 1000, 2),
+        "max": round(max(samples) * 1000, 2),
+    }
+
+
+def build_bot(slack: FakeSlack, airtable: FakeAirtable) -> web.Application:
+    """The production bot, with its Slack and Airtable clients pointed at the stand-ins."""
+    from pybot import endpoints
+    from pybot._vendor.sirbot import SirBot
+    from pybot._vendor.sirbot.plugins.slack import SlackPlugin
+    from pybot.endpoints.slack.utils import HTTP_CLIENTS, slack_configs
+    from pybot.plugins import AirtablePlugin, APIPlugin
+
+    bot = SirBot(http_clients=HTTP_CLIENTS)
+    configs = {
+        "token": "xoxb-load-test",
+        "verify": VERIFY,
+        "bot_id": "B00000000",
+        "bot_user_id": "U00000000",
+        "api_url": f"{slack.url}/api/",
+    }
+
+    slack_plugin = SlackPlugin(**configs, channels=slack_configs["channels"])
+    endpoints.slack.create_endpoints(slack_plugin)
+    bot.load_plugin(slack_plugin)
+    bot.load_plugin(SlackPlugin(**configs), name="admin_slack")
+
+    airtable_plugin = AirtablePlugin()
+    endpoints.airtable.create_endpoints(airtable_plugin)
+    bot.load_plugin(airtable_plugin)
+    airtable_plugin.verify = VERIFY
+    airtable_plugin.api_key = "load-test"
+    airtable_plugin.base_key = "appLOADTEST"
+    airtable_plugin.api_root = f"{airtable.url}/v0/"
+
+    api_plugin = APIPlugin()
+    endpoints.api.create_endpoints(api_plugin)
+    bot.load_plugin(api_plugin)
+
+    return bot
+
+
+async def _wait_ready(session: aiohttp.ClientSession, url: str, timeout: float = 30) -> None:
+    """Wait for the warm-up of the bot, its calls to the stand-ins aren't part of any scenario."""
+    async with asyncio.timeout(timeout):
+        while True:
+            async with session.get(f"{url}/sirbot/ready") as r:
+                if r.status == 200:
+                    return
+            await asyncio.sleep(0.05)
+
+
+async def _replay(
+    session: aiohttp.ClientSession,
+    url: str,
+    scenario: Scenario,
+    slack_url: str,
+    rate: float,
+    count: int,
+) -> tuple[list[float], Counter[int]]:
+    """Send `count` requests at `rate` per second, open loop so slow acks don't slow the rate."""
+    loop = asyncio.get_running_loop()
+    statuses: Counter[int] = Counter()
+    start = loop.time()
+
+    async def send(i: int) -> float:
+        scheduled = start + i / rate
+        await asyncio.sleep(max(0.0, scheduled - loop.time()))
+        try:
+            async with session.post(url + scenario.path, **scenario.request(i, slack_url)) as r:
+                await r.read()
+                statuses[r.status] += 1
+        except aiohttp.ClientError:
+            statuses[0] += 1
+        # Measured from the scheduled time, a late send counts against the bot.
+        return loop.time() - scheduled
+
+    acks = await asyncio.gather(*(send(i) for i in range(count)))
+    return list(acks), statuses
+
+
+async def run(
+    rate: float = 20,
+    requests: int = 100,
+    scenarios: list[Scenario] | None = None,
+    target: str | None = None,
+    slack_options: dict[str, Any] | None = None,
+    airtable_options: dict[str, Any] | None = None,
+    drain_timeout: float = 30,
+) -> dict[str, dict[str, Any]]:
+    """
+    Replay every scenario and return the report, by scenario name.
+
+    Args:
+        rate: Requests per second.
+        requests: Requests per scenario.
+        scenarios: Scenarios to replay, defaults to :func:`default_scenarios`.
+        target: Base URL of an already running bot, configured with ``SLACK_API_URL`` and
+            ``AIRTABLE_API_ROOT`` pointing to the stand-ins. Handler latency is not available.
+        slack_options: :class:`FakeSlack` keyword arguments (latency, error rate, port...).
+        airtable_options: :class:`FakeAirtable` keyword arguments.
+        drain_timeout: Seconds to wait for the handlers of a scenario to finish.
+    """
+    slack_options, airtable_options = dict(slack_options or {}), dict(airtable_options or {})
+    slack = FakeSlack(**_without_port(slack_options))
+    airtable = FakeAirtable(**_without_port(airtable_options))
+    await slack.start(port=slack_options.get("port", 0))
+    await airtable.start(port=airtable_options.get("port", 0))
+
+    # Read when pybot is first imported: skip the team_join greeting delay and
+    # send backend calls to the Slack stand-in, where they fail fast.
+    os.environ.setdefault("TEAM_JOIN_DELAY", "0")
+    os.environ.setdefault("BACKEND_URL", f"{slack.url}/backend")
+
+    from pybot.endpoints.slack.utils import slack_configs
+
+    slack.add_channels(*slack_configs["channels"])
+
+    timer = HandlerTimer()
+    runner = None
+    if target is None:
+        bot = build_bot(slack, airtable)
+        for plugin in bot.plugins.values():
+            for router in plugin.routers.values():
+                timer.instrument(router)
+
+        runner = web.AppRunner(bot, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        target = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    report = {}
+    connector = aiohttp.TCPConnector(limit=0)
+    try:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            await _wait_ready(session, target)
+            for scenario in scenarios or default_scenarios():
+                timer.scenario = scenario.name
+                slack_calls, airtable_calls = Counter(slack.calls), Counter(airtable.calls)
+
+                acks, statuses = await _replay(session, target, scenario, slack.url, rate, requests)
+                await timer.drain(drain_timeout)
+
+                report[scenario.name] = {
+                    "requests": requests,
+                    "statuses": {str(k): v for k, v in sorted(statuses.items())},
+                    "ack_ms": percentiles(acks),
+                    "handler_ms": percentiles(timer.samples[scenario.name]),
+                    "handler_errors": timer.errors[scenario.name],
+                    "outbound": {
+                        "slack": dict(slack.calls - slack_calls),
+                        "airtable": dict(airtable.calls - airtable_calls),
+                    },
+                }
+    finally:
+        if runner:
+            await runner.cleanup()
+        await slack.close()
+        await airtable.close()
+
+    return report
+
+
+def format_report(report: dict[str, dict[str, Any]]) -> str:
+    """Human readable table of a :func:`run` report."""
+    lines = [
+        f"{'scenario':<40} {'ok':>5} {'ack p50/p95/p99 ms':>24} "
+        f"{'handler p50/p95/p99 ms':>24} {'errors':>6}  outbound calls"
+    ]
+
+    for name, result in report.items():
+        ok = sum(v for k, v in result["statuses"].items() if k.startswith("2"))
+        outbound = ", ".join(
+            f"{upstream}:{method}={count / result['requests']:g}"
+            for upstream, calls in result["outbound"].items()
+            for method, count in sorted(calls.items())
+        )
+        lines.append(
+            f"{name:<40} {ok:>5} {_format_percentiles(result['ack_ms']):>24} "
+            f"{_format_percentiles(result['handler_ms']):>24} {result['handler_errors']:>6}  "
+            f"{outbound or '-'}"
+        )
+
+    lines.append("outbound calls are per request")
+    return "\n".join(lines)
+
+
+def _format_percentiles(result: dict[str, float | int]) -> str:
+    if not result["count"]:
+        return "-"
+    return f"{result['p50']:.1f}/{result['p95']:.1f}/{result['p99']:.1f}"
+
+
+def _without_port(options: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in options.items() if k != "port"}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay the test payloads against the bot with local Slack and Airtable "
+        "stand-ins"
+    )
+    parser.add_argument("--rate", type=float, default=20, help="Requests per second (default: 20)")
+    parser.add_argument(
+        "--requests", type=int, default=100, help="Requests per scenario (default: 100)"
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        dest="scenarios",
+        help="Only replay scenarios whose name contains this value (repeatable)",
+    )
+    parser.add_argument(
+        "--target",
+        help="URL of an already running bot instead of an in-process one. "
+        "Point its SLACK_API_URL and AIRTABLE_API_ROOT to the stand-ins (see --slack-port)",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every upstream response"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of upstream calls failing (0-1)"
+    )
+    parser.add_argument(
+        "--ratelimit-rate",
+        type=float,
+        default=0.0,
+        help="Share of upstream calls answered with a 429 (0-1)",
+    )
+    parser.add_argument(
+        "--slack-port", type=int, default=0, help="Port of the Slack stand-in (default: random)"
+    )
+    parser.add_argument(
+        "--airtable-port",
+        type=int,
+        default=0,
+        help="Port of the Airtable stand-in (default: random)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
+    args = parser.parse_args(argv)
+
+    # Handler errors against the stand-ins are expected, keep the report readable
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+
+    scenarios = default_scenarios()
+    if args.scenarios:
+        scenarios = [s for s in scenarios if any(name in s.name for name in args.scenarios)]
+        if not scenarios:
+            sys.exit(f"No scenario matching {args.scenarios}")
+
+    upstream = {
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "ratelimit_rate": args.ratelimit_rate,
+    }
+    report = asyncio.run(
+        run(
+            rate=args.rate,
+            requests=args.requests,
+            scenarios=scenarios,
+            target=args.target,
+            slack_options={**upstream, "port": args.slack_port},
+            airtable_options={**upstream, "port": args.airtable_port},
+        )
+    )
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
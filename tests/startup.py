@@ -0,0 +1,187 @@
+"""
+Cold start profile of `python -m pybot`: import times and time to first request.
+
+The bot is started in a fresh interpreter, wired to a local :class:`FakeSlack` and
+:class:`FakeAirtable`. The report gives the modules taking the most time to import, the time
+from spawning the process to the first answered ``/health`` and to ``/sirbot/ready``, and
+whether the first request came within the target.
+
+Usage:
+    python -m tests.startup --target 1.0
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+from tests.fixtures.servers import FakeAirtable, FakeSlack
+
+ROOT = Path(__file__).parents[1]
+
+# Seconds from spawning `python -m pybot` to its first answered request
+TARGET = 1.0
+
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module: str = "pybot.__main__") -> list[dict[str, Any]]:
+    """Import `module` in a fresh interpreter, with the self and cumulative time of every import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            times.append(
+                {
+                    "module": name,
+                    "depth": len(indent) // 2,
+                    "self_ms": int(self_us) / 1000,
+                    "cumulative_ms": int(cumulative_us) / 1000,
+                }
+            )
+    return times
+
+
+async def time_to_first_request(timeout: float = 30) -> dict[str, Any]:
+    """Start `python -m pybot` and time its first answered request and its readiness."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    async with FakeSlack() as slack, FakeAirtable() as airtable:
+        from pybot.endpoints.slack.utils import slack_configs
+
+        slack.add_channels(*slack_configs["channels"])
+        env = {
+            **os.environ,
+            "SIRBOT_ADDR": "127.0.0.1",
+            "SIRBOT_PORT": str(port),
+            "SLACK_TOKEN": "xoxb-startup",
+            "VERIFICATION_TOKEN": "supersecuretoken",
+            "SLACK_API_URL": f"{slack.url}/api/",
+            "AIRTABLE_API_ROOT": f"{airtable.url}/v0/",
+        }
+        url = f"http://127.0.0.1:{port}"
+
+        started = time.perf_counter()
+        bot = subprocess.Popen(
+            [sys.executable, "-m", "pybot"],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            async with aiohttp.ClientSession() as session, asyncio.timeout(timeout):
+                await _wait_for(session, f"{url}/health")
+                first_request = time.perf_counter() - started
+                ready = await _wait_for(session, f"{url}/sirbot/ready")
+                ready_after = time.perf_counter() - started
+        finally:
+            bot.send_signal(signal.SIGTERM)
+            await asyncio.to_thread(bot.wait, 10)
+
+    return {"first_request_s": first_request, "ready_s": ready_after, "warmup": ready["warmup"]}
+
+
+async def _wait_for(session: aiohttp.ClientSession, url: str) -> Any:
+    while True:
+        try:
+            async with session.get(url) as r:
+                if r.status == 200:
+                    return await r.json(content_type=None)
+        except aiohttp.ClientConnectionError:
+            pass
+        await asyncio.sleep(0.005)
+
+
+async def run(top: int = 15, target: float = TARGET) -> dict[str, Any]:
+    times = await asyncio.to_thread(import_times)
+    startup = await time_to_first_request()
+    return {
+        "imports": {
+            "total_ms": sum(t["self_ms"] for t in times),
+            "slowest": sorted(times, key=lambda t: t["self_ms"], reverse=True)[:top],
+            "packages": _by_package(times)[:top],
+        },
+        "startup": startup,
+        "target_s": target,
+        "within_target": startup["first_request_s"] <= target,
+    }
+
+
+def _by_package(times: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    packages: dict[str, float] = {}
+    for t in times:
+        package = t["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + t["self_ms"]
+    return [
+        {"package": name, "self_ms": ms}
+        for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    ]
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Human readable summary of a :func:`run` report."""
+    imports, startup = report["imports"], report["startup"]
+    lines = [f"import pybot.__main__: {imports['total_ms']:.0f}ms", "", "by package:"]
+    lines += [f"  {p['package']:<40} {p['self_ms']:>8.1f}ms" for p in imports["packages"]]
+    lines += ["", "slowest modules (self):"]
+    lines += [f"  {t['module']:<40} {t['self_ms']:>8.1f}ms" for t in imports["slowest"]]
+
+    status = "ok" if report["within_target"] else "OVER TARGET"
+    lines += [
+        "",
+        f"first request: {startup['first_request_s']:.2f}s "
+        f"(target {report['target_s']:.2f}s, {status})",
+        f"ready:         {startup['ready_s']:.2f}s "
+        + ", ".join(f"{name}={status}" for name, status in startup["warmup"].items()),
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Print the profile, exits with status 1 when the first request is over the target."""
+    parser = argparse.ArgumentParser(
+        description="Profile the imports and the time to first request of a cold start"
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="Modules and packages listed (default: 15)"
+    )
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=TARGET,
+        help=f"Seconds to the first request, exits 1 when over (default: {TARGET})",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(top=args.top, target=args.target))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+    if not report["within_target"]:
+        sys.exit(f"First request after {report['startup']['first_request_s']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
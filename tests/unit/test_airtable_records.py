@@ -0,0 +1,74 @@
+"""Unit tests for the Airtable record models."""
+
+import aiohttp
+import pytest
+
+from pybot.plugins.airtable.api import AirtableAPI
+from pybot.plugins.airtable.records import Mentor, Service
+from tests.fixtures.servers import FakeAirtable
+
+
+@pytest.fixture
+async def session():
+    async with aiohttp.ClientSession() as s:
+        yield s
+
+
+@pytest.fixture
+async def airtable():
+    async with FakeAirtable(page_size=5) as server:
+        yield server
+
+
+@pytest.fixture
+def api(session, airtable):
+    return AirtableAPI(session, "key", "appTEST", api_root=f"{airtable.url}/v0/")
+
+
+class TestRecords:
+    def test_from_airtable(self):
+        mentor = Mentor.from_airtable(
+            {"id": "rec1", "fields": {"Slack Name": "jane", "Skillsets": ["Go"], "Other": 1}}
+        )
+
+        assert mentor == Mentor(id="rec1", slack_name="jane", skillsets=["Go"])
+        assert mentor.email is None
+        assert not hasattr(mentor, "__dict__")
+
+    def test_field_names(self):
+        assert Mentor.field_names() == ("Name", "Email", "Slack Name", "Skillsets")
+        assert Service.field_names() == ("Name",)
+
+
+class TestListRecords:
+    async def test_only_the_fields_of_the_model_are_requested(self, api, airtable):
+        mentors = await api.list_records(Mentor)
+
+        assert len(mentors) == 12
+        assert airtable.calls["GET Mentors"] == 3
+        assert all(isinstance(mentor, Mentor) for mentor in mentors)
+        assert "fields[]" in airtable.get_calls("GET Mentors")[0][1]
+
+    async def test_error_stops_the_listing(self, api, airtable):
+        airtable.fail("GET Services")
+
+        assert await api.list_records(Service) == []
+
+    async def test_get_record(self, api):
+        created = await api.add_record("Mentors", {"fields": {"Email": "a@b.c", "Name": "A"}})
+
+        mentor = await api.get_record(Mentor, created["id"])
+
+        assert mentor == Mentor(id=created["id"], name="A", email="a@b.c")
+        assert await api.get_record(Mentor, "recMISSING") is None
+
+    async def test_find(self, api, airtable):
+        mentors = await api.find(Mentor, "Email", "MENTOR1")
+
+        assert [mentor.id for mentor in mentors] == [
+            "recMENTOR001",
+            "recMENTOR010",
+            "recMENTOR011",
+            "recMENTOR012",
+        ]
+        assert "fields[]" in airtable.get_calls("GET Mentors")[0][1]
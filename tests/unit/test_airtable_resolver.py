@@ -0,0 +1,92 @@
+"""Unit tests for the resolution of Airtable record IDs."""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from pybot.plugins.airtable.api import AirtableAPI
+from tests.fixtures.servers import FakeAirtable
+
+
+@pytest.fixture
+async def session():
+    async with aiohttp.ClientSession() as s:
+        yield s
+
+
+@pytest.fixture
+async def airtable():
+    async with FakeAirtable(page_size=5) as server:
+        yield server
+
+
+@pytest.fixture
+def api(session, airtable):
+    return AirtableAPI(session, "key", "appTEST", api_root=f"{airtable.url}/v0/")
+
+
+class TestRecordResolver:
+    async def test_concurrent_misses_share_a_request(self, api, airtable):
+        resolver = api.resolver("Mentors")
+
+        names = await asyncio.gather(
+            resolver.get("recMENTOR001"),
+            resolver.get("recMENTOR002"),
+            resolver.get("recMENTOR003"),
+            resolver.get("recMENTOR001"),
+        )
+
+        assert names == ["Mentor 1", "Mentor 2", "Mentor 3", "Mentor 1"]
+        assert airtable.calls["GET Mentors"] == 1
+        query = airtable.get_calls("GET Mentors")[0][1]
+        assert query["filterByFormula"].startswith("OR(RECORD_ID()='recMENTOR001', ")
+        assert query["fields[]"] == "Name"
+        assert resolver.stats == {"hits": 0, "misses": 3, "coalesced": 1, "requests": 1}
+
+    async def test_results_are_cached(self, api, airtable):
+        resolver = api.resolver("Mentors", "Email")
+
+        assert await asyncio.gather(resolver.get("recMENTOR001"), resolver.get("recMISSING")) == [
+            "mentor1@example.com",
+            None,
+        ]
+        assert await resolver.get("recMISSING") is None
+        assert await resolver.get("recMENTOR001") == "mentor1@example.com"
+
+        assert airtable.calls["GET Mentors"] == 1
+
+    async def test_errors_are_not_cached(self, api, airtable):
+        airtable.fail("GET Mentors")
+
+        assert await api.get_name_from_record_id("Mentors", "recMENTOR001") is None
+        assert await api.get_name_from_record_id("Mentors", "recMENTOR001") == "Mentor 1"
+
+    async def test_results_are_paginated(self, api, airtable):
+        ids = [f"recMENTOR{i:03d}" for i in range(1, 13)]
+
+        resolver = api.resolver("Mentors")
+
+        names = await asyncio.gather(*map(resolver.get, ids))
+
+        assert names == [f"Mentor {int(record_id[-3:])}" for record_id in ids]
+        assert airtable.calls["GET Mentors"] == 3
+
+    async def test_records_added_to_reference_tables(self, api, airtable):
+        assert await api.get_name_from_record_id("Services", "recSVC001") == "Resume Review"
+        airtable.tables["Services"].append({"id": "recSVC004", "fields": {"Name": "Pairing"}})
+
+        assert await api.get_name_from_record_id("Services", "recSVC004") == "Pairing"
+        assert airtable.calls["GET Services"] == 2
+
+
+class TestRecordNames:
+    async def test_all_pages_are_read(self, api, airtable):
+        airtable.tables["Services"] = [
+            {"id": f"recSVC{i:03d}", "fields": {"Name": f"Service {i}"}} for i in range(12)
+        ]
+
+        names = await api.get_record_names("Services")
+
+        assert len(names) == 12
+        assert airtable.calls["GET Services"] == 3
@@ -0,0 +1,106 @@
+"""Unit tests for the write-behind batching of Airtable creates and updates."""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from pybot.plugins.airtable.api import AirtableAPI, AirtableError
+from tests.fixtures.servers import FakeAirtable
+
+
+@pytest.fixture
+async def session():
+    async with aiohttp.ClientSession() as s:
+        yield s
+
+
+@pytest.fixture
+async def airtable():
+    async with FakeAirtable() as server:
+        yield server
+
+
+@pytest.fixture
+def api(session, airtable):
+    api = AirtableAPI(session, "key", "appTEST", api_root=f"{airtable.url}/v0/")
+    api.writes.backoff = 0.01
+    return api
+
+
+class TestWriteBuffer:
+    async def test_creates_are_batched(self, api, airtable):
+        records = await asyncio.gather(
+            *(api.add_record("Mentors", {"fields": {"Name": f"New {i}"}}) for i in range(25))
+        )
+
+        assert [r["fields"]["Name"] for r in records] == [f"New {i}" for i in range(25)]
+        assert len({r["id"] for r in records}) == 25
+        assert [len(data["records"]) for _, data in airtable.get_calls("POST")] == [10, 10, 5]
+
+    async def test_writes_to_other_tables_are_separate(self, api, airtable):
+        await asyncio.gather(
+            api.add_record("Mentors", {"fields": {"Name": "Mentor"}}),
+            api.add_record("Mentor Request", {"fields": {"Email": "a@b.c"}}),
+        )
+
+        assert airtable.calls["POST Mentors"] == 1
+        assert airtable.calls["POST Mentor Request"] == 1
+
+    async def test_updates_of_a_record_are_merged(self, api, airtable):
+        airtable.tables["Mentor Request"] = [{"id": "recREQ1", "fields": {}}]
+
+        first, second = await asyncio.gather(
+            api.update_request("recREQ1", "recMENTOR001"),
+            api.update_request("recREQ1", "recMENTOR002"),
+        )
+
+        assert first == second
+        assert first["fields"]["Mentor Assigned"] == ["recMENTOR002"]
+        assert airtable.get_calls("PATCH")[0][1]["records"] == [
+            {"id": "recREQ1", "fields": {"Mentor Assigned": ["recMENTOR002"]}}
+        ]
+
+    async def test_rejected_batch_is_split(self, api, airtable):
+        airtable.tables["Mentor Request"] = [{"id": "recREQ1", "fields": {}}]
+
+        results = await asyncio.gather(
+            api.update_request("recREQ1", "recMENTOR001"),
+            api.update_request("recMISSING", "recMENTOR001"),
+            return_exceptions=True,
+        )
+
+        assert results[0]["fields"]["Mentor Assigned"] == ["recMENTOR001"]
+        assert isinstance(results[1], AirtableError)
+        assert airtable.calls["PATCH Mentor Request"] == 3
+        assert api.writes.stats["failed"] == 1
+
+    async def test_rate_limited_batch_is_retried(self, api, airtable):
+        airtable.fail("POST Mentors", status=429, times=2)
+
+        record = await api.add_record("Mentors", {"fields": {"Name": "Retried"}})
+
+        assert record["fields"] == {"Name": "Retried"}
+        assert airtable.calls["POST Mentors"] == 3
+        assert api.writes.stats["retries"] == 2
+
+    async def test_error_is_returned_after_retries(self, api, airtable):
+        airtable.fail("POST Mentors", status=500, times=4)
+
+        records = await asyncio.gather(
+            *(api.add_record("Mentors", {"fields": {"Name": f"New {i}"}}) for i in range(2))
+        )
+
+        assert all(r["error"]["type"] == "SERVER_ERROR" for r in records)
+        assert airtable.calls["POST Mentors"] == 4
+
+    async def test_flush(self, api, airtable):
+        api.writes.window = 60
+        task = asyncio.ensure_future(api.add_record("Mentors", {"fields": {"Name": "Late"}}))
+        await asyncio.sleep(0)
+        assert api.writes.pending == 1
+
+        await api.writes.flush()
+
+        assert (await task)["fields"] == {"Name": "Late"}
+        assert api.writes.pending == 0
@@ -0,0 +1,49 @@
+"""Unit tests for the microbenchmark suite."""
+
+import pytest
+
+from tests import bench
+
+
+def make_results(**timings: float) -> dict:
+    return {"benchmarks": {name: {"min_ns": ns, "median_ns": ns} for name, ns in timings.items()}}
+
+
+class TestBenchmarks:
+    @pytest.mark.parametrize("name", list(bench.BENCHMARKS))
+    def test_benchmark_runs(self, name):
+        """Every registered benchmark sets up and runs against the current code."""
+        bench.BENCHMARKS[name]()()
+
+    def test_run_filters_by_name(self):
+        results = bench.run(["sansio.decode"], repeat=2, number=10)
+
+        assert list(results["benchmarks"]) == ["sansio.decode_response"]
+        timing = results["benchmarks"]["sansio.decode_response"]
+        assert timing["number"] == 10
+        assert timing["repeat"] == 2
+        assert 0 < timing["min_ns"] <= timing["median_ns"]
+        assert results["meta"]["python"]
+
+
+class TestCompare:
+    def test_statuses(self):
+        baseline = make_results(same=100, slower=100, faster=100)
+        results = make_results(same=105, slower=120, faster=80, added=50)
+
+        comparison = bench.compare(results, baseline, threshold=0.10)
+
+        assert comparison["same"] == {"ratio": 1.05, "status": "ok"}
+        assert comparison["slower"] == {"ratio": 1.2, "status": "regression"}
+        assert comparison["faster"] == {"ratio": 0.8, "status": "improvement"}
+        assert comparison["added"] == {"ratio": None, "status": "new"}
+
+    def test_format_results_shows_comparison(self):
+        results = make_results(**{"router.event.dispatch": 2500})
+        comparison = {"router.event.dispatch": {"ratio": 1.5, "status": "regression"}}
+
+        table = bench.format_results(results, comparison)
+
+        assert "2.50 us" in table
+        assert "1.50x" in table
+        assert "regression" in table
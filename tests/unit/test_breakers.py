@@ -0,0 +1,183 @@
+"""Unit tests for the circuit breakers of the upstream HTTP clients."""
+
+import aiohttp
+import pytest
+
+from pybot._vendor.sirbot import SirBot
+from pybot._vendor.sirbot.breakers import CircuitBreaker, CircuitOpenError
+from pybot._vendor.sirbot.clients import HTTPClients
+from pybot._vendor.slack.commands import Command
+from pybot.endpoints.slack.commands import slash_lunch
+from pybot.plugins.airtable.api import AirtableAPI
+from pybot.plugins.airtable.records import Mentor
+from tests.data.commands import make_command
+from tests.fixtures.servers import FakeAirtable
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("yelp", threshold=3, reset_timeout=30, clock=clock)
+
+
+@pytest.fixture
+async def airtable():
+    async with FakeAirtable() as server:
+        yield server
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self, breaker):
+        for _ in range(2):
+            breaker.before_request()
+            breaker.failure()
+        breaker.before_request()
+        breaker.success()
+        for _ in range(3):
+            breaker.before_request()
+            breaker.failure()
+
+        with pytest.raises(CircuitOpenError) as e:
+            breaker.before_request()
+
+        assert e.value.retry_in == 30
+        assert breaker.status() == {
+            "state": "open",
+            "consecutive_failures": 3,
+            "threshold": 3,
+            "reset_timeout": 30,
+            "failures": 5,
+            "rejected": 1,
+            "opened": 1,
+        }
+
+    def test_half_open_lets_a_single_probe_through(self, breaker, clock):
+        for _ in range(3):
+            breaker.failure()
+        clock.now = 30
+
+        breaker.before_request()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.success()
+        assert breaker.state == "closed"
+        breaker.before_request()
+
+    def test_failed_probe_opens_the_circuit_again(self, breaker, clock):
+        for _ in range(3):
+            breaker.failure()
+        clock.now = 30
+
+        breaker.before_request()
+        breaker.failure()
+
+        assert breaker.state == "open"
+        assert breaker.stats["opened"] == 2
+        clock.now = 59
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+    def test_cancelled_probe_lets_another_through(self, breaker, clock):
+        for _ in range(3):
+            breaker.failure()
+        clock.now = 30
+
+        breaker.before_request()
+        breaker.release()
+
+        breaker.before_request()
+
+    def test_zero_threshold_never_opens(self, clock):
+        breaker = CircuitBreaker("github", threshold=0, clock=clock)
+        for _ in range(100):
+            breaker.failure()
+
+        breaker.before_request()
+        assert breaker.state == "closed"
+
+
+class TestHTTPClientBreakers:
+    async def test_server_errors_open_the_circuit(self, airtable):
+        clients = HTTPClients({"airtable": {"breaker_threshold": 2}})
+        airtable.fail("GET Mentors", status=503, times=2)
+        session = clients.get("airtable")
+        try:
+            for _ in range(2):
+                async with session.get(f"{airtable.url}/v0/appTEST/Mentors") as r:
+                    assert r.status == 503
+
+            with pytest.raises(aiohttp.ClientConnectionError):
+                await session.get(f"{airtable.url}/v0/appTEST/Mentors")
+
+            assert airtable.calls["GET Mentors"] == 2
+            assert clients.breakers()["airtable"]["state"] == "open"
+        finally:
+            await clients.close()
+
+    async def test_connection_errors_open_the_circuit(self):
+        clients = HTTPClients({"backend": {"breaker_threshold": 1}})
+        try:
+            with pytest.raises(aiohttp.ClientConnectionError):
+                await clients.get("backend").get("http://127.0.0.1:9/auth/login/")
+
+            with pytest.raises(CircuitOpenError):
+                await clients.get("backend").get("http://127.0.0.1:9/auth/login/")
+        finally:
+            await clients.close()
+
+    async def test_breaker_outlives_its_session(self):
+        clients = HTTPClients()
+        breaker = clients.breaker("slack")
+        await clients.get("slack").close()
+
+        clients.get("slack")
+
+        assert clients.breaker("slack") is breaker
+        await clients.close()
+
+    async def test_airtable_falls_back_while_open(self, airtable):
+        clients = HTTPClients({"airtable": {"breaker_threshold": 1}})
+        api = AirtableAPI(clients.get("airtable"), "key", "appTEST", api_root=f"{airtable.url}/v0/")
+        airtable.fail("GET Mentors")
+        try:
+            assert await api.get_record(Mentor, "recMENTOR001") is None
+            assert await api.get_record(Mentor, "recMENTOR001") is None
+
+            assert airtable.calls["GET Mentors"] == 1
+        finally:
+            await clients.close()
+
+    async def test_lunch_falls_back_while_yelp_is_open(self, bot):
+        breaker = bot.http_clients.breaker("yelp")
+        for _ in range(breaker.threshold):
+            breaker.failure()
+
+        response = await slash_lunch(Command(make_command("/lunch", "90210")), bot)
+
+        assert response["text"] == "Sorry, I couldn't connect to Yelp. Please try again later."
+        assert breaker.stats["rejected"] == 1
+
+
+async def test_breakers_endpoint_exposes_state(aiohttp_client):
+    bot = SirBot(http_clients={"yelp": {"breaker_threshold": 3}})
+    client = await aiohttp_client(bot)
+    bot.http_client("yelp")
+
+    res = await client.get("/sirbot/breakers")
+    body = await res.json()
+
+    assert body["breakers"]["yelp"]["state"] == "closed"
+    assert body["breakers"]["yelp"]["threshold"] == 3
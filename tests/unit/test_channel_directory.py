@@ -0,0 +1,140 @@
+"""Unit tests for Slack channel name to ID resolution."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import aiohttp
+import pytest
+
+from pybot._vendor.sirbot import SirBot
+from pybot._vendor.sirbot.plugins.slack import SlackPlugin
+from pybot._vendor.sirbot.plugins.slack.channels import ChannelDirectory
+from pybot._vendor.slack.events import Message, MessageRouter
+
+
+def fake_api(*pages):
+    """SlackAPI stand-in whose iter() yields the given channel pages."""
+    calls = []
+
+    async def iter_(url, data=None, **kwargs):
+        for page in pages:
+            calls.append(url)
+            for channel in page:
+                yield channel
+
+    api = MagicMock()
+    api.iter = iter_
+    api.calls = calls
+    return api
+
+
+class TestChannelDirectory:
+    async def test_resolves_configured_names(self):
+        directory = ChannelDirectory(["mentors-internal", "#greetings"])
+        api = fake_api(
+            [{"id": "C001", "name": "general"}, {"id": "C002", "name": "greetings"}],
+            [{"id": "C003", "name": "mentors-internal"}],
+        )
+
+        await directory.load(api)
+
+        assert directory.id("mentors-internal") == "C003"
+        assert directory.id("#greetings") == "C002"
+        assert directory.resolved == {"greetings": "C002", "mentors-internal": "C003"}
+
+    async def test_stops_paginating_once_all_names_are_found(self):
+        directory = ChannelDirectory(["general"])
+        api = fake_api([{"id": "C001", "name": "general"}], [{"id": "C002", "name": "other"}])
+
+        await directory.load(api)
+
+        assert len(api.calls) == 1
+
+    def test_unknown_names_resolve_to_themselves(self):
+        directory = ChannelDirectory(["moderators"])
+
+        assert directory.id("moderators") == "moderators"
+
+    def test_ids_are_not_watched(self):
+        directory = ChannelDirectory(["C0123ABCD", "*", "random"])
+
+        assert directory.names == {"random"}
+
+    def test_rename_moves_the_configured_name(self):
+        directory = ChannelDirectory(["greetings", "welcome"])
+        directory.update({"id": "C002", "name": "greetings"})
+
+        changed = directory.update({"id": "C002", "name": "welcome"})
+
+        assert changed
+        assert directory.id("welcome") == "C002"
+        assert directory.id("greetings") == "greetings"
+
+    def test_unrelated_channel_is_ignored(self):
+        directory = ChannelDirectory(["greetings"])
+
+        assert not directory.update({"id": "C009", "name": "random"})
+        assert directory.resolved == {}
+
+
+class TestMessageRouterChannels:
+    async def handler(self, event, app):
+        pass
+
+    def test_routes_move_to_channel_id(self):
+        router = MessageRouter()
+        router.register(".*", self.handler, channel="greetings")
+
+        router.resolve_channels({"greetings": "C002"}.get)
+
+        message = Message({"channel": "C002", "text": "hi"})
+        assert list(router.dispatch(message)) == [self.handler]
+
+    async def test_plugin_routes_by_id_after_channel_created(self):
+        plugin = SlackPlugin(token="token", verify="token", bot_user_id="U1", bot_id="B1")
+        plugin.on_message(".*", self.handler, channel="greetings")
+
+        await plugin._channel_changed(
+            {"type": "channel_created", "channel": {"id": "C002", "name": "greetings"}}, None
+        )
+
+        message = Message({"channel": "C002", "text": "hi"})
+        assert list(plugin.routers["message"].dispatch(message)) == [
+            (self.handler, {"mention": False, "admin": False, "wait": True})
+        ]
+
+    async def test_failed_load_is_raised(self):
+        async def iter_(url, data=None, **kwargs):
+            yield {"id": "C001", "name": "general"}
+            raise aiohttp.ClientConnectionError()
+
+        plugin = SlackPlugin(
+            token="token", verify="token", bot_user_id="U1", bot_id="B1", channels=["general", "x"]
+        )
+        plugin.on_message(".*", self.handler, channel="general")
+        plugin.api = MagicMock(iter=iter_)
+
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await plugin.load_channels(None)
+
+        message = Message({"channel": "C001", "text": "hi"})
+        assert len(list(plugin.routers["message"].dispatch(message))) == 1
+
+    async def test_failed_load_fails_the_warmup(self, aiohttp_client, unused_tcp_port):
+        plugin = SlackPlugin(
+            token="token",
+            verify="token",
+            bot_user_id="U1",
+            bot_id="B1",
+            channels=["general"],
+            api_url=f"http://127.0.0.1:{unused_tcp_port}/api/",
+        )
+        bot = SirBot()
+        bot.load_plugin(plugin)
+        await aiohttp_client(bot)
+
+        async with asyncio.timeout(5):
+            while not bot.ready:
+                await asyncio.sleep(0.01)
+
+        assert bot.warmup.status == {"slack_channels": "failed"}
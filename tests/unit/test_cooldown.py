@@ -0,0 +1,128 @@
+"""Unit tests for the expiring key store and the cooldowns of the message handlers."""
+
+import pytest
+
+from pybot._vendor.sirbot import SirBot
+from pybot._vendor.sirbot.plugins.slack.cooldown import Cooldown
+from pybot._vendor.sirbot.state import MemoryBackend, SQLiteBackend
+from pybot._vendor.sirbot.ttl import TTLStore
+from tests.fixtures import SlackMock
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def here_event(
+    user: str = "U000AA000", channel: str = "C000AA000", channel_type: str = "channel"
+) -> dict:
+    return {
+        "token": "supersecuretoken",
+        "team_id": "T000AAA0A",
+        "type": "event_callback",
+        "event": {
+            "type": "message",
+            "channel": channel,
+            "channel_type": channel_type,
+            "user": user,
+            "text": "<!here> anyone?",
+            "ts": "123456789.000001",
+        },
+    }
+
+
+class TestTTLStore:
+    def test_keys_expire(self):
+        clock = Clock()
+        store = TTLStore(10, clock=clock)
+
+        assert store.add("a")
+        assert not store.add("a")
+        clock.now = 10
+
+        assert "a" not in store
+        assert store.add("a", "value")
+        assert store.get("a") == "value"
+        assert store.pop("a") == "value"
+        assert len(store) == 0
+
+    def test_bounded(self):
+        clock = Clock()
+        store = TTLStore(10, maxsize=3, clock=clock)
+
+        for key in range(5):
+            store.set(key)
+            clock.now += 1
+
+        assert len(store) == 3
+        assert store.evicted == 2
+        assert 0 not in store and 4 in store
+
+    def test_expired_keys_are_dropped(self):
+        clock = Clock()
+        store = TTLStore(1, maxsize=3, clock=clock)
+
+        for key in range(100):
+            store.set(key)
+            clock.now += 0.5
+
+        assert len(store._data) <= 3
+        assert store.evicted == 0
+
+
+class TestCooldown:
+    async def test_scopes(self):
+        state = MemoryBackend()
+        cooldown = Cooldown("here_bad", {"user": 600, "channel": 60})
+
+        assert await cooldown.allow(state, {"user": "U1", "channel": "C1"})
+        # Same channel, or same user elsewhere
+        assert not await cooldown.allow(state, {"user": "U2", "channel": "C1"})
+        assert not await cooldown.allow(state, {"user": "U1", "channel": "C2"})
+        assert await cooldown.allow(state, {"user": "U2", "channel": "C2"})
+        assert cooldown.status()["suppressed"] == 2
+        assert await state.get("cooldown:here_bad:channel:C2") == 1
+
+    async def test_windows_are_shared_by_the_workers(self, tmp_path):
+        state = SQLiteBackend(str(tmp_path / "state.db"))
+        other_state = SQLiteBackend(str(tmp_path / "state.db"))
+        cooldown = Cooldown("here_bad", {"user": 600})
+        other_cooldown = Cooldown("here_bad", {"user": 600})
+
+        assert await cooldown.allow(state, {"user": "U1"})
+        assert not await other_cooldown.allow(other_state, {"user": "U1"})
+        await state.close()
+        await other_state.close()
+
+    def test_invalid_scopes(self):
+        with pytest.raises(ValueError):
+            Cooldown("here_bad", {"team": 60})
+
+
+async def test_auto_responders_cool_down(bot: SirBot, slack_mock: SlackMock, aiohttp_client):
+    client = await aiohttp_client(bot)
+
+    for user in ("U000AA000", "U000AA000", "U000AA001"):
+        await client.post("/slack/events", json=here_event(user))
+    await client.post("/slack/events", json=here_event("U000AA001", "C000AA001"))
+
+    assert len(slack_mock.get_calls("chat.postMessage")) == 2
+    response = await client.get("/slack/cooldowns")
+    assert (await response.json())["here_bad"]["suppressed"] == 2
+
+
+async def test_ignored_messages_dont_start_a_window(
+    bot: SirBot, slack_mock: SlackMock, aiohttp_client
+):
+    client = await aiohttp_client(bot)
+
+    await client.post("/slack/events", json=here_event(channel="D000AA000", channel_type="im"))
+    await client.post("/slack/events", json=here_event())
+
+    assert len(slack_mock.get_calls("chat.postMessage")) == 1
+    response = await client.get("/slack/cooldowns")
+    assert (await response.json())["here_bad"]["suppressed"] == 0
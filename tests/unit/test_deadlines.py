@@ -0,0 +1,71 @@
+"""Unit tests for the deadlines of the dispatched handlers."""
+
+import asyncio
+
+import pytest
+
+from pybot._vendor.sirbot import SirBot
+from pybot._vendor.sirbot.deadlines import DeadlineExceeded, Deadlines
+from pybot._vendor.sirbot.plugins.slack.endpoints import handle_event
+from pybot._vendor.slack.events import Event
+
+
+async def slow(seconds=1):
+    await asyncio.sleep(seconds)
+    return "done"
+
+
+async def timing_out():
+    raise TimeoutError("upstream")
+
+
+class TestDeadlines:
+    async def test_handler_past_its_deadline_is_cancelled(self):
+        deadlines = Deadlines(default=0.01)
+
+        with pytest.raises(DeadlineExceeded):
+            await deadlines.run(slow, {})
+
+        assert deadlines.status() == {"default": 0.01, "exceeded": {"slow": 1}}
+
+    async def test_configured_deadline_overrides_the_default(self):
+        deadlines = Deadlines(default=0.01)
+
+        assert await deadlines.run(slow, {"deadline": 1}, 0.05) == "done"
+
+    async def test_no_default_deadline(self):
+        deadlines = Deadlines(default=None)
+
+        assert await deadlines.run(slow, {}, 0.05) == "done"
+
+    async def test_timeouts_of_the_handler_are_not_counted(self):
+        deadlines = Deadlines(default=1)
+
+        with pytest.raises(TimeoutError) as e:
+            await deadlines.run(timing_out, {})
+
+        assert not isinstance(e.value, DeadlineExceeded)
+        assert deadlines.exceeded == {}
+
+
+async def test_event_handler_past_its_deadline_fails_the_request(bot):
+    async def hanging(event, app):
+        await asyncio.sleep(10)
+
+    bot.plugins["slack"].on_event("reaction_added", hanging, deadline=0.01)
+
+    res = await handle_event(Event({"type": "reaction_added"}), bot)
+
+    assert res.status == 500
+    assert bot.deadlines.exceeded[hanging.__qualname__] == 1
+
+
+async def test_deadlines_endpoint_exposes_timeouts(aiohttp_client):
+    bot = SirBot(handler_deadline=0.01)
+    client = await aiohttp_client(bot)
+    with pytest.raises(DeadlineExceeded):
+        await bot.deadlines.run(slow, {})
+
+    res = await client.get("/sirbot/deadlines")
+
+    assert await res.json() == {"default": 0.01, "exceeded": {"slow": 1}}
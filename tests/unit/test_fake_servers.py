@@ -0,0 +1,116 @@
+"""Unit tests for the Slack and Airtable stand-in servers and the load generator."""
+
+import aiohttp
+import pytest
+
+from pybot._vendor.slack import methods
+from pybot._vendor.slack.exceptions import HTTPException, RateLimited
+from pybot._vendor.slack.io.aiohttp import SlackAPI
+from pybot.plugins.airtable.api import AirtableAPI
+from tests import load
+from tests.fixtures.servers import FakeAirtable, FakeSlack
+
+
+@pytest.fixture
+async def session():
+    async with aiohttp.ClientSession() as s:
+        yield s
+
+
+class TestFakeSlack:
+    async def test_api_calls_are_sent_to_root_url(self, session):
+        async with FakeSlack() as slack:
+            api = SlackAPI(session=session, token="token", root_url=f"{slack.url}/api")
+
+            response = await api.query(methods.CHAT_POST_MESSAGE, {"channel": "C1", "text": "hi"})
+
+            assert response["ts"]
+            assert slack.calls["chat.postMessage"] == 1
+            assert slack.get_calls("chat.postMessage")[0][1]["text"] == "hi"
+
+    async def test_conversations_list_is_paginated(self, session):
+        async with FakeSlack(channels=[f"channel-{i}" for i in range(5)]) as slack:
+            api = SlackAPI(session=session, token="token", root_url=f"{slack.url}/api/")
+
+            channels = [c["name"] async for c in api.iter(methods.CONVERSATIONS_LIST, limit=2)]
+
+            assert channels == [f"channel-{i}" for i in range(5)]
+            assert slack.calls["conversations.list"] == 3
+
+    async def test_injected_failures(self, session):
+        async with FakeSlack(retry_after=7) as slack:
+            api = SlackAPI(session=session, token="token", root_url=f"{slack.url}/api/")
+            slack.fail("users.info", status=429).fail("users.info", status=500)
+
+            with pytest.raises(RateLimited) as e:
+                await api.query(methods.USERS_INFO, {"user": "U1"})
+            assert e.value.retry_after == 7
+
+            with pytest.raises(HTTPException):
+                await api.query(methods.USERS_INFO, {"user": "U1"})
+
+            response = await api.query(methods.USERS_INFO, {"user": "U1"})
+            assert response["user"]["id"] == "U1"
+            assert slack.calls["users.info"] == 3
+
+
+class TestFakeAirtable:
+    async def test_records_are_paginated(self, session):
+        async with FakeAirtable(page_size=5) as airtable:
+            api = AirtableAPI(session, "key", "appTEST", api_root=f"{airtable.url}/v0")
+
+            mentors = await api.find_mentors_with_matching_skillsets("Python")
+
+            assert airtable.calls["GET Mentors"] == 3
+            assert {m.slack_name for m in mentors} >= {"mentor3", "mentor12"}
+
+    async def test_filter_by_formula(self, session):
+        async with FakeAirtable() as airtable:
+            api = AirtableAPI(session, "key", "appTEST", api_root=f"{airtable.url}/v0/")
+
+            records = await api.find_records("Mentors", "Email", "MENTOR1")
+
+            assert {r["id"] for r in records} == {
+                "recMENTOR001",
+                "recMENTOR010",
+                "recMENTOR011",
+                "recMENTOR012",
+            }
+
+    async def test_created_records_can_be_read_back(self, session):
+        async with FakeAirtable() as airtable:
+            api = AirtableAPI(session, "key", "appTEST", api_root=f"{airtable.url}/v0/")
+
+            created = await api.add_record("Mentor Request", {"fields": {"Email": "a@b.c"}})
+            row = await api.get_row_from_record_id("Mentor Request", created["id"])
+
+            assert row == {"Email": "a@b.c"}
+
+
+class TestLoadGenerator:
+    async def test_report_per_scenario(self):
+        scenarios = [
+            s
+            for s in load.default_scenarios()
+            if s.name in ("command:/roll", "action:claim_mentee", "airtable:mentor_request")
+        ]
+
+        report = await load.run(rate=200, requests=5, scenarios=scenarios)
+
+        assert list(report) == [s.name for s in scenarios]
+        for result in report.values():
+            assert result["statuses"] == {"200": 5}
+            assert result["ack_ms"]["count"] == 5
+        assert report["command:/roll"]["handler_ms"]["count"] == 5
+        # Claims of the same request made within the write window share an update
+        patches = report["action:claim_mentee"]["outbound"]["airtable"]["PATCH Mentor Request"]
+        assert 1 <= patches < 5
+        assert report["airtable:mentor_request"]["outbound"]["slack"]["chat.postMessage"] >= 5
+
+    def test_percentiles(self):
+        result = load.percentiles([i / 1000 for i in range(1, 101)])
+
+        assert result["count"] == 100
+        assert result["p50"] == pytest.approx(50.5)
+        assert result["p99"] == pytest.approx(99.01)
+        assert result["max"] == 100
@@ -11,6 +11,7 @@ import pytest
 
 from pybot.endpoints.slack.utils.slash_lunch import LunchCommand
 from pybot.plugins.airtable.api import AirtableAPI
+from pybot.plugins.airtable.records import Mentor
 
 
 class TestLunchCommandEmptyBusinesses:
@@ -192,7 +193,7 @@ class TestMentorRequestEmptyService:
 
         # Mock airtable that returns empty records
         mock_airtable = AsyncMock()
-        mock_airtable.find_records.return_value = []
+        mock_airtable.find.return_value = []
 
         result = await request.submit_request("testuser", "test@example.com", mock_airtable)
 
@@ -205,12 +206,12 @@ class TestEmptyMentorDict:
 
     @pytest.mark.asyncio
     async def test_get_requested_mentor_handles_empty_mentor(self):
-        """When mentor record is empty dict, should return None."""
+        """When the mentor record is not found, should return None."""
         from pybot.endpoints.airtable.utils import _get_requested_mentor
 
         mock_slack = AsyncMock()
         mock_airtable = AsyncMock()
-        mock_airtable.get_row_from_record_id.return_value = {}  # Empty dict
+        mock_airtable.get_record.return_value = None  # Record not found
 
         result = await _get_requested_mentor("rec123", mock_slack, mock_airtable)
 
@@ -223,7 +224,9 @@ class TestEmptyMentorDict:
 
         mock_slack = AsyncMock()
         mock_airtable = AsyncMock()
-        mock_airtable.get_row_from_record_id.return_value = {"Name": "John Doe"}  # No Email field
+        mock_airtable.get_record.return_value = Mentor(
+            id="rec123", name="John Doe"
+        )  # No Email field
 
         result = await _get_requested_mentor("rec123", mock_slack, mock_airtable)
 
@@ -237,8 +240,8 @@ class TestEmptyMentorDict:
         mock_slack = AsyncMock()
         mock_airtable = AsyncMock()
         mock_airtable.find_mentors_with_matching_skillsets.return_value = [
-            {"Slack Name": "johndoe"},  # No Email
-            {"Email": "jane@example.com", "Slack Name": "janedoe"},
+            Mentor(id="rec1", slack_name="johndoe"),  # No Email
+            Mentor(id="rec2", email="jane@example.com", slack_name="janedoe"),
         ]
         mock_slack.query.return_value = {"user": {"id": "U123"}}
 
@@ -0,0 +1,77 @@
+"""Unit tests for the per-upstream HTTP client registry."""
+
+import pytest
+
+from pybot._vendor.sirbot import SirBot
+from pybot._vendor.sirbot.clients import ClientSettings, HTTPClients
+
+
+class TestHTTPClients:
+    async def test_sessions_are_per_upstream(self):
+        clients = HTTPClients()
+        try:
+            assert clients.get("slack") is clients.get("slack")
+            assert clients.get("slack") is not clients.get("airtable")
+        finally:
+            await clients.close()
+
+    async def test_session_uses_registered_settings(self):
+        clients = HTTPClients({"airtable": {"limit": 10, "limit_per_host": 5, "read_timeout": 15}})
+        try:
+            session = clients.get("airtable")
+
+            assert session.connector.limit == 10
+            assert session.connector.limit_per_host == 5
+            assert session.timeout.sock_read == 15
+            assert session.timeout.connect == ClientSettings().connect_timeout
+        finally:
+            await clients.close()
+
+    async def test_unregistered_upstream_uses_defaults(self):
+        clients = HTTPClients()
+        try:
+            assert clients.get("github").connector.limit == ClientSettings().limit
+        finally:
+            await clients.close()
+
+    async def test_register_after_creation_fails(self):
+        clients = HTTPClients()
+        try:
+            clients.get("yelp")
+            with pytest.raises(RuntimeError):
+                clients.register("yelp", limit=1)
+        finally:
+            await clients.close()
+
+    async def test_stats_report_pool_utilization(self):
+        clients = HTTPClients({"backend": {"limit": 4}})
+        try:
+            clients.get("backend")
+
+            stats = clients.stats()
+
+            assert stats["backend"]["limit"] == 4
+            assert stats["backend"]["in_use"] == 0
+            assert stats["backend"]["utilization"] == 0.0
+        finally:
+            await clients.close()
+
+    async def test_close_closes_every_session(self):
+        clients = HTTPClients()
+        session = clients.get("slack")
+
+        await clients.close()
+
+        assert session.closed
+        assert clients.stats() == {}
+
+
+async def test_clients_endpoint_exposes_stats(aiohttp_client):
+    bot = SirBot(http_clients={"slack": {"limit": 7}})
+    client = await aiohttp_client(bot)
+    bot.http_client("slack")
+
+    res = await client.get("/sirbot/clients")
+    body = await res.json()
+
+    assert body["clients"]["slack"]["limit"] == 7
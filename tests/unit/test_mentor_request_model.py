@@ -14,6 +14,7 @@ from pybot.endpoints.slack.message_templates.mentor_request import (
     MentorRequest,
     MentorRequestClaim,
 )
+from pybot.plugins.airtable.records import Service
 from tests.data.blocks import make_claim_mentee_action, make_mentor_request_action
 
 
@@ -281,7 +282,7 @@ class TestMentorRequestSubmission:
         request = MentorRequest(action)
 
         mock_airtable = AsyncMock()
-        mock_airtable.find_records.return_value = []
+        mock_airtable.find.return_value = []
 
         result = await request.submit_request("testuser", "test@example.com", mock_airtable)
 
@@ -300,7 +301,7 @@ class TestMentorRequestSubmission:
         request = MentorRequest(action)
 
         mock_airtable = AsyncMock()
-        mock_airtable.find_records.return_value = [{"id": "recSVC001"}]
+        mock_airtable.find.return_value = [Service(id="recSVC001", name="Resume Review")]
         mock_airtable.add_record.return_value = {"id": "recREQ001"}
 
         await request.submit_request("testuser", "test@example.com", mock_airtable)
@@ -321,7 +322,7 @@ class TestMentorRequestSubmission:
         request = MentorRequest(action)
 
         mock_airtable = AsyncMock()
-        mock_airtable.find_records.return_value = [{"id": "recSVC001"}]
+        mock_airtable.find.return_value = [Service(id="recSVC001", name="Resume Review")]
         mock_airtable.add_record.return_value = {"id": "recREQ001"}
 
         await request.submit_request("testuser", "test@example.com", mock_airtable)
@@ -339,7 +340,7 @@ class TestMentorRequestSubmission:
         request = MentorRequest(action)
 
         mock_airtable = AsyncMock()
-        mock_airtable.find_records.return_value = [{"id": "recSVC001"}]
+        mock_airtable.find.return_value = [Service(id="recSVC001", name="Resume Review")]
         mock_airtable.add_record.return_value = {"id": "recREQ001"}
 
         await request.submit_request("testuser", "test@example.com", mock_airtable)
@@ -0,0 +1,98 @@
+"""Unit tests for the store of the interactive messages posted by the bot."""
+
+import aiohttp
+
+from pybot._vendor.sirbot.plugins.slack.message_store import MessageStore
+from pybot._vendor.sirbot.state import MemoryBackend, SQLiteBackend
+from pybot._vendor.slack import methods
+from pybot._vendor.slack.io.aiohttp import SlackAPI
+from pybot._vendor.slack.templates import Template
+from tests.fixtures.servers import FakeSlack
+
+BLOCKS = [{"type": "section", "block_id": "form", "text": {"type": "mrkdwn", "text": "Form"}}]
+
+
+class TestMessageStore:
+    async def test_posted_messages_are_recorded(self):
+        store = MessageStore(MemoryBackend(), block_ids=["form"])
+        response = {"ok": True, "channel": "D1", "ts": "1.0", "message": {"blocks": BLOCKS}}
+
+        await store.record("chat.postMessage", {"channel": "U1", "blocks": BLOCKS}, response)
+
+        assert await store.get("D1", "1.0") == {"blocks": BLOCKS}
+        assert await store.get("D1", "2.0") is None
+        assert store.stats == {"recorded": 1, "hits": 1, "misses": 1}
+
+    async def test_updates_fall_back_to_the_data_sent(self):
+        store = MessageStore(MemoryBackend(), block_ids=["form"])
+        data = {"channel": "D1", "ts": "1.0", "blocks": BLOCKS, "attachments": []}
+
+        await store.record("chat.update", data, {"ok": True, "channel": "D1", "ts": "1.0"})
+
+        assert (await store.get("D1", "1.0"))["blocks"] == BLOCKS
+
+    async def test_other_messages_are_ignored(self):
+        store = MessageStore(MemoryBackend(), block_ids=["form"], callback_ids=["claim"])
+        response = {"ok": True, "channel": "C1", "ts": "1.0", "message": {"text": "hi"}}
+        other = [{"type": "section", "block_id": "other", "text": {"type": "mrkdwn", "text": "."}}]
+
+        await store.record("chat.postMessage", {"text": "hi"}, response)
+        await store.record("chat.postEphemeral", {"blocks": BLOCKS}, {**response, "ts": "2.0"})
+        await store.record("chat.postMessage", {"blocks": other}, {**response, "ts": "3.0"})
+        await store.record(
+            "chat.postMessage", {"attachments": [{"callback_id": "x"}]}, {**response, "ts": "4.0"}
+        )
+
+        assert store.stats["recorded"] == 0
+
+    async def test_copies_are_returned(self):
+        store = MessageStore(MemoryBackend())
+        await store.set("D1", "1.0", {"blocks": BLOCKS})
+
+        (await store.get("D1", "1.0"))["blocks"].clear()
+
+        assert (await store.get("D1", "1.0"))["blocks"] == BLOCKS
+
+    async def test_messages_are_shared_by_the_workers(self, tmp_path):
+        state = SQLiteBackend(str(tmp_path / "state.db"))
+        other_state = SQLiteBackend(str(tmp_path / "state.db"))
+
+        await MessageStore(state).set("D1", "1.0", {"blocks": BLOCKS})
+
+        assert (await MessageStore(other_state).get("D1", "1.0"))["blocks"] == BLOCKS
+        await state.close()
+        await other_state.close()
+
+    async def test_attachments_are_recorded_by_callback_id(self):
+        store = MessageStore(MemoryBackend(), callback_ids=["claim"])
+        data = {"channel": "C1", "attachments": [{"callback_id": "claim", "text": "Claim"}]}
+
+        await store.record("chat.postMessage", data, {"ok": True, "channel": "C1", "ts": "1.0"})
+
+        assert (await store.get("C1", "1.0"))["attachments"][0]["text"] == "Claim"
+
+    async def test_rendered_templates_are_recorded(self, tmp_path):
+        state = SQLiteBackend(str(tmp_path / "state.db"))
+        store = MessageStore(state, block_ids=["form"])
+        blocks = Template(BLOCKS).render()
+        attachments = Template([{"callback_id": "claim", "text": "${text}"}]).render(text="Hi")
+        data = {"channel": "D1", "blocks": blocks, "attachments": attachments}
+
+        await store.record("chat.update", data, {"ok": True, "channel": "D1", "ts": "1.0"})
+
+        message = await store.get("D1", "1.0")
+        assert message["blocks"] == BLOCKS
+        assert message["attachments"] == [{"callback_id": "claim", "text": "Hi"}]
+        await state.close()
+
+    async def test_response_hook(self):
+        store = MessageStore(MemoryBackend(), block_ids=["form"])
+        async with FakeSlack() as slack, aiohttp.ClientSession() as session:
+            api = SlackAPI(session=session, token="token", root_url=f"{slack.url}/api")
+            api.response_hooks.append(store.record)
+
+            response = await api.query(
+                methods.CHAT_POST_MESSAGE, {"channel": "D1", "text": "Form", "blocks": BLOCKS}
+            )
+
+        assert (await store.get("D1", response["ts"]))["blocks"] == BLOCKS
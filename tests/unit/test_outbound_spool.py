@@ -0,0 +1,154 @@
+"""Unit tests for the durable Slack outbound spool, against the FakeSlack stand-in."""
+
+import asyncio
+import sqlite3
+
+import aiohttp
+import pytest
+
+from pybot._vendor.sirbot.plugins.slack.spool import OutboundSpool
+from pybot._vendor.slack.io.aiohttp import SlackAPI
+from tests.fixtures.servers import FakeSlack
+
+
+@pytest.fixture
+async def fake_slack():
+    async with FakeSlack(retry_after=0) as slack:
+        yield slack
+
+
+@pytest.fixture
+async def api(fake_slack):
+    async with aiohttp.ClientSession() as session:
+        yield SlackAPI(session=session, token="xoxb-token", root_url=f"{fake_slack.url}/api/")
+
+
+def make_spool(tmp_path, **kwargs) -> OutboundSpool:
+    kwargs.setdefault("min_backoff", 0.01)
+    return OutboundSpool(str(tmp_path / "spool.db"), **kwargs)
+
+
+async def wait_sent(spool: OutboundSpool, count: int) -> None:
+    async with asyncio.timeout(2):
+        while spool.stats["sent"] + spool.stats["failed"] < count:
+            await asyncio.sleep(0.005)
+
+
+def statuses(tmp_path) -> list[str]:
+    with sqlite3.connect(tmp_path / "spool.db") as db:
+        return [row[0] for row in db.execute("SELECT status FROM outbox ORDER BY id")]
+
+
+class TestDelivery:
+    async def test_channels_keep_their_order(self, tmp_path, api, fake_slack):
+        spool = make_spool(tmp_path, workers=3)
+        await spool.start(api)
+
+        for i in range(5):
+            for channel in ("C1", "C2"):
+                await spool.enqueue({"channel": channel, "text": str(i)})
+        await wait_sent(spool, 10)
+        await spool.stop()
+
+        for channel in ("C1", "C2"):
+            assert [m["text"] for m in fake_slack.messages[channel]] == ["0", "1", "2", "3", "4"]
+        assert statuses(tmp_path) == ["sent"] * 10
+
+    async def test_replies_are_threaded_to_the_parent(self, tmp_path, api, fake_slack):
+        spool = make_spool(tmp_path)
+        await spool.start(api)
+        fake_slack.fail("chat.postMessage", status=500)
+
+        parent = await spool.enqueue({"channel": "C1", "text": "parent"})
+        await spool.enqueue({"channel": "C1", "text": "child"}, thread_of=parent)
+        await wait_sent(spool, 2)
+        await spool.stop()
+
+        parent_message, child_message = fake_slack.messages["C1"]
+        assert child_message["thread_ts"] == parent_message["ts"]
+        assert spool.stats["retried"] == 1
+
+    async def test_replies_of_a_failed_parent_are_dropped(self, tmp_path, api, fake_slack):
+        spool = make_spool(tmp_path, max_attempts=2)
+        await spool.start(api)
+        fake_slack.fail("chat.postMessage", status=500, times=2)
+
+        parent = await spool.enqueue({"channel": "C1", "text": "parent"})
+        await spool.enqueue({"channel": "C1", "text": "child"}, thread_of=parent)
+        await wait_sent(spool, 2)
+        await spool.stop()
+
+        assert fake_slack.calls["chat.postMessage"] == 2
+        assert statuses(tmp_path) == ["failed", "failed"]
+
+    async def test_rate_limit_pauses_delivery(self, tmp_path, api, fake_slack):
+        spool = make_spool(tmp_path)
+        await spool.start(api)
+        fake_slack.fail("chat.postMessage", status=429)
+
+        await spool.enqueue({"channel": "C1", "text": "hi"})
+        await wait_sent(spool, 1)
+        await spool.stop()
+
+        assert spool.stats["ratelimited"] == 1
+        assert [m["text"] for m in fake_slack.messages["C1"]] == ["hi"]
+
+    async def test_replies_to_a_parent_no_longer_cached(self, tmp_path, api, fake_slack):
+        spool = make_spool(tmp_path)
+        spool._timestamps.maxsize = 1
+        await spool.start(api)
+
+        parent = await spool.enqueue({"channel": "C1", "text": "parent"})
+        await spool.enqueue({"channel": "C2", "text": "other"})
+        await wait_sent(spool, 2)
+        await spool.enqueue({"channel": "C1", "text": "child"}, thread_of=parent)
+        await wait_sent(spool, 3)
+        await spool.stop()
+
+        assert len(spool._timestamps) == 1
+        parent_message, child_message = fake_slack.messages["C1"]
+        assert child_message["thread_ts"] == parent_message["ts"]
+
+    async def test_enqueue_after_stop_fails(self, tmp_path, api):
+        spool = make_spool(tmp_path)
+        await spool.start(api)
+        await spool.stop()
+
+        with pytest.raises(RuntimeError):
+            await spool.enqueue({"channel": "C1", "text": "late"})
+
+
+class TestDurability:
+    async def test_pending_messages_survive_a_restart(self, tmp_path, api, fake_slack):
+        spool = make_spool(tmp_path)
+        await spool.start(api)
+        parent = await spool.enqueue({"channel": "C1", "text": "now"})
+        await wait_sent(spool, 1)
+        await spool.enqueue({"channel": "C1", "text": "later"}, thread_of=parent, delay=0.1)
+        await spool.stop()
+
+        assert statuses(tmp_path) == ["sent", "pending"]
+
+        restarted = make_spool(tmp_path)
+        await restarted.start(api)
+        assert restarted.pending == 1
+        await wait_sent(restarted, 1)
+        await restarted.stop()
+
+        first, second = fake_slack.messages["C1"]
+        assert second["text"] == "later"
+        assert second["thread_ts"] == first["ts"]
+
+    async def test_writes_are_committed_together(self, tmp_path, api, monkeypatch):
+        spool = make_spool(tmp_path, workers=0, flush_interval=0.01)
+        commits = []
+        commit = spool._commit
+        monkeypatch.setattr(
+            spool, "_commit", lambda batch: commits.append(len(batch)) or commit(batch)
+        )
+        await spool.start(api)
+
+        await asyncio.gather(*(spool.enqueue({"channel": f"C{i}"}) for i in range(20)))
+        await spool.stop()
+
+        assert commits[0] == 20
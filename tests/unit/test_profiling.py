@@ -0,0 +1,101 @@
+"""Unit tests for the event loop profiler and stall detector."""
+
+import asyncio
+import time
+
+import pytest
+
+from pybot._vendor.sirbot.deadlines import Deadlines
+from pybot._vendor.sirbot.profiling import SamplingProfiler, StallDetector
+from pybot._vendor.slack.actions import Action
+from pybot._vendor.slack.events import Event
+
+
+async def blocking(payload, app, seconds=0.2):
+    time.sleep(seconds)
+
+
+async def busy(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        time.sleep(0.002)
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def deadlines():
+    return Deadlines()
+
+
+@pytest.fixture
+async def detector(deadlines):
+    detector = StallDetector(threshold=0.05, describe=deadlines.describe)
+    await detector.start()
+    yield detector
+    await detector.stop()
+
+
+class TestSamplingProfiler:
+    async def test_stacks_are_collapsed(self):
+        profiler = SamplingProfiler(interval=0.001)
+
+        stacks, _ = await asyncio.gather(profiler.profile(0.1), busy(0.1))
+
+        lines = [line.rsplit(" ", 1) for line in stacks.splitlines()]
+        assert all(count.isdigit() for _, count in lines)
+        assert any(stack.endswith(f"{__name__}:busy") for stack, _ in lines)
+
+    async def test_single_profile_at_a_time(self):
+        profiler = SamplingProfiler()
+        first = asyncio.ensure_future(profiler.profile(0.05))
+        await asyncio.sleep(0)
+
+        with pytest.raises(RuntimeError):
+            await profiler.profile(0.05)
+
+        await first
+        assert not profiler.running
+
+
+class TestStallDetector:
+    async def test_stall_is_attributed_to_the_handler(self, detector, deadlines):
+        await deadlines.run(blocking, {}, Event({"type": "team_join"}), None)
+        await asyncio.sleep(0.1)
+
+        status = detector.status()
+        assert status["detected"] == 1
+        assert status["by_handler"] == {"blocking": 1}
+        stall = status["stalls"][0]
+        assert stall["handler"] == {"handler": "blocking", "type": "team_join"}
+        assert stall["duration"] >= 0.1
+        assert stall["stack"][-1] == f"{__name__}:blocking"
+
+    async def test_block_actions_are_described(self, detector, deadlines):
+        action = Action(
+            {
+                "type": "block_actions",
+                "actions": [{"block_id": "mentor_service", "action_id": "select"}],
+            }
+        )
+
+        await deadlines.run(blocking, {}, action, None)
+        await asyncio.sleep(0.1)
+
+        assert detector.stalls[0]["handler"] == {
+            "handler": "blocking",
+            "type": "block_actions",
+            "block_id": "mentor_service",
+            "action_id": "select",
+        }
+
+    async def test_stalls_outside_handlers_are_unknown(self, detector):
+        time.sleep(0.15)
+        await asyncio.sleep(0.1)
+
+        assert detector.stalls[0]["handler"] is None
+        assert detector.by_handler == {"unknown": 1}
+
+    async def test_no_stall_while_the_loop_runs(self, detector):
+        await busy(0.2)
+
+        assert detector.stats["detected"] == 0
@@ -0,0 +1,81 @@
+"""Unit tests for the /repeat catalog loaded from its YAML file."""
+
+import os
+
+import pytest
+
+from pybot.endpoints.slack.utils.slash_repeat import RepeatCatalog, repeat_items
+
+CATALOG = """
+- names: [ask, Asking]
+  link: http://sol.gfxile.net/dontask.html
+  title: Asking Questions
+  pretext: You can just ask
+"""
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "repeat.yml"
+    path.write_text(CATALOG)
+    return path
+
+
+def rewrite(path, text):
+    mtime = path.stat().st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+class TestRepeatCatalog:
+    def test_lookup(self, path):
+        catalog = RepeatCatalog(path)
+
+        assert catalog.get("ASKING") is catalog.get("ask")
+        assert catalog.get("nope") is None
+        assert catalog.get("ask").render(slack_id="U1").value == [
+            {
+                "pretext": "<@U1>: You can just ask",
+                "title": "Asking Questions",
+                "title_link": "http://sol.gfxile.net/dontask.html",
+            }
+        ]
+        assert (
+            catalog.help
+            == 'That is not a valid option valid options are:\n ->\t"ask"\n->\t"asking"\n'
+        )
+
+    def test_reloaded_when_changed(self, path):
+        catalog = RepeatCatalog(path, check_interval=0)
+
+        rewrite(path, CATALOG.replace("ask, Asking", "merge"))
+
+        assert catalog.get("ask") is None
+        assert catalog.get("merge")
+        assert "merge" in catalog.help
+
+    def test_broken_file_keeps_the_replies(self, path):
+        catalog = RepeatCatalog(path, check_interval=0)
+
+        rewrite(path, "- names: [ask]\n  title: ${oops}\n  link: x\n  pretext: y\n")
+
+        assert catalog.get("ask")
+        assert catalog.get("asking")
+
+    def test_checks_are_throttled(self, path):
+        catalog = RepeatCatalog(path, check_interval=60)
+
+        rewrite(path, CATALOG.replace("ask, Asking", "merge"))
+
+        assert catalog.get("ask")
+
+
+def test_repeat_items():
+    reply = repeat_items("resources", "U1", "C1")
+    unknown = repeat_items("nope", "U1", "C1")
+
+    assert reply["type"] == "message"
+    assert reply["message"]["channel"] == "C1"
+    assert reply["message"]["attachments"][0]["pretext"].startswith("<@U1>: ")
+    assert unknown["type"] == "ephemeral"
+    assert '"resource"' in unknown["message"]["text"]
@@ -0,0 +1,73 @@
+"""Unit tests for the frozen dispatch tables of the Slack event, command and action routers."""
+
+import pytest
+
+from pybot._vendor.slack.actions import Action
+from pybot._vendor.slack.actions import Router as ActionRouter
+from pybot._vendor.slack.commands import Command
+from pybot._vendor.slack.commands import Router as CommandRouter
+from pybot._vendor.slack.events import Event, EventRouter
+
+
+def make_block_action(block_id: str, action_id: str) -> Action:
+    action = {"type": "button", "block_id": block_id, "action_id": action_id}
+    return Action({"type": "block_actions", "actions": [action]})
+
+
+class TestEventRouter:
+    def test_dispatch_by_type_and_detail(self):
+        router = EventRouter()
+        router.register("message", "any")
+        router.register("message", "bot", subtype="bot_message")
+        router.freeze()
+
+        event = Event({"type": "message", "subtype": "bot_message"})
+
+        assert list(router.dispatch(event)) == ["any", "bot"]
+        assert list(router.dispatch(Event({"type": "message"}))) == ["any"]
+
+    def test_table_is_immutable(self):
+        router = EventRouter()
+        router.register("team_join", "handler")
+
+        table = router.freeze()
+
+        assert table["team_join"] == (("handler",), ())
+        with pytest.raises(TypeError):
+            table["team_join"] = ()
+
+    def test_late_registration_is_dispatched(self):
+        router = EventRouter()
+        router.register("team_join", "first")
+        router.freeze()
+
+        router.register("team_join", "second")
+
+        assert list(router.dispatch(Event({"type": "team_join"}))) == ["first", "second"]
+
+
+class TestCommandRouter:
+    def test_unknown_command_does_not_add_a_route(self):
+        router = CommandRouter()
+        router.register("/roll", "roll")
+        router.freeze()
+
+        assert list(router.dispatch(Command({"command": "/nope"}))) == []
+        assert list(router.dispatch(Command({"command": "/roll"}))) == ["roll"]
+        assert set(router._routes) == {"/roll"}
+
+
+class TestActionRouter:
+    def test_unknown_block_id_does_not_add_a_route(self):
+        router = ActionRouter()
+        router.register_block_action("mentor", "any")
+        router.register_block_action("mentor", "submit", action_id="submit_btn")
+        router.freeze()
+
+        assert list(router.dispatch(make_block_action("mentor", "submit_btn"))) == ["submit"]
+        assert list(router.dispatch(make_block_action("mentor", "other"))) == ["any"]
+        for i in range(10):
+            assert list(router.dispatch(make_block_action(f"random-{i}", "x"))) == []
+
+        assert set(router._routes) == {"mentor"}
+        assert set(router.freeze()) == {"mentor"}
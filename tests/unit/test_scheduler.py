@@ -0,0 +1,209 @@
+"""Unit tests for the leader-elected background job scheduler."""
+
+import asyncio
+import time
+from datetime import UTC, datetime
+
+import aiohttp
+import pytest
+
+from pybot._vendor.sirbot import SirBot
+from pybot._vendor.sirbot.scheduler import Cron, FileLease, Scheduler
+from pybot._vendor.sirbot.state import MemoryBackend
+from pybot.plugins.airtable.api import AirtableAPI
+from tests.fixtures.servers import FakeAirtable
+
+
+def timestamp(*args) -> float:
+    return datetime(*args, tzinfo=UTC).timestamp()
+
+
+def make_scheduler(state=None, worker=0, **kwargs) -> Scheduler:
+    bot = SirBot(state=state)
+    bot["worker"] = worker
+    return Scheduler(bot, tick=0.01, **kwargs)
+
+
+class Counter:
+    def __init__(self, duration: float = 0):
+        self.calls = 0
+        self.duration = duration
+
+    async def __call__(self, app):
+        self.calls += 1
+        await asyncio.sleep(self.duration)
+
+
+class TestCron:
+    def test_next_run_times(self):
+        every_quarter = Cron("*/15 * * * *")
+        weekdays_at_nine = Cron("0 9 * * 1-5")
+        first_or_sunday = Cron("30 6 1 * 0")
+
+        assert every_quarter.next(timestamp(2026, 3, 6, 10, 14, 59)) == timestamp(
+            2026, 3, 6, 10, 15
+        )
+        assert every_quarter.next(timestamp(2026, 3, 6, 10, 15)) == timestamp(2026, 3, 6, 10, 30)
+        # Friday evening to Monday morning
+        assert weekdays_at_nine.next(timestamp(2026, 3, 6, 18)) == timestamp(2026, 3, 9, 9)
+        # Either the 1st or a Sunday
+        assert first_or_sunday.next(timestamp(2026, 3, 2)) == timestamp(2026, 3, 8, 6, 30)
+        assert Cron("0 0 29 2 *").next(timestamp(2026, 3, 1)) == timestamp(2028, 2, 29)
+
+    @pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "5-1 * * * *", "*/0 * * * *"])
+    def test_invalid_expressions(self, expression):
+        with pytest.raises(ValueError):
+            Cron(expression)
+
+
+class TestJobs:
+    async def test_interval_jobs_run_until_stopped(self):
+        scheduler = make_scheduler()
+        job = Counter()
+        scheduler.add("job", job, every=0.02)
+
+        await scheduler.start()
+        await asyncio.sleep(0.15)
+        await scheduler.stop()
+        calls = job.calls
+        await asyncio.sleep(0.05)
+
+        assert 3 <= calls == job.calls
+        assert scheduler.jobs["job"].stats["runs"] == calls
+
+    async def test_max_runtime_and_overlap(self):
+        scheduler = make_scheduler()
+        scheduler.add("slow", Counter(duration=1), every=0.02, max_runtime=0.05)
+
+        await scheduler.start()
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+        stats = scheduler.jobs["slow"].stats
+        assert stats["timeouts"] >= 2
+        assert stats["overlapped"] >= 2
+        assert stats["runs"] == 0
+
+    async def test_failures_are_counted(self):
+        async def broken(app):
+            raise RuntimeError()
+
+        scheduler = make_scheduler()
+        scheduler.add("broken", broken, every=0.02)
+
+        await scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+        assert scheduler.jobs["broken"].stats["failures"] >= 1
+
+    @pytest.mark.parametrize("missed, calls", [("once", 1), ("skip", 0)])
+    async def test_missed_runs(self, missed, calls):
+        state = MemoryBackend()
+        await state.set("sirbot:scheduler:job", time.time() - 7200)
+        scheduler = make_scheduler(state)
+        job = Counter()
+        scheduler.add("job", job, every=3600, missed=missed)
+
+        await scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+        assert job.calls == calls
+        assert scheduler.jobs["job"].stats["missed"] == 1
+        assert scheduler.jobs["job"].next_run > time.time() + 3000
+
+    async def test_last_run_is_shared(self):
+        state = MemoryBackend()
+        await state.set("sirbot:scheduler:job", time.time() - 60)
+        scheduler = make_scheduler(state)
+        job = Counter()
+        scheduler.add("job", job, every=3600)
+
+        await scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+        assert job.calls == 0
+        assert scheduler.jobs["job"].stats["missed"] == 0
+
+    def test_invalid_jobs(self):
+        scheduler = make_scheduler()
+        scheduler.add("job", Counter(), every=1)
+
+        with pytest.raises(ValueError):
+            scheduler.add("job", Counter(), every=1)
+        with pytest.raises(ValueError):
+            scheduler.add("other", Counter(), every=1, cron="* * * * *")
+        with pytest.raises(ValueError):
+            scheduler.add("other", Counter(), every=1, missed="all")
+
+
+class TestLeaderElection:
+    async def test_one_leader_runs_the_leader_jobs(self):
+        state = MemoryBackend()
+        first, second = make_scheduler(state), make_scheduler(state)
+        jobs = {}
+        for name, scheduler in (("first", first), ("second", second)):
+            jobs[name] = Counter(), Counter()
+            scheduler.add("refresh", jobs[name][0], every=0.02)
+            scheduler.add("local", jobs[name][1], every=0.02, leader=False)
+            await scheduler.start()
+
+        await asyncio.sleep(0.1)
+        assert first.leader and not second.leader
+        assert jobs["first"][0].calls and not jobs["second"][0].calls
+        assert jobs["first"][1].calls and jobs["second"][1].calls
+
+        await first.stop()
+        await asyncio.sleep(0.1)
+        await second.stop()
+
+        assert jobs["second"][0].calls
+
+    async def test_secondary_workers_are_never_leaders(self):
+        scheduler = make_scheduler(worker=1)
+        job = Counter()
+        scheduler.add("refresh", job, every=0.02)
+
+        await scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+        assert not scheduler.leader
+        assert job.calls == 0
+
+    async def test_file_lease(self, tmp_path):
+        first, second = FileLease(str(tmp_path / "lock")), FileLease(str(tmp_path / "lock"))
+
+        assert await first.acquire()
+        assert await first.acquire()
+        assert not await second.acquire()
+        assert await first.release()
+        assert await second.acquire()
+        await second.release()
+
+
+class TestBot:
+    async def test_jobs_added_after_startup_run(self, aiohttp_client):
+        bot = SirBot()
+        bot.scheduler.tick = 0.01
+        job = Counter()
+        client = await aiohttp_client(bot)
+
+        bot.scheduler.add("job", job, every=60)
+        await asyncio.sleep(0.05)
+
+        response = await client.get("/sirbot/scheduler")
+        stats = await response.json()
+        assert stats["leader"]
+        assert stats["jobs"]["job"]["runs"] == 1 == job.calls
+
+    async def test_airtable_reference_tables_are_refreshed(self):
+        async with FakeAirtable() as airtable, aiohttp.ClientSession() as session:
+            api = AirtableAPI(session, "key", "appTEST", api_root=f"{airtable.url}/v0/")
+
+            await api.refresh_record_names("Skillsets")
+
+            assert await api.get_name_from_record_id("Skillsets", "recSKL002") == "JavaScript"
+            assert airtable.calls["GET Skillsets"] == 1
@@ -0,0 +1,167 @@
+"""Unit tests for the Socket Mode transport, against the FakeSlack WebSocket stand-in."""
+
+import asyncio
+import copy
+
+import aiohttp
+import pytest
+
+from pybot._vendor.sirbot import SirBot
+from pybot._vendor.sirbot.plugins.slack import SlackPlugin
+from pybot._vendor.sirbot.plugins.slack.socket_mode import SocketModeClient
+from tests.data.commands import make_command
+from tests.data.events import TEAM_JOIN
+from tests.fixtures.servers import FakeSlack
+
+
+@pytest.fixture
+async def fake_slack():
+    async with FakeSlack() as slack:
+        yield slack
+
+
+@pytest.fixture
+async def session():
+    async with aiohttp.ClientSession() as s:
+        yield s
+
+
+def make_socket_bot(fake_slack: FakeSlack, **kwargs) -> tuple[SirBot, SlackPlugin]:
+    bot = SirBot()
+    slack = SlackPlugin(
+        token="xoxb-token",
+        app_token="xapp-token",
+        socket_mode=True,
+        bot_id="B00000000",
+        bot_user_id="U00000000",
+        api_url=f"{fake_slack.url}/api/",
+        **kwargs,
+    )
+    bot.load_plugin(slack)
+    return bot, slack
+
+
+class TestConfiguration:
+    def test_app_token_is_required(self):
+        with pytest.raises(ValueError):
+            SlackPlugin(token="xoxb-token", socket_mode=True, verify="supersecuretoken")
+
+    async def test_http_endpoints_need_a_verification_secret(self, fake_slack, monkeypatch):
+        monkeypatch.delenv("SLACK_VERIFY", raising=False)
+        monkeypatch.delenv("SLACK_SIGNING_SECRET", raising=False)
+
+        bot, _ = make_socket_bot(fake_slack)
+
+        assert "/slack/events" not in {r.resource.canonical for r in bot.router.routes()}
+
+
+class TestSocketMode:
+    async def test_events_are_acknowledged_and_dispatched(self, fake_slack, aiohttp_client):
+        bot, slack = make_socket_bot(fake_slack, socket_connections=2)
+        received = asyncio.Queue()
+
+        async def team_join(event, app):
+            received.put_nowait(event)
+
+        slack.on_event("team_join", team_join)
+        await aiohttp_client(bot)
+        await fake_slack.wait_connected(2)
+
+        ack = await fake_slack.send_envelope("events_api", copy.deepcopy(TEAM_JOIN))
+        event = await asyncio.wait_for(received.get(), 1)
+
+        assert ack["envelope_id"] == "envelope-1"
+        assert event["user"]["id"] == TEAM_JOIN["event"]["user"]["id"]
+        assert fake_slack.calls["apps.connections.open"] == 2
+
+    async def test_inline_command_answer_goes_to_response_url(self, fake_slack, aiohttp_client):
+        bot, slack = make_socket_bot(fake_slack)
+
+        async def ping(command, app):
+            return {"text": "pong"}
+
+        slack.on_command("/ping", ping, inline=True)
+        await aiohttp_client(bot)
+
+        response_url = f"{fake_slack.url}/hooks/commands/1"
+        await fake_slack.send_envelope(
+            "slash_commands", make_command("/ping", response_url=response_url)
+        )
+
+        for _ in range(100):
+            if fake_slack.calls["hooks"]:
+                break
+            await asyncio.sleep(0.01)
+        assert fake_slack.get_calls("/hooks/commands/1")[0][1]["text"] == "pong"
+
+    async def test_reconnects_when_asked_to(self, fake_slack, aiohttp_client):
+        bot, slack = make_socket_bot(fake_slack, socket_connections=1)
+        await aiohttp_client(bot)
+        await fake_slack.wait_connected()
+
+        await fake_slack.disconnect()
+        for _ in range(100):
+            if fake_slack.calls["apps.connections.open"] == 2 and fake_slack.sockets:
+                break
+            await asyncio.sleep(0.01)
+
+        assert fake_slack.calls["apps.connections.open"] == 2
+        assert slack.socket_client.connected == 1
+
+    async def test_failed_open_backs_off(self, fake_slack, session):
+        fake_slack.fail("apps.connections.open", status=500, times=3)
+        client = SocketModeClient(
+            None,
+            session,
+            app_token="xapp-token",
+            connections=1,
+            api_url=f"{fake_slack.url}/api/",
+            min_backoff=0.02,
+            max_backoff=0.04,
+        )
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        await client.start()
+        await fake_slack.wait_connected()
+        elapsed = loop.time() - start
+        await client.stop()
+
+        assert fake_slack.calls["apps.connections.open"] == 4
+        # Jittered delays of at least half of 0.02, 0.04 and 0.04 (capped)
+        assert elapsed >= 0.05
+
+    async def test_malformed_frames_are_ignored(self, fake_slack, aiohttp_client):
+        bot, slack = make_socket_bot(fake_slack, socket_connections=1)
+        await aiohttp_client(bot)
+        await fake_slack.wait_connected()
+
+        for ws in fake_slack.sockets.values():
+            await ws.send_str("not json")
+            await ws.send_str("[]")
+        ack = await fake_slack.send_envelope("events_api", copy.deepcopy(TEAM_JOIN))
+
+        assert ack["envelope_id"] == "envelope-1"
+        assert fake_slack.calls["apps.connections.open"] == 1
+
+    async def test_unexpected_errors_back_off(self, fake_slack, session):
+        # An answer without an URL first
+        answers = iter([{"ok": True}])
+        fake_slack.set_response(
+            "apps.connections.open",
+            lambda data: next(answers, None) or fake_slack._connections_open(data),
+        )
+        client = SocketModeClient(
+            None,
+            session,
+            app_token="xapp-token",
+            connections=1,
+            api_url=f"{fake_slack.url}/api/",
+            min_backoff=0.02,
+        )
+
+        await client.start()
+        await fake_slack.wait_connected()
+        await client.stop()
+
+        assert fake_slack.calls["apps.connections.open"] == 2
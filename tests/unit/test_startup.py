@@ -0,0 +1,57 @@
+"""Unit tests for the cold start of the bot."""
+
+import subprocess
+import sys
+import threading
+
+from pybot.endpoints.slack.utils import slash_lunch
+from pybot.endpoints.slack.utils.slash_lunch import is_real, load_zipcodes
+from tests.startup import import_times
+
+
+def test_optional_modules_are_imported_lazily():
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, pybot.__main__; print(*sorted(m for m in sys.modules if '.' not in m))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PATH": ""},
+    ).stdout.split()
+
+    assert "pybot" in loaded
+    assert "zipcodes" not in loaded
+    assert "sentry_sdk" not in loaded
+
+
+def test_import_times():
+    times = {t["module"]: t for t in import_times("pybot.endpoints.slack.utils.slash_lunch")}
+
+    assert "zipcodes" not in times
+    assert times["pybot.endpoints.slack.utils.slash_lunch"]["cumulative_ms"] > 0
+
+
+def test_zipcodes_on_first_use():
+    assert is_real("94105")
+    assert not is_real("00000")
+
+
+async def test_zipcodes_are_loaded_in_a_thread(monkeypatch):
+    monkeypatch.setattr(slash_lunch, "_zipcodes", None)
+    imported_by = []
+    import_module = slash_lunch.importlib.import_module
+
+    def record(name):
+        imported_by.append(threading.current_thread())
+        return import_module(name)
+
+    monkeypatch.setattr(slash_lunch.importlib, "import_module", record)
+    await load_zipcodes()
+    await load_zipcodes()
+
+    assert len(imported_by) == 1
+    assert imported_by[0] is not threading.main_thread()
+    assert is_real("94105")
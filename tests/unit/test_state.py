@@ -0,0 +1,214 @@
+"""Unit tests for the shared state backends, the Redis one against the FakeRedis stand-in."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from pybot._vendor.sirbot.state import (
+    MemoryBackend,
+    RedisBackend,
+    SQLiteBackend,
+    create_state,
+)
+from pybot.endpoints.slack.message_templates.tech import TechTermsGrabber
+from pybot.plugins.airtable.api import AirtableAPI
+from tests.fixtures.servers import FakeRedis
+
+
+@pytest.fixture
+async def fake_redis():
+    async with FakeRedis() as redis:
+        yield redis
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+async def backend(request, tmp_path, fake_redis):
+    if request.param == "memory":
+        state = MemoryBackend()
+    elif request.param == "sqlite":
+        state = SQLiteBackend(str(tmp_path / "state.db"))
+    else:
+        state = create_state(fake_redis.url)
+    yield state
+    await state.close()
+
+
+class TestBackends:
+    async def test_get_set_delete(self, backend):
+        assert await backend.get("key") is None
+
+        await backend.set("key", {"recSVC001": "Resume Review"})
+        assert await backend.get("key") == {"recSVC001": "Resume Review"}
+
+        await backend.delete("key")
+        assert await backend.get("key") is None
+
+    async def test_keys_expire(self, backend):
+        await backend.set("key", "value", ttl=0.05)
+        assert await backend.add("other", "value", ttl=0.05)
+
+        await asyncio.sleep(0.1)
+
+        assert await backend.get("key") is None
+        assert await backend.add("other", "value")
+
+    async def test_add_only_sets_missing_keys(self, backend):
+        assert await backend.add("dedup:recA", 1, ttl=60)
+        assert not await backend.add("dedup:recA", 2, ttl=60)
+        assert await backend.get("dedup:recA") == 1
+
+    async def test_counters(self, backend):
+        assert await backend.incr("count", ttl=60) == 1
+        assert await backend.incr("count", 4) == 5
+        assert await backend.get("count") == 5
+
+    async def test_locks(self, backend):
+        first, second = backend.lock("job", ttl=60), backend.lock("job", ttl=60)
+
+        assert await first.acquire()
+        assert not await second.acquire()
+        assert await first.acquire()  # extends the lease
+        assert not await second.release()
+        assert await first.release()
+        assert await second.acquire()
+
+    async def test_get_or_set_fills_once(self, backend):
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return ["term"]
+
+        results = await asyncio.gather(*(backend.get_or_set("terms", factory) for _ in range(5)))
+
+        assert results == [["term"]] * 5
+        assert calls == 1
+
+
+class TestSharing:
+    async def test_sqlite_is_shared_between_instances(self, tmp_path):
+        first, second = SQLiteBackend(str(tmp_path / "s.db")), SQLiteBackend(str(tmp_path / "s.db"))
+
+        await first.incr("count")
+        await second.incr("count")
+        assert await first.acquire_lock("job", "a", ttl=60)
+
+        assert await second.get("count") == 2
+        assert not await second.acquire_lock("job", "b", ttl=60)
+        await first.close()
+        await second.close()
+
+    async def test_redis_reconnects(self, fake_redis):
+        state = RedisBackend(port=int(fake_redis.url.rsplit(":", 1)[1].split("/")[0]))
+        await state.set("key", "value")
+
+        fake_redis.drop_connections()
+        await asyncio.sleep(0.01)
+        with pytest.raises((ConnectionError, asyncio.IncompleteReadError)):
+            await state.get("key")
+
+        assert await state.get("key") == "value"
+        assert fake_redis.data["sirbot:key"][0] == '"value"'
+        await state.close()
+
+    async def test_sqlite_expired_keys_are_purged(self, tmp_path):
+        state = SQLiteBackend(str(tmp_path / "s.db"), purge_interval=0)
+        await state.set("expired", 1, ttl=0.01)
+        await state.set("kept", 1)
+        await asyncio.sleep(0.02)
+
+        await state.set("other", 1)
+
+        db = state._connect()
+        assert [k for (k,) in db.execute("SELECT key FROM state ORDER BY key")] == ["kept", "other"]
+        plan = db.execute("EXPLAIN QUERY PLAN DELETE FROM state WHERE expires <= 0").fetchall()
+        assert "state_expires" in str(plan)
+        await state.close()
+
+    async def test_redis_counters_expire_atomically(self, fake_redis):
+        state = create_state(fake_redis.url)
+
+        assert await state.incr("count", ttl=60) == 1
+        assert await state.incr("count", ttl=60) == 2
+
+        assert fake_redis.calls["EVAL"] == 2 and not fake_redis.calls["PEXPIRE"]
+        assert 0 < fake_redis._execute(["PTTL", "sirbot:count"]) <= 60_000
+        await state.close()
+
+    async def test_redis_commands_run_concurrently(self, fake_redis):
+        state = create_state(fake_redis.url)
+        await state.set("key", 1)
+        fake_redis.latency = 0.05
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        assert await asyncio.gather(*(state.get("key") for _ in range(4))) == [1] * 4
+
+        assert loop.time() - start < 0.15
+        await state.close()
+
+    async def test_redis_cancelled_command_leaves_no_reply_behind(self, fake_redis):
+        state = create_state(fake_redis.url)
+        await state.set("first", 1)
+        await state.set("second", 2)
+
+        fake_redis.latency = 0.05
+        get = asyncio.ensure_future(state.get("first"))
+        await asyncio.sleep(0.01)
+        get.cancel()
+        fake_redis.latency = 0
+
+        assert await state.get("second") == 2
+        assert await state.get("first") == 1
+        await state.close()
+
+
+def test_create_state():
+    assert isinstance(create_state(None), MemoryBackend)
+    assert create_state("sqlite:///tmp/state.db").path == "/tmp/state.db"
+    assert create_state("sqlite://data/state.db").path == "data/state.db"
+    with pytest.raises(ValueError):
+        create_state("sqlite://")
+
+    redis = create_state("redis://:secret@redis.local:6380/2")
+    assert (redis.host, redis.port, redis.db, redis.password) == ("redis.local", 6380, 2, "secret")
+
+    with pytest.raises(ValueError):
+        create_state("memcached://localhost")
+
+
+class TestCaches:
+    async def test_tech_terms_are_fetched_once(self, bot, monkeypatch):
+        calls = 0
+
+        async def grab(self):
+            nonlocal calls
+            calls += 1
+            return "| Java | a language |\n"
+
+        monkeypatch.setattr(TechTermsGrabber, "_grab_data_from_github", grab)
+
+        for _ in range(3):
+            terms = await TechTermsGrabber(bot).get_terms()
+
+        assert terms == {"java": "Java is a language"}
+        assert calls == 1
+
+    async def test_record_names_are_shared_between_clients(self, tmp_path):
+        state = SQLiteBackend(str(tmp_path / "state.db"))
+        first, second = (AirtableAPI(None, "key", "appTEST", state=state) for _ in range(2))
+        response = {"records": [{"id": "recSVC001", "fields": {"Name": "Resume Review"}}]}
+
+        with (
+            patch.object(first, "get", return_value=response) as first_get,
+            patch.object(second, "get") as second_get,
+        ):
+            assert await first.get_name_from_record_id("Services", "recSVC001") == "Resume Review"
+            assert await second.get_name_from_record_id("Services", "recSVC001") == "Resume Review"
+
+        assert first_get.call_count == 1
+        second_get.assert_not_called()
+        await state.close()
@@ -0,0 +1,114 @@
+"""Unit tests for the precompiled message templates and their encoding."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from pybot._vendor.slack import methods, sansio
+from pybot._vendor.slack.events import Message
+from pybot._vendor.slack.templates import Template, dumps
+from pybot.endpoints.slack.utils.action_messages import claimed_attachment, not_claimed_attachment
+from pybot.endpoints.slack.utils.event_messages import base_resources
+
+BUTTON = Template({"text": "Hi <@${user_id}>", "value": "${user_id}:${count}", "n": 100})
+
+
+class TestTemplate:
+    def test_render(self):
+        assert BUTTON.slots == {"user_id", "count"}
+        assert json.loads(BUTTON.render(user_id="U1", count=3).text) == {
+            "text": "Hi <@U1>",
+            "value": "U1:3",
+            "n": 100,
+        }
+
+    def test_values_are_escaped(self):
+        value = 'Say "hi"\n%s {} ${count} é'
+
+        rendered = BUTTON.render(user_id=value, count=0)
+
+        assert rendered["text"] == f"Hi <@{value}>"
+
+    def test_missing_slot(self):
+        with pytest.raises(KeyError):
+            BUTTON.render(user_id="U1")
+
+    def test_nested_templates(self):
+        template = Template([not_claimed_attachment(), {"text": "${text}"}])
+
+        assert template.render(text="100%")[1] == {"text": "100%"}
+        assert template.render(text="")[0] == not_claimed_attachment().value
+
+    def test_claimed_attachment(self):
+        with patch("pybot.endpoints.slack.utils.action_messages.now", return_value=1700000000):
+            attachment = claimed_attachment("U123")
+
+        assert attachment["text"] == (
+            "Claimed by <@U123>\n"
+            "<!date^1700000000^Claimed at {date_num} {time_secs}|Failed to parse time>"
+        )
+        assert attachment["actions"][0]["value"] == "reset_claim"
+
+
+class TestDumps:
+    def test_raw_values_are_spliced(self):
+        attachments = base_resources()
+        message = {
+            "channel": "C1",
+            "as_user": True,
+            "attachments": [{"text": "original"}, claimed_attachment("U1")],
+            "blocks": attachments,
+        }
+
+        decoded = json.loads(dumps(message))
+
+        assert decoded["blocks"] == attachments.value
+        assert decoded["attachments"][0] == {"text": "original"}
+        assert decoded["attachments"][1]["callback_id"] == "claimed"
+        assert decoded["as_user"] is True
+
+    def test_edited_values_are_sent(self):
+        attachments = base_resources()
+        attachments[0]["fields"] = [{"title": "Email"}]
+
+        assert json.loads(dumps({"attachments": attachments}))["attachments"][0]["fields"] == [
+            {"title": "Email"}
+        ]
+
+    def test_deeper_raw_values_are_decoded(self):
+        data = {"a": {"b": not_claimed_attachment()}, 1: [None]}
+
+        assert json.loads(dumps(data)) == {"a": {"b": not_claimed_attachment().value}, "1": [None]}
+
+    def test_same_as_json(self):
+        data = {"text": "é\n\"'", "ts": 1.5, "thread": None, "list": [1, "a", {"b": False}]}
+
+        assert dumps(data) == json.dumps(data)
+
+    def test_requests(self):
+        message = Message({"channel": "C1", "attachments": not_claimed_attachment()})
+
+        _, body, _ = sansio.prepare_request(methods.CHAT_POST_MESSAGE, message, None, {}, "xoxb")
+        _, form, _ = sansio.prepare_request("chat.postMessage", message, None, {}, "xoxb")
+
+        assert json.loads(body)["attachments"] == not_claimed_attachment().value
+        assert json.loads(form["attachments"]) == not_claimed_attachment().value
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://hooks.slack.com/commands/T1/1/abc",
+            "https://example.com/response_url",
+            "http://127.0.0.1:8001/hooks/commands/1",
+        ],
+    )
+    def test_token_is_only_sent_to_the_web_api(self, url):
+        real_url, body, headers = sansio.prepare_request(url, {"text": "hi"}, None, {}, "xoxb")
+
+        assert real_url == url
+        assert json.loads(body) == {"text": "hi"}
+        assert "Authorization" not in headers
+
+        _, _, headers = sansio.prepare_request(methods.CHAT_POST_MESSAGE, {}, None, {}, "xoxb")
+        assert headers["Authorization"] == "Bearer xoxb"
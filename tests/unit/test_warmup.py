@@ -0,0 +1,68 @@
+"""Unit tests for the concurrent startup hooks, the warm-up phase and the readiness endpoint."""
+
+import asyncio
+import time
+
+from pybot._vendor.sirbot import SirBot
+from pybot._vendor.sirbot.bot import concurrently
+
+
+class TestWarmup:
+    async def test_ready_once_warm(self, aiohttp_client):
+        loaded = asyncio.Event()
+
+        async def preload(app):
+            await loaded.wait()
+
+        bot = SirBot()
+        bot.add_warmup("preload", preload)
+        client = await aiohttp_client(bot)
+
+        response = await client.get("/sirbot/ready")
+        assert response.status == 503
+        assert (await response.json())["warmup"] == {"preload": "pending"}
+
+        loaded.set()
+        await asyncio.sleep(0.01)
+
+        response = await client.get("/sirbot/ready")
+        assert response.status == 200
+        assert (await response.json())["warmup"] == {"preload": "done"}
+
+    async def test_ready_when_the_budget_is_spent(self, aiohttp_client):
+        async def slow(app):
+            await asyncio.sleep(10)
+
+        async def broken(app):
+            raise RuntimeError()
+
+        bot = SirBot(warmup_timeout=0.05)
+        bot.add_warmup("slow", slow)
+        bot.add_warmup("broken", broken)
+        await aiohttp_client(bot)
+
+        await asyncio.sleep(0.1)
+
+        assert bot.ready
+        assert bot.warmup.status == {"slow": "timeout", "broken": "failed"}
+
+    async def test_ready_without_warmup(self, aiohttp_client):
+        bot = SirBot()
+        await aiohttp_client(bot)
+        await asyncio.sleep(0)
+
+        assert bot.ready
+
+
+async def test_concurrent_startup_hooks():
+    started = []
+
+    async def hook(app):
+        started.append(time.monotonic())
+        await asyncio.sleep(0.05)
+
+    begin = time.monotonic()
+    await concurrently(hook, hook, hook)(None)
+
+    assert len(started) == 3
+    assert time.monotonic() - begin < 0.1
@@ -0,0 +1,122 @@
+"""Tests for serving SirBot from several worker processes, run in a subprocess."""
+
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import aiohttp
+
+ROOT = Path(__file__).parents[2]
+
+SUPERVISOR = """
+import os, sys, time
+from pybot._vendor.sirbot.workers import Supervisor
+
+def target(worker):
+    open(os.path.join(sys.argv[1], f"{worker}.{os.getpid()}"), "w").close()
+    time.sleep(60)
+
+sys.exit(Supervisor(target, 2, drain_timeout=2, min_backoff=0.01, poll=0.01).run())
+"""
+
+BOT = """
+import asyncio, os, sys
+from aiohttp import web
+from pybot._vendor.sirbot import SirBot
+
+async def whoami(request):
+    await asyncio.sleep(float(request.query.get("sleep", 0)))
+    return web.json_response({"pid": os.getpid(), "worker": request.app.worker})
+
+bot = SirBot()
+bot.router.add_get("/whoami", whoami)
+bot.start(workers=2, drain_timeout=2, host="127.0.0.1", port=int(sys.argv[1]), print=None)
+"""
+
+
+def spawn(script: str, *args: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", textwrap.dedent(script), *args], cwd=ROOT)
+
+
+def wait_for(condition, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Workers of the stopped supervisor are reaped by init
+    return (
+        os.path.exists(f"/proc/{pid}") and Path(f"/proc/{pid}/stat").read_text().split()[2] != "Z"
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestSupervisor:
+    def test_dead_workers_are_restarted(self, tmp_path):
+        supervisor = spawn(SUPERVISOR, str(tmp_path))
+        try:
+            wait_for(lambda: len(list(tmp_path.iterdir())) == 2)
+            first = next(p for p in tmp_path.iterdir() if p.name.startswith("0."))
+            os.kill(int(first.suffix[1:]), signal.SIGKILL)
+
+            wait_for(lambda: len(list(tmp_path.glob("0.*"))) == 2)
+            supervisor.send_signal(signal.SIGTERM)
+
+            assert supervisor.wait(timeout=10) == 0
+        finally:
+            supervisor.kill()
+
+        for worker in tmp_path.iterdir():
+            wait_for(lambda: not running(int(worker.suffix[1:])))
+
+
+class TestWorkers:
+    async def test_workers_share_the_port_and_drain(self):
+        port = free_port()
+        url = f"http://127.0.0.1:{port}/whoami"
+        bot = spawn(BOT, str(port))
+
+        async def whoami(session, **params):
+            # A connection per request, for the kernel to pick a worker each time
+            async with session.get(url, params=params, headers={"Connection": "close"}) as r:
+                return await r.json()
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with asyncio.timeout(10):
+                    while True:
+                        try:
+                            await whoami(session)
+                            break
+                        except aiohttp.ClientConnectionError:
+                            await asyncio.sleep(0.05)
+
+                responses = [await whoami(session) for _ in range(30)]
+                assert {r["worker"] for r in responses} == {0, 1}
+                assert len({r["pid"] for r in responses}) == 2
+
+                slow = asyncio.ensure_future(whoami(session, sleep="0.5"))
+                await asyncio.sleep(0.2)
+                bot.send_signal(signal.SIGTERM)
+
+                assert "pid" in await slow
+            assert await asyncio.to_thread(bot.wait, 10) == 0
+        finally:
+            bot.kill()